@@ -15,8 +15,8 @@ window.DOWNLOADS = [
   "version": "code",
   "size_bytes": 15612,
   "description": "Trouve une chaine RF optimale.",
-  "code_py": "#!\/usr\/bin\/env python3\r\n# -*- coding: utf-8 -*-\r\n\"\"\"\r\nScript : architecture_optimizer.py\r\nBut    : g\u00E9n\u00E9rer et scorer des architectures RF (placement LNAs + configurations d\'att\u00E9nuateurs)\r\nAuteur : (ton nom)\r\nUsage  : placer le YAML d\'entr\u00E9e (components.yaml) dans le m\u00EAme dossier et lancer le script.\r\nSortie : results.txt (liste des architectures test\u00E9es) + r\u00E9sum\u00E9 console (meilleure architecture)\r\n\r\nConventions et unit\u00E9s :\r\n - Tous les niveaux en dB (gain_dB, insertion_loss_dB, nf_dB)\r\n - OP1dB dans le YAML donn\u00E9 en dBm (op1db_dBm ou p1db_dBm accepted)\r\n - Fonctions utilitaires convertissent dB <-> lin\u00E9aire :\r\n     lin = 10^(dB\/10)\r\n - Pour les composants passifs (type \'filter\' ou \'switch\'), on attend\r\n   insertion_loss_dB (positive) et on consid\u00E8re :\r\n     gain_dB = -insertion_loss_dB\r\n     nf_dB   = insertion_loss_dB  (hypoth\u00E8se : NF = pertes d\'insertion)\r\n - Si un champ manque, valeurs par d\u00E9faut raisonnables sont appliqu\u00E9es\r\n   (ex : p1db par d\u00E9faut = +1000 dBm -> non contraignant).\r\n\"\"\"\r\n\r\nimport yaml\r\nimport itertools\r\nimport math\r\nimport os\r\n\r\n# -------------------------\r\n# Utils de base (conversions)\r\n# -------------------------\r\ndef non_empty_subsets(lst):\r\n    \"\"\"\r\n    Retourne toutes les sous-ensembles non vides de la liste `lst`.\r\n    Utilis\u00E9 pour tester toutes les combinaisons possibles de LNAs mobiles.\r\n    \"\"\"\r\n    return [list(subset) for r in range(1, len(lst)+1) for subset in itertools.combinations(lst, r)]\r\n\r\ndef db_to_lin(db):\r\n    \"\"\"Convertit dB -> lin\u00E9aire (puissance facteur).\"\"\"\r\n    return 10 ** (db \/ 10)\r\n\r\ndef lin_to_db(lin):\r\n    \"\"\"Convertit lin\u00E9aire -> dB. ATTENTION: lin doit \u00EAtre > 0.\"\"\"\r\n    return 10 * math.log10(lin)\r\n\r\n# -------------------------\r\n# Chargement YAML\r\n# -------------------------\r\ndef load_config(yaml_filename):\r\n    \"\"\"\r\n    Charge un fichier YAML situ\u00E9 dans le m\u00EAme dossier que ce script.\r\n    Retourne le contenu Python (dictionnaires \/ listes).\r\n    \"\"\"\r\n    script_dir = os.path.dirname(os.path.abspath(__file__))\r\n    yaml_path = os.path.join(script_dir, yaml_filename)\r\n    with open(yaml_path, \'r\') as f:\r\n        return yaml.safe_load(f)\r\n\r\n# -------------------------\r\n# Calculs physiques\r\n# -------------------------\r\ndef calc_nf(chain):\r\n    \"\"\"\r\n    Calcule le NF total de la cha\u00EEne via la formule de Friis (en lin\u00E9aire),\r\n    puis convertit en dB pour retour.\r\n    chain: liste d\'\u00E9tages avec \'gain_lin\' et \'nf_lin\' (valeurs lin\u00E9aires).\r\n    NF_total_lin = NF1 + (NF2-1)\/G1 + (NF3-1)\/(G1*G2) + ...\r\n    Retour: NF total en dB.\r\n    \"\"\"\r\n    nf_total_lin = chain[0][\'nf_lin\']\r\n    gain_prod = chain[0][\'gain_lin\']\r\n    for stage in chain[1:]:\r\n        nf_total_lin += (stage[\'nf_lin\'] - 1) \/ gain_prod\r\n        gain_prod *= stage[\'gain_lin\']\r\n    return lin_to_db(nf_total_lin)\r\n\r\ndef calc_p1db(chain):\r\n    \"\"\"\r\n    Calcule l\'OP1dB total en sortie d\'une cha\u00EEne.\r\n    M\u00E9thode utilis\u00E9e (identique au second script de r\u00E9f\u00E9rence) :\r\n      - pour chaque \u00E9tage i, on calcule le gain restant apr\u00E8s l\'\u00E9tage: gain_after[i]\r\n        (produit des gains des \u00E9tages qui suivent)\r\n      - on somme les inverses pond\u00E9r\u00E9es : inv_sum = sum( 1 \/ (p1db_lin_i * gain_after[i]) )\r\n      - P1dB_total_lin = 1 \/ inv_sum\r\n      - on retourne P1dB en dB (dBm, car p1db_lin provient d\'une conversion depuis dBm)\r\n    Remarques :\r\n      - Si un \u00E9tage n\'a pas de p1db d\u00E9fini ou valeur non positive, on l\'ignore (contrib. nulle).\r\n      - Si inv_sum == 0 (cas pathologique), on retourne -inf pour signaler l\'impossibilit\u00E9.\r\n    \"\"\"\r\n    if not chain:\r\n        return float(\'-inf\')\r\n\r\n    N = len(chain)\r\n    gain_after = [1.0] * N\r\n    prod = 1.0\r\n    # calcule produit des gains apr\u00E8s chaque \u00E9tage (on parcourt \u00E0 l\'envers)\r\n    for idx in range(N-1, -1, -1):\r\n        gain_after[idx] = prod\r\n        prod *= chain[idx][\'gain_lin\']\r\n\r\n    inv_sum = 0.0\r\n    for i, stage in enumerate(chain):\r\n        p1_lin = stage.get(\'p1db_lin\', None)\r\n        if not p1_lin or p1_lin <= 0:\r\n            # pas de P1dB renseign\u00E9 => on l\'ignore (comportement non contraignant)\r\n            continue\r\n        inv_sum += 1.0 \/ (p1_lin * gain_after[i])\r\n\r\n    if inv_sum <= 0:\r\n        return float(\'-inf\')\r\n\r\n    p1_total_lin = 1.0 \/ inv_sum\r\n    return lin_to_db(p1_total_lin)\r\n\r\n# -------------------------\r\n# Gestion des blocs verrouill\u00E9s\r\n# -------------------------\r\ndef group_locked_stages(stages):\r\n    \"\"\"\r\n    Construit des \'blocs\' \u00E0 partir d\'une liste de composants fixes en respectant\r\n    le champ `locked_with_next`: si un composant a locked_with_next=True,\r\n    on le regroupe avec le suivant dans le m\u00EAme bloc.\r\n    Retour: liste de blocs (chacun une liste de composants).\r\n    \"\"\"\r\n    blocks = []\r\n    current_block = []\r\n    for comp in stages:\r\n        current_block.append(comp)\r\n        if not comp.get(\'locked_with_next\', False):\r\n            blocks.append(current_block)\r\n            current_block = []\r\n    if current_block:\r\n        blocks.append(current_block)\r\n    return blocks\r\n\r\ndef flatten_block_names(block):\r\n    \"\"\"Retourne un nom simple pour le bloc : concat\u00E9nation des noms s\u00E9par\u00E9s par \' + \'.\"\"\"\r\n    return \" + \".join(comp[\'name\'] for comp in block)\r\n\r\ndef flatten_block_stages(block):\r\n    \"\"\"\r\n    Transforme un bloc (liste de composants) en un seul \'stage\' synth\u00E9tique.\r\n    Important : on calcule le NF et l\'OP1dB du bloc **en appliquant exactement**\r\n    les m\u00EAmes formules de cascade (calc_nf et calc_p1db) \u00E0 la sous-cha\u00EEne interne.\r\n    Cela \u00E9vite les approximations (somme na\u00EFve des NF qui faussent les r\u00E9sultats).\r\n\r\n    Retourne un dict avec:\r\n      - name, gain_dB (somme), gain_dB_max (somme), nf_dB (calc Friis sur sous-cha\u00EEne),\r\n        p1db_dBm (OP1dB du bloc), gain_lin, nf_lin, p1db_lin, type=\'block\'\r\n    \"\"\"\r\n    subchain = []\r\n    total_gain_dB = 0.0\r\n    total_gain_dB_max = 0.0\r\n\r\n    for comp in block:\r\n        # Pour les passifs (filter, switch) : on cherche insertion_loss_dB (positive)\r\n        # gain_comp_dB = - insertion_loss_dB ; nf_comp_dB = insertion_loss_dB\r\n        if comp.get(\'type\') in [\'filter\', \'switch\'] and \'insertion_loss_dB\' in comp:\r\n            loss = float(comp[\'insertion_loss_dB\'])\r\n            gain_comp_dB = -abs(loss)\r\n            nf_comp_dB = abs(loss)\r\n        else:\r\n            gain_comp_dB = float(comp.get(\'gain_dB\', 0.0))\r\n            nf_comp_dB = float(comp.get(\'nf_dB\', abs(gain_comp_dB)))\r\n\r\n        # p1db en dBm : accepte p1db_dBm ou op1db_dBm ; d\u00E9faut = +1000 dBm (non contraignant)\r\n        p1db_val = comp.get(\'p1db_dBm\', comp.get(\'op1db_dBm\', 1000.0))\r\n\r\n        # Construire l\'entr\u00E9e en lin\u00E9aire attendue par calc_nf \/ calc_p1db\r\n        substage = {\r\n            \'name\': comp.get(\'name\', \'\'),\r\n            \'type\': comp.get(\'type\', \'\'),\r\n            \'gain_lin\': db_to_lin(gain_comp_dB),\r\n            \'nf_lin\': db_to_lin(nf_comp_dB),\r\n            \'p1db_lin\': db_to_lin(float(p1db_val))\r\n        }\r\n        subchain.append(substage)\r\n\r\n        total_gain_dB += gain_comp_dB\r\n        total_gain_dB_max += float(comp.get(\'gain_dB_max\', gain_comp_dB))\r\n\r\n    # Calculs corrects par cascade sur la sous-cha\u00EEne\r\n    block_nf_dB = calc_nf(subchain)        # NF du bloc en dB (Friis)\r\n    block_p1db_dBm = calc_p1db(subchain)   # OP1dB du bloc en dBm\r\n\r\n    return {\r\n        \'name\': flatten_block_names(block),\r\n        \'gain_dB\': total_gain_dB,\r\n        \'gain_dB_max\': total_gain_dB_max,\r\n        \'nf_dB\': block_nf_dB,\r\n        \'p1db_dBm\': block_p1db_dBm,\r\n        \'gain_lin\': db_to_lin(total_gain_dB),\r\n        \'nf_lin\': db_to_lin(block_nf_dB),\r\n        \'p1db_lin\': db_to_lin(block_p1db_dBm),\r\n        \'type\': \'block\'\r\n    }\r\n\r\n# -------------------------\r\n# G\u00E9n\u00E9ration de toutes les architectures\r\n# -------------------------\r\ndef generate_all_chains(blocks, movable_lnas, attenuators):\r\n    \"\"\"\r\n    Ins\u00E8re les LNAs mobiles dans les positions possibles entre les blocs fixes,\r\n    puis ins\u00E8re les att\u00E9nuateurs (avec toutes les combinaisons de r\u00E9glages possibles).\r\n    Retourne une liste d\'architectures test\u00E9es avec m\u00E9triques de base.\r\n    \"\"\"\r\n    insert_positions = list(range(1, len(blocks)))  # positions entre blocs\r\n    all_architectures = []\r\n\r\n    # it\u00E8re sur choix de positions pour les LNAs mobiles\r\n    for lna_positions in itertools.combinations(insert_positions, len(movable_lnas)):\r\n        for lna_perm in itertools.permutations(movable_lnas):\r\n            temp_blocks = blocks.copy()\r\n            # ins\u00E8re les LNAs (on garde l\'ordre des positions)\r\n            for pos, lna in sorted(zip(lna_positions, lna_perm), reverse=True):\r\n                temp_blocks.insert(pos, lna.copy())\r\n\r\n            # pr\u00E9parer toutes les configurations d\'att\u00E9nuateurs (options)\r\n            att_configs_per_att = []\r\n            for att in attenuators:\r\n                att_configs = []\r\n                if \'gain_dB_options\' in att:\r\n                    for att_gain_dB in att[\'gain_dB_options\']:\r\n                        att_copy = att.copy()\r\n                        att_copy[\'gain_dB\'] = att_gain_dB\r\n                        att_copy[\'gain_lin\'] = db_to_lin(att_gain_dB)\r\n                        att_copy[\'nf_lin\'] = db_to_lin(abs(att_gain_dB))\r\n                        att_copy[\'p1db_lin\'] = db_to_lin(att_copy.get(\'p1db_dBm\', att_copy.get(\'op1db_dBm\', 1000)))\r\n                        att_configs.append(att_copy)\r\n                else:\r\n                    att_copy = att.copy()\r\n                    att_copy[\'gain_lin\'] = db_to_lin(att[\'gain_dB\'])\r\n                    att_copy[\'nf_lin\'] = db_to_lin(abs(att[\'gain_dB\']))\r\n                    att_copy[\'p1db_lin\'] = db_to_lin(att_copy.get(\'p1db_dBm\', att_copy.get(\'op1db_dBm\', 1000)))\r\n                    att_configs.append(att_copy)\r\n                att_configs_per_att.append(att_configs)\r\n\r\n            # positions possibles pour ins\u00E9rer les att\u00E9nuateurs\r\n            att_positions = list(range(1, len(temp_blocks)))\r\n            for att_pos_combo in itertools.combinations(att_positions, len(attenuators)):\r\n                for att_gain_combo in itertools.product(*att_configs_per_att):\r\n                    full_chain = temp_blocks.copy()\r\n                    # ins\u00E8re les att\u00E9nuateurs (en partant de la fin pour respecter positions)\r\n                    for pos, att in sorted(zip(att_pos_combo, att_gain_combo), reverse=True):\r\n                        full_chain.insert(pos, att)\r\n\r\n                    # garantir que les champs lin\u00E9aires sont pr\u00E9sents pour chaque stage\r\n                    for s in full_chain:\r\n                        if \'gain_lin\' not in s:\r\n                            s[\'gain_lin\'] = db_to_lin(s.get(\'gain_dB\', 0.0))\r\n                        if \'nf_lin\' not in s:\r\n                            s[\'nf_lin\'] = db_to_lin(s.get(\'nf_dB\', abs(s.get(\'gain_dB\', 0.0))))\r\n                        if \'p1db_lin\' not in s:\r\n                            p1db_val = s.get(\'p1db_dBm\', s.get(\'op1db_dBm\', 1000.0))\r\n                            s[\'p1db_lin\'] = db_to_lin(p1db_val)\r\n\r\n                    gain_lin = math.prod(stage[\'gain_lin\'] for stage in full_chain)\r\n                    gain_dB = lin_to_db(gain_lin)\r\n                    nf = calc_nf(full_chain)      # NF total en dB (Friis)\r\n                    p1db = calc_p1db(full_chain)  # OP1dB sortie en dBm\r\n\r\n                    all_architectures.append({\r\n                        \'chain\': [s[\'name\'] for s in full_chain],\r\n                        \'nf_dB\': nf,\r\n                        \'p1db_dBm\': p1db,   # OP1dB (sortie)\r\n                        \'gain_dB\': gain_dB,\r\n                        \'full_chain\': full_chain\r\n                    })\r\n    return all_architectures\r\n\r\n# -------------------------\r\n# Calcul min\/max (att\u00E9nuateurs)\r\n# -------------------------\r\ndef compute_metrics_gain_min_max(full_chain, attenuators):\r\n    \"\"\"\r\n    Construit deux variantes de la cha\u00EEne :\r\n      - chain_min : att\u00E9nuateurs \u00E0 leur valeur minimale (min gain_dB)\r\n      - chain_max : att\u00E9nuateurs \u00E0 leur valeur maximale (max gain_dB)\r\n    Puis calcule pour chaque variante :\r\n      - gain total (dB)\r\n      - NF total (dB)\r\n      - OP1dB sortie (dBm)\r\n    Enfin calcule IP1dB d\'entr\u00E9e :\r\n      IP1dB = OP1dB_sortie - Gain_total  (valeurs min\/max correspondantes)\r\n    Retour: gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max\r\n    \"\"\"\r\n    chain_max = []\r\n    chain_min = []\r\n\r\n    for stage in full_chain:\r\n        # traiter \u00E0 la fois \'atten\' et \'attenuator\'\r\n        if stage[\'type\'] in [\'attenuator\', \'atten\']:\r\n            s = stage.copy()\r\n            if \'gain_dB_options\' in s:\r\n                max_gain = max(s[\'gain_dB_options\'])\r\n                min_gain = min(s[\'gain_dB_options\'])\r\n            else:\r\n                max_gain = min_gain = s[\'gain_dB\']\r\n            s_max = s.copy()\r\n            s_max[\'gain_dB\'] = max_gain\r\n            s_max[\'gain_lin\'] = db_to_lin(max_gain)\r\n            s_max[\'nf_lin\'] = db_to_lin(abs(max_gain))\r\n\r\n            s_min = s.copy()\r\n            s_min[\'gain_dB\'] = min_gain\r\n            s_min[\'gain_lin\'] = db_to_lin(min_gain)\r\n            s_min[\'nf_lin\'] = db_to_lin(abs(min_gain))\r\n\r\n            chain_max.append(s_max)\r\n            chain_min.append(s_min)\r\n        else:\r\n            chain_max.append(stage)\r\n            chain_min.append(stage)\r\n\r\n    gain_max_lin = math.prod(s[\'gain_lin\'] for s in chain_max)\r\n    gain_max_dB = lin_to_db(gain_max_lin)\r\n    nf_max = calc_nf(chain_max)\r\n    p1db_max = calc_p1db(chain_max)\r\n\r\n    gain_min_lin = math.prod(s[\'gain_lin\'] for s in chain_min)\r\n    gain_min_dB = lin_to_db(gain_min_lin)\r\n    nf_min = calc_nf(chain_min)\r\n    p1db_min = calc_p1db(chain_min)\r\n\r\n    # IP1dB (entr\u00E9e) : OP1dB_sortie - gain_total (valeurs coh\u00E9rentes min\/max)\r\n    ip1_min = p1db_min - gain_min_dB\r\n    ip1_max = p1db_max - gain_max_dB\r\n\r\n    return gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max\r\n\r\n# -------------------------\r\n# Scoring\r\n# -------------------------\r\ndef score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target):\r\n    \"\"\"\r\n    Score = somme des erreurs quadratiques pond\u00E9r\u00E9es par les cibles :\r\n      - erreur sur gain min et max par rapport \u00E0 target_gain\r\n      - p\u00E9nalit\u00E9 si NF_max (cas pessimiste) d\u00E9passe nf_max_target\r\n      - p\u00E9nalit\u00E9 si OP1dB_min (cas pessimiste) est < p1db_min_target\r\n    NOTE : les IP1dB ne sont pas utilis\u00E9s dans le score actuel.\r\n    \"\"\"\r\n    gain_min, gain_max, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = metrics\r\n    err_gain_min = (gain_min - target_gain) ** 2\r\n    err_gain_max = (gain_max - target_gain) ** 2\r\n    err_nf = max(0, nf_max - nf_max_target) ** 2\r\n    err_p1db = max(0, p1db_min_target - p1db_min) ** 2\r\n    return err_gain_min + err_gain_max + err_nf + err_p1db\r\n\r\n# -------------------------\r\n# Main\r\n# -------------------------\r\ndef main():\r\n    # charge le YAML (attendu: \'components.yaml\' \u00E0 c\u00F4t\u00E9 du script)\r\n    config = load_config(\'components.yaml\')\r\n    target_gain = config[\'gain_total_target_dB\']\r\n    nf_max_target = config[\'nf_max_dB\']\r\n    p1db_min_target = config[\'p1db_min_dBm\']\r\n    components = config[\'components\']\r\n\r\n    # s\u00E9paration composants en listes : fixed (blocs immuables), lnas (mobiles), attenuators\r\n    fixed = []\r\n    lnas = []\r\n    attenuators = []\r\n\r\n    for comp in components:\r\n        comp = comp.copy()\r\n\r\n        # p1db peut \u00EAtre dans p1db_dBm ou op1db_dBm selon ton YAML -> unifier\r\n        p1db_val = comp.get(\'p1db_dBm\', comp.get(\'op1db_dBm\', None))\r\n        if p1db_val is None:\r\n            p1db_val = 1000.0  # valeur non contraignante si absent\r\n        comp[\'p1db_lin\'] = db_to_lin(p1db_val)\r\n\r\n        # traitement des att\u00E9nuateurs (options ou valeur fixe)\r\n        if comp[\'type\'] in [\'attenuator\', \'atten\']:\r\n            gain_ref = comp[\'gain_dB_options\'][0] if \'gain_dB_options\' in comp else comp[\'gain_dB\']\r\n            comp[\'gain_lin\'] = db_to_lin(gain_ref)\r\n            comp[\'nf_lin\'] = db_to_lin(abs(gain_ref))\r\n        else:\r\n            # si filtre\/switch : convertit insertion_loss_dB -> gain_dB n\u00E9gatif et nf\r\n            if comp.get(\'type\') in [\'filter\', \'switch\'] and \'insertion_loss_dB\' in comp:\r\n                loss = comp[\'insertion_loss_dB\']\r\n                comp[\'gain_dB\'] = -abs(loss)\r\n                comp[\'nf_dB\'] = loss\r\n            comp[\'gain_lin\'] = db_to_lin(comp.get(\'gain_dB\', 0.0))\r\n            comp[\'nf_lin\'] = db_to_lin(comp.get(\'nf_dB\', 30.0))\r\n\r\n        # classification\r\n        if comp[\'type\'] == \'lna\' and not comp.get(\'fixed\', False):\r\n            lnas.append(comp)\r\n        elif comp[\'type\'] in [\'attenuator\', \'atten\']:\r\n            if comp.get(\'fixed\', False):\r\n                fixed.append(comp)\r\n            else:\r\n                attenuators.append(comp)\r\n        else:\r\n            fixed.append(comp)\r\n\r\n    # grouper les composants fixes en blocs respectant locked_with_next\r\n    blocks = group_locked_stages(fixed)\r\n    block_stages = [flatten_block_stages(b) for b in blocks]\r\n\r\n    # g\u00E9n\u00E9rer toutes les architectures en ins\u00E9rant sous-ensembles de LNAs mobiles\r\n    all_archs = []\r\n    for lna_subset in non_empty_subsets(lnas):\r\n        archs = generate_all_chains(block_stages, lna_subset, attenuators)\r\n        all_archs.extend(archs)\r\n\r\n    if not all_archs:\r\n        print(\"\u274C Aucune architecture g\u00E9n\u00E9r\u00E9e.\")\r\n        return\r\n\r\n    # scorer chaque architecture et \u00E9crire r\u00E9sultats\r\n    scored_archs = []\r\n    for arch in all_archs:\r\n        metrics = compute_metrics_gain_min_max(arch[\'full_chain\'], attenuators)\r\n        score = score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target)\r\n        scored_archs.append({\r\n            \'chain\': arch[\'chain\'],\r\n            \'metrics\': metrics,\r\n            \'score\': score\r\n        })\r\n\r\n    # tri et sauvegarde\r\n    scored_archs_sorted = sorted(scored_archs, key=lambda a: a[\'score\'])\r\n    script_dir = os.path.dirname(os.path.abspath(__file__))\r\n    results_path = os.path.join(script_dir, \"results.txt\")\r\n    with open(results_path, \"w\", encoding=\"utf-8\") as f:\r\n        f.write(\"=== \uD83E\uDDEA Toutes les architectures test\u00E9es : {} ===\\n\\n\".format(len(scored_archs_sorted)))\r\n        for arch in scored_archs_sorted:\r\n            gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = arch[\'metrics\']\r\n            f.write(f\"Cha\u00EEne: {arch[\'chain\']}\\n\")\r\n            f.write(f\"  -> Gain min = {gain_min_dB:.2f} dB | Gain max = {gain_max_dB:.2f} dB\\n\")\r\n            f.write(f\"     NF min   = {nf_min:.2f} dB    | NF max   = {nf_max:.2f} dB\\n\")\r\n            f.write(f\"     OP1dB sort. min = {p1db_min:.2f} dBm | OP1dB sort. max = {p1db_max:.2f} dBm\\n\")\r\n            f.write(f\"     IP1dB entr. min = {ip1_min:.2f} dBm | IP1dB entr. max = {ip1_max:.2f} dBm\\n\")\r\n            f.write(f\"     Score    = {arch[\'score\']:.4f}\\n\\n\")\r\n\r\n    # afficher meilleure architecture\r\n    best_arch = scored_archs_sorted[0]\r\n    gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = best_arch[\'metrics\']\r\n\r\n    print(\"\\n=== \u2705 Meilleure architecture trouv\u00E9e ===\")\r\n    print(f\"Cha\u00EEne: {best_arch[\'chain\']}\\n\")\r\n    print(f\"Gain min (att\u00E9nuateurs \u00E0 min) : {gain_min_dB:.2f} dB\")\r\n    print(f\"Gain max (att\u00E9nuateurs \u00E0 max) : {gain_max_dB:.2f} dB\\n\")\r\n    print(f\"NF min (gain min)              : {nf_min:.2f} dB\")\r\n    print(f\"NF max (gain max)              : {nf_max:.2f} dB\\n\")\r\n    print(f\"OP1dB sortie (min)             : {p1db_min:.2f} dBm\")\r\n    print(f\"OP1dB sortie (max)             : {p1db_max:.2f} dBm\\n\")\r\n    print(f\"IP1dB entr\u00E9e (min)             : {ip1_min:.2f} dBm\")\r\n    print(f\"IP1dB entr\u00E9e (max)             : {ip1_max:.2f} dBm\\n\")\r\n    print(f\"Score                          : {best_arch[\'score\']:.4f}\\n\")\r\n\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
-  "code_yaml": "# Fichier d\'entr\u00E9e pour le script : param\u00E8tres cibles et liste de composants\r\n# Units:\r\n#  - gains \/ pertes : dB\r\n#  - NF : dB\r\n#  - P1dB \/ OP1dB : dBm\r\n\r\n# Objectifs \/ contraintes globales que le script tente d\'atteindre\r\ngain_total_target_dB: 30     # cible de gain total (dB) recherch\u00E9e par le scoring\r\nnf_max_dB: 10               # NF max tol\u00E9r\u00E9 (dB) pour l\'architecture \"pessimiste\"\r\np1db_min_dBm: 0             # OP1dB minimal demand\u00E9 (dBm) \u2014 phase pessimiste\r\nlna_count: 4                # info utile (nombre total LNAs envisag\u00E9s) \u2014 non obligatoire\r\n\r\ncomponents:\r\n  # Composants \"fixes\" (seront group\u00E9s en blocs si locked_with_next=True)\r\n  - name: \"preselector\"\r\n    type: \"filter\"\r\n    gain_dB: -5              # ici on utilise gain_dB n\u00E9gatif ; si tu pr\u00E9f\u00E8res insertion_loss_dB: 5\r\n    nf_dB: 5                 # NF pour les passifs (dans notre convention NF = perte d\'insertion)\r\n    p1db_dBm: 25             # OP1dB du composant en dBm\r\n    fixed: true              # composant fixe (non d\u00E9plac\u00E9 par l\'algorithme)\r\n\r\n  - name: \"ImageFilter\"\r\n    type: \"filter\"\r\n    gain_dB: -8.49\r\n    nf_dB: 8.49\r\n    p1db_dBm: 17.35\r\n    fixed: true\r\n\r\n  - name: \"ATT-3dB fixe\"\r\n    type: attenuator\r\n    gain_dB: -3.0\r\n    nf_dB: 3.0\r\n    p1db_dBm: 20\r\n    fixed: true\r\n    locked_with_next: true   # verrouille ce composant avec le suivant dans le m\u00EAme bloc\r\n                             # (utile pour regrouper ATT + Mixer + OL_Filter en un bloc)\r\n\r\n  - name: \"Mixer\"\r\n    type: \"mixer\"\r\n    gain_dB: -6.83\r\n    nf_dB: 7.5\r\n    p1db_dBm: 14\r\n    fixed: true\r\n    locked_with_next: true\r\n\r\n  - name: \"OL_Filter\"\r\n    type: \"filter\"\r\n    gain_dB: -0.63\r\n    nf_dB: 0.63\r\n    p1db_dBm: 20\r\n    fixed: true\r\n\r\n  - name: \"Switch\"\r\n    type: attenuator\r\n    gain_dB: -2.0\r\n    nf_dB: 2.0\r\n    p1db_dBm: 25\r\n    fixed: true\r\n    locked_with_next: true   # verrouille Switch avec le passe_bande suivant\r\n\r\n  - name: \"passe_bande\"\r\n    type: \"filter\"\r\n    gain_dB: -0.7\r\n    nf_dB: 0.7\r\n    p1db_dBm: 25\r\n    fixed: true\r\n\r\n  # LNAs mobiles \u2014 l\'algorithme testera diff\u00E9rentes positions pour ces \u00E9l\u00E9ments\r\n  - name: \"LNA1\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3.5\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n\r\n  - name: \"LNA2\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n\r\n  - name: \"LNA3\"\r\n    type: \"lna\"\r\n    gain_dB: 27\r\n    nf_dB: 1\r\n    p1db_dBm: 12.4\r\n    fixed: false\r\n\r\n  # Att\u00E9nuateur variable \u2014 on fournit les options disponibles (le script testera les 2 positions)\r\n  - name: \"ATT\"\r\n    type: \"attenuator\"\r\n    gain_dB_options: [-3, -30]   # options d\'att\u00E9nuation que l\'on peut s\u00E9lectionner\r\n    nf_dB: 30                    # NF renseign\u00E9 (ici j\'ai mis 30 dB pour forcer la p\u00E9nalit\u00E9 si utilis\u00E9)\r\n    p1db_dBm: 22\r\n    fixed: false                 # att\u00E9nuateur mobile: script pourra l\'ins\u00E9rer entre blocs\r\n\r\n  - name: \"LNA4\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n",
+  "code_py": "#!\/usr\/bin\/env python3\r\n# -*- coding: utf-8 -*-\r\n\"\"\"\r\nScript : architecture_optimizer.py\r\nBut    : g\u00E9n\u00E9rer et scorer des architectures RF (placement LNAs + configurations d\'att\u00E9nuateurs)\r\nAuteur : (ton nom)\r\nUsage  : placer le YAML d\'entr\u00E9e (components.yaml) dans le m\u00EAme dossier et lancer le script.\r\nSortie : results.txt (liste des architectures test\u00E9es) + r\u00E9sum\u00E9 console (meilleure architecture)\r\n\r\nConventions et unit\u00E9s :\r\n - Tous les niveaux en dB (gain_dB, insertion_loss_dB, nf_dB)\r\n - OP1dB dans le YAML donn\u00E9 en dBm (op1db_dBm ou p1db_dBm accepted)\r\n - Fonctions utilitaires convertissent dB <-> lin\u00E9aire :\r\n     lin = 10^(dB\/10)\r\n - Pour les composants passifs (type \'filter\' ou \'switch\'), on attend\r\n   insertion_loss_dB (positive) et on consid\u00E8re :\r\n     gain_dB = -insertion_loss_dB\r\n     nf_dB   = insertion_loss_dB  (hypoth\u00E8se : NF = pertes d\'insertion)\r\n - Si un champ manque, valeurs par d\u00E9faut raisonnables sont appliqu\u00E9es\r\n   (ex : p1db absent -> p1db_lin = +inf : \u00E9tage non contraignant, ignor\u00E9 dans le\r\n   calcul de l\'OP1dB ; pas de valeur sentinelle type +1000 dBm).\r\n\"\"\"\r\n\r\nimport yaml\r\nimport itertools\r\nimport math\r\nimport os\r\nimport pickle\r\nfrom concurrent.futures import ProcessPoolExecutor\r\nimport numpy as np\r\n\r\ntry:\r\n    # chargeur YAML adoss\u00E9 \u00E0 libyaml (bien plus rapide), si PyYAML a \u00E9t\u00E9 compil\u00E9 avec\r\n    from yaml import CSafeLoader as SafeLoader\r\nexcept ImportError:\r\n    from yaml import SafeLoader\r\n\r\n# -------------------------\r\n# Utils de base (conversions)\r\n# -------------------------\r\ndef non_empty_subsets(lst):\r\n    \"\"\"\r\n    G\u00E9n\u00E8re tous les sous-ensembles non vides de la liste `lst` (g\u00E9n\u00E9rateur : les 2^K - 1\r\n    sous-ensembles sont produits \u00E0 la demande, sans liste interm\u00E9diaire).\r\n    Utilis\u00E9 pour tester toutes les combinaisons possibles de LNAs mobiles.\r\n    \"\"\"\r\n    return (list(subset) for r in range(1, len(lst)+1) for subset in itertools.combinations(lst, r))\r\n\r\ndef db_to_lin(db):\r\n    \"\"\"Convertit dB -> lin\u00E9aire (puissance facteur).\"\"\"\r\n    return 10 ** (db \/ 10)\r\n\r\n# 10**(x\/10) == exp(x * ln(10)\/10) : np.exp est vectoris\u00E9 (SIMD) sur tout un tableau\r\nLN10_OVER_10 = math.log(10) \/ 10\r\n\r\ndef db_to_lin_array(db):\r\n    \"\"\"Version vectoris\u00E9e de db_to_lin sur un tableau numpy (ou une liste) de valeurs en dB.\"\"\"\r\n    return np.exp(np.asarray(db, dtype=np.float64) * LN10_OVER_10)\r\n\r\ndef lin_to_db_array(lin):\r\n    \"\"\"Convertit lin\u00E9aire -> dB sur un tableau numpy (valeurs > 0).\"\"\"\r\n    return 10.0 * np.log10(lin)\r\n\r\n# -------------------------\r\n# Repr\u00E9sentation des cha\u00EEnes : tableaux structur\u00E9s numpy (SoA)\r\n# -------------------------\r\n# une cha\u00EEne = un tableau de CHAIN_DTYPE (un \u00E9l\u00E9ment par \u00E9tage) : chaque champ\r\n# (chain[\'gain_lin\'], chain[\'nf_lin\'], ...) se lit comme un tableau, sans acc\u00E8s dict par \u00E9tage\r\nCHAIN_DTYPE = np.dtype([\r\n    (\'gain_lin\', \'f8\'),\r\n    (\'nf_lin\', \'f8\'),\r\n    (\'p1db_lin\', \'f8\'),\r\n    (\'gain_dB\', \'f8\'),\r\n], align=True)\r\n\r\ndef stage_record(gain_lin, nf_lin, p1db_lin, gain_dB):\r\n    \"\"\"Retourne un \u00E9tage au format CHAIN_DTYPE (tuple, \u00E0 assembler avec np.array).\"\"\"\r\n    return (gain_lin, nf_lin, p1db_lin, gain_dB)\r\n\r\n# -------------------------\r\n# Chargement YAML\r\n# -------------------------\r\ndef load_config(yaml_filename):\r\n    \"\"\"\r\n    Charge un fichier YAML situ\u00E9 dans le m\u00EAme dossier que ce script.\r\n    Retourne le contenu Python (dictionnaires \/ listes).\r\n    \"\"\"\r\n    script_dir = os.path.dirname(os.path.abspath(__file__))\r\n    yaml_path = os.path.join(script_dir, yaml_filename)\r\n    with open(yaml_path, \'r\') as f:\r\n        return yaml.load(f, Loader=SafeLoader)\r\n\r\n# version du format mis en cache : \u00E0 incr\u00E9menter si prepare_config change de sortie\r\nPREPARED_CACHE_VERSION = 2\r\n\r\ndef load_prepared_config(yaml_filename):\r\n    \"\"\"\r\n    Charge le YAML et son pr\u00E9traitement (prepare_config) en passant par un cache pickle\r\n    (<yaml>.pkl \u00E0 c\u00F4t\u00E9 du YAML) : tant que le YAML n\'a pas \u00E9t\u00E9 modifi\u00E9 (m\u00EAme mtime) et que\r\n    le format n\'a pas chang\u00E9 (PREPARED_CACHE_VERSION), on \u00E9vite le parsing YAML et les\r\n    conversions dB -> lin\u00E9aire. Le cache est recr\u00E9\u00E9 sinon ; s\'il est illisible ou ne peut\r\n    pas \u00EAtre \u00E9crit, on se contente du calcul direct.\r\n    \"\"\"\r\n    script_dir = os.path.dirname(os.path.abspath(__file__))\r\n    yaml_path = os.path.join(script_dir, yaml_filename)\r\n    cache_path = yaml_path + \'.pkl\'\r\n    yaml_mtime = os.path.getmtime(yaml_path)\r\n\r\n    try:\r\n        with open(cache_path, \'rb\') as f:\r\n            cached = pickle.load(f)\r\n        if cached[\'version\'] == PREPARED_CACHE_VERSION and cached[\'yaml_mtime\'] == yaml_mtime:\r\n            return cached[\'prepared\']\r\n    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):\r\n        pass\r\n\r\n    prepared = prepare_config(load_config(yaml_filename))\r\n    try:\r\n        with open(cache_path, \'wb\') as f:\r\n            pickle.dump({\'version\': PREPARED_CACHE_VERSION, \'yaml_mtime\': yaml_mtime,\r\n                         \'prepared\': prepared}, f, protocol=pickle.HIGHEST_PROTOCOL)\r\n    except OSError:\r\n        pass\r\n    return prepared\r\n\r\n# -------------------------\r\n# Calculs physiques\r\n# -------------------------\r\n# noyaux Python d\u00E9roul\u00E9s, g\u00E9n\u00E9r\u00E9s une fois par longueur de cha\u00EEne N (cl\u00E9 : N)\r\n_unrolled_kernel_cache = {}\r\n\r\ndef _unrolled_nf_source(n):\r\n    \"\"\"\r\n    Source de calc_nf d\u00E9roul\u00E9 pour N = n \u00E9tages :\r\n    NF_total_lin = NF1 + (NF2-1)\/G1 + (NF3-1)\/(G1*G2) + ..., retour en dB.\r\n    \"\"\"\r\n    lines = [\"def nf_%d(gain_lin, nf_lin):\" % n,\r\n             \"    nf_total_lin = nf_lin[0]\",\r\n             \"    gain_prod = gain_lin[0]\"]\r\n    for i in range(1, n):\r\n        lines.append(\"    nf_total_lin += (nf_lin[%d] - 1.0) \/ gain_prod\" % i)\r\n        lines.append(\"    gain_prod *= gain_lin[%d]\" % i)\r\n    lines.append(\"    return 10.0 * math.log10(nf_total_lin)\")\r\n    return \"\\n\".join(lines)\r\n\r\ndef _unrolled_p1db_source(n):\r\n    \"\"\"\r\n    Source de calc_p1db d\u00E9roul\u00E9 pour N = n \u00E9tages : une seule passe \u00E0 l\'envers,\r\n    g_after = produit des gains des \u00E9tages plac\u00E9s apr\u00E8s i ; les \u00E9tages avec\r\n    p1db_lin <= 0 ou infini (absent) sont ignor\u00E9s, +inf si aucun n\'est contraignant.\r\n    \"\"\"\r\n    lines = [\"def p1db_%d(gain_lin, p1db_lin):\" % n,\r\n             \"    g_after = 1.0\",\r\n             \"    inv_sum = 0.0\"]\r\n    for i in range(n - 1, -1, -1):\r\n        lines.append(\"    if p1db_lin[%d] > 0 and math.isfinite(p1db_lin[%d]):\" % (i, i))\r\n        lines.append(\"        inv_sum += 1.0 \/ (p1db_lin[%d] * g_after)\" % i)\r\n        lines.append(\"    g_after *= gain_lin[%d]\" % i)\r\n    lines.append(\"    if inv_sum <= 0:\")\r\n    lines.append(\"        return math.inf\")\r\n    lines.append(\"    return 10.0 * math.log10(1.0 \/ inv_sum)\")\r\n    return \"\\n\".join(lines)\r\n\r\ndef unrolled_kernels(n):\r\n    \"\"\"\r\n    Retourne (nf_kernel, p1db_kernel) : noyaux sans boucle de calc_nf \/ calc_p1db\r\n    pour des cha\u00EEnes de longueur n, g\u00E9n\u00E9r\u00E9s par exec puis mis en cache (la boucle Python\r\n    et ses indices co\u00FBteraient plus que les calculs eux-m\u00EAmes) ; ils prennent des listes de floats.\r\n    \"\"\"\r\n    kernels = _unrolled_kernel_cache.get(n)\r\n    if kernels is None:\r\n        namespace = {\'math\': math}\r\n        exec(_unrolled_nf_source(n), namespace)\r\n        exec(_unrolled_p1db_source(n), namespace)\r\n        kernels = (namespace[\'nf_%d\' % n], namespace[\'p1db_%d\' % n])\r\n        _unrolled_kernel_cache[n] = kernels\r\n    return kernels\r\n\r\ndef calc_nf(chain):\r\n    \"\"\"\r\n    Calcule le NF total de la cha\u00EEne via la formule de Friis (en lin\u00E9aire),\r\n    puis convertit en dB pour retour.\r\n    chain: tableau numpy de CHAIN_DTYPE (champs \'gain_lin\' et \'nf_lin\' en lin\u00E9aire).\r\n    NF_total_lin = NF1 + (NF2-1)\/G1 + (NF3-1)\/(G1*G2) + ...\r\n    Retour: NF total en dB.\r\n    (noyau d\u00E9roul\u00E9 pour la longueur de la cha\u00EEne, voir unrolled_kernels)\r\n    \"\"\"\r\n    nf_kernel = unrolled_kernels(len(chain))[0]\r\n    return nf_kernel(chain[\'gain_lin\'].tolist(), chain[\'nf_lin\'].tolist())\r\n\r\ndef calc_p1db(chain):\r\n    \"\"\"\r\n    Calcule l\'OP1dB total en sortie d\'une cha\u00EEne.\r\n    M\u00E9thode utilis\u00E9e (identique au second script de r\u00E9f\u00E9rence) :\r\n      - pour chaque \u00E9tage i, on calcule le gain restant apr\u00E8s l\'\u00E9tage: gain_after[i]\r\n        (produit des gains des \u00E9tages qui suivent)\r\n      - on somme les inverses pond\u00E9r\u00E9es : inv_sum = sum( 1 \/ (p1db_lin_i * gain_after[i]) )\r\n      - P1dB_total_lin = 1 \/ inv_sum\r\n      - on retourne P1dB en dB (dBm, car p1db_lin provient d\'une conversion depuis dBm)\r\n    Remarques :\r\n      - Si un \u00E9tage n\'a pas de p1db d\u00E9fini (p1db_lin infini) ou valeur non positive,\r\n        on l\'ignore (contrib. nulle).\r\n      - Si aucun \u00E9tage n\'est contraignant (inv_sum == 0), on retourne +inf.\r\n      - Cha\u00EEne vide : on retourne -inf pour signaler l\'impossibilit\u00E9.\r\n    chain: tableau numpy de CHAIN_DTYPE.\r\n    (noyau d\u00E9roul\u00E9 pour la longueur de la cha\u00EEne, voir unrolled_kernels)\r\n    \"\"\"\r\n    if len(chain) == 0:\r\n        return float(\'-inf\')\r\n\r\n    p1db_kernel = unrolled_kernels(len(chain))[1]\r\n    return p1db_kernel(chain[\'gain_lin\'].tolist(), chain[\'p1db_lin\'].tolist())\r\n\r\n# -------------------------\r\n# Calculs physiques vectoris\u00E9s (lot d\'architectures)\r\n# -------------------------\r\ndef compute_metrics_batch(gain, nf, p1db, gain_dB):\r\n    \"\"\"\r\n    Calcule en une seule passe, pour un lot de A cha\u00EEnes de m\u00EAme longueur N,\r\n    le NF total, l\'OP1dB de sortie et le gain total.\r\n    gain, nf, p1db : tableaux numpy (A, N) en lin\u00E9aire.\r\n    gain_dB        : tableau numpy (A, N) des m\u00EAmes gains en dB ; le gain total en dB est\r\n                     leur simple somme (pas d\'aller-retour lin\u00E9aire -> dB).\r\n    Le produit cumul\u00E9 des gains cum_gain est calcul\u00E9 une seule fois et sert aux deux formules :\r\n      - Friis : NF_total = NF1 + sum_i (NF_i - 1) \/ cum_gain[i-1]\r\n      - OP1dB : gain_after[:, i] = cum_gain[:, -1] \/ cum_gain[:, i]\r\n                inv_sum = sum_i 1 \/ (p1db_i * gain_after_i), les \u00E9tages sans P1dB\r\n                (p1db = +inf) \u00E9tant masqu\u00E9s explicitement\r\n    Retour: (nf_dB, p1db_dBm, gain_dB), chacun un tableau (A,)\r\n            (p1db_dBm = +inf si aucun \u00E9tage n\'est contraignant).\r\n    \"\"\"\r\n    cum_gain = np.cumprod(gain, axis=1)\r\n    total_gain = cum_gain[:, -1]\r\n\r\n    nf_total_lin = nf[:, 0] + ((nf[:, 1:] - 1) \/ cum_gain[:, :-1]).sum(axis=1)\r\n\r\n    gain_after = total_gain[:, None] \/ cum_gain\r\n    with np.errstate(divide=\'ignore\', invalid=\'ignore\'):\r\n        inv_sum = np.where(np.isfinite(p1db), 1.0 \/ (p1db * gain_after), 0.0).sum(axis=1)\r\n        p1db_dBm = np.where(inv_sum > 0, lin_to_db_array(1.0 \/ inv_sum), np.inf)\r\n\r\n    return lin_to_db_array(nf_total_lin), p1db_dBm, gain_dB.sum(axis=1)\r\n\r\n# -------------------------\r\n# Gestion des blocs verrouill\u00E9s\r\n# -------------------------\r\ndef group_locked_stages(stages):\r\n    \"\"\"\r\n    Construit des \'blocs\' \u00E0 partir d\'une liste de composants fixes en respectant\r\n    le champ `locked_with_next`: si un composant a locked_with_next=True,\r\n    on le regroupe avec le suivant dans le m\u00EAme bloc.\r\n    Retour: liste de blocs (chacun une liste de composants).\r\n    \"\"\"\r\n    blocks = []\r\n    current_block = []\r\n    for comp in stages:\r\n        current_block.append(comp)\r\n        if not comp.get(\'locked_with_next\', False):\r\n            blocks.append(current_block)\r\n            current_block = []\r\n    if current_block:\r\n        blocks.append(current_block)\r\n    return blocks\r\n\r\ndef flatten_block_names(block):\r\n    \"\"\"Retourne un nom simple pour le bloc : concat\u00E9nation des noms s\u00E9par\u00E9s par \' + \'.\"\"\"\r\n    return \" + \".join(comp[\'name\'] for comp in block)\r\n\r\ndef flatten_block_stages(block):\r\n    \"\"\"\r\n    Transforme un bloc (liste de composants) en un seul \'stage\' synth\u00E9tique.\r\n    Important : on calcule le NF et l\'OP1dB du bloc **en appliquant exactement**\r\n    les m\u00EAmes formules de cascade (calc_nf et calc_p1db) \u00E0 la sous-cha\u00EEne interne.\r\n    Cela \u00E9vite les approximations (somme na\u00EFve des NF qui faussent les r\u00E9sultats).\r\n\r\n    Retourne un dict avec:\r\n      - name, gain_dB (somme), gain_dB_max (somme), nf_dB (calc Friis sur sous-cha\u00EEne),\r\n        p1db_dBm (OP1dB du bloc), gain_lin, nf_lin, p1db_lin, type=\'block\'\r\n    \"\"\"\r\n    subchain = np.empty(len(block), dtype=CHAIN_DTYPE)\r\n    total_gain_dB = 0.0\r\n    total_gain_dB_max = 0.0\r\n\r\n    for i, comp in enumerate(block):\r\n        # Pour les passifs (filter, switch) : on cherche insertion_loss_dB (positive)\r\n        # gain_comp_dB = - insertion_loss_dB ; nf_comp_dB = insertion_loss_dB\r\n        if comp.get(\'type\') in [\'filter\', \'switch\'] and \'insertion_loss_dB\' in comp:\r\n            loss = float(comp[\'insertion_loss_dB\'])\r\n            gain_comp_dB = -abs(loss)\r\n            nf_comp_dB = abs(loss)\r\n        else:\r\n            gain_comp_dB = float(comp.get(\'gain_dB\', 0.0))\r\n            nf_comp_dB = float(comp.get(\'nf_dB\', abs(gain_comp_dB)))\r\n\r\n        # p1db en dBm : accepte p1db_dBm ou op1db_dBm ; absent -> +inf (non contraignant)\r\n        p1db_val = comp.get(\'p1db_dBm\', comp.get(\'op1db_dBm\'))\r\n\r\n        # Construire l\'\u00E9tage en lin\u00E9aire attendu par calc_nf \/ calc_p1db\r\n        subchain[i] = stage_record(\r\n            db_to_lin(gain_comp_dB),\r\n            db_to_lin(nf_comp_dB),\r\n            db_to_lin(float(p1db_val)) if p1db_val is not None else math.inf,\r\n            gain_comp_dB\r\n        )\r\n\r\n        total_gain_dB += gain_comp_dB\r\n        total_gain_dB_max += float(comp.get(\'gain_dB_max\', gain_comp_dB))\r\n\r\n    # Calculs corrects par cascade sur la sous-cha\u00EEne\r\n    block_nf_dB = calc_nf(subchain)        # NF du bloc en dB (Friis)\r\n    block_p1db_dBm = calc_p1db(subchain)   # OP1dB du bloc en dBm\r\n\r\n    return {\r\n        \'name\': flatten_block_names(block),\r\n        \'gain_dB\': total_gain_dB,\r\n        \'gain_dB_max\': total_gain_dB_max,\r\n        \'nf_dB\': block_nf_dB,\r\n        \'p1db_dBm\': block_p1db_dBm,\r\n        \'gain_lin\': db_to_lin(total_gain_dB),\r\n        \'nf_lin\': db_to_lin(block_nf_dB),\r\n        \'p1db_lin\': db_to_lin(block_p1db_dBm),\r\n        \'type\': \'block\'\r\n    }\r\n\r\n# -------------------------\r\n# Table globale des \u00E9tages candidats\r\n# -------------------------\r\ndef build_stage_table(block_stages, lnas, attenuators):\r\n    \"\"\"\r\n    Construit la table de tous les \u00E9tages candidats, chacun rep\u00E9r\u00E9 par un id entier :\r\n      - un id par bloc fixe (dans l\'ordre des blocs)\r\n      - un id par LNA mobile\r\n      - un id par r\u00E9glage de chaque att\u00E9nuateur (une entr\u00E9e par option de gain_dB_options)\r\n    Les architectures sont ensuite d\u00E9crites par des lignes d\'ids, et les \u00E9tages\r\n    sont rassembl\u00E9s en une seule indexation numpy (table[\'stages\'][idx]).\r\n\r\n    Retourne un dict avec:\r\n      - name      : liste des noms (index\u00E9e par id)\r\n      - stages    : tableau (S,) de CHAIN_DTYPE (gain_lin, nf_lin, p1db_lin, gain_dB)\r\n      - stages_min \/ stages_max : tableaux (S,) fr\u00E8res de stages, avec chaque att\u00E9nuateur\r\n                          r\u00E9gl\u00E9 \u00E0 son gain minimal \/ maximal (attributs \'_min_triplet\' \/\r\n                          \'_max_triplet\' pr\u00E9calcul\u00E9s dans main ; identiques \u00E0 stages pour\r\n                          les blocs et LNAs)\r\n      - canon     : liste (S,) id canonique de chaque \u00E9tage = premier id de m\u00EAme nom et de\r\n                    m\u00EAmes variantes min\/max (ex : les r\u00E9glages d\'un m\u00EAme att\u00E9nuateur, deux\r\n                    LNAs identiques) ; deux cha\u00EEnes de m\u00EAme cl\u00E9 canonique ont les m\u00EAmes m\u00E9triques\r\n      - block_ids, lna_ids : listes d\'ids\r\n      - att_ids   : pour chaque att\u00E9nuateur, liste des ids de ses r\u00E9glages\r\n    \"\"\"\r\n    names = []\r\n    stages = []\r\n    stages_min = []\r\n    stages_max = []\r\n\r\n    def add_stage(name, gain_dB, triplet, variant_min=None, variant_max=None):\r\n        # variant_min \/ variant_max : (gain_dB, triplet) de l\'att\u00E9nuateur r\u00E9gl\u00E9 au min \/ max\r\n        names.append(name)\r\n        stages.append(stage_record(*triplet, gain_dB))\r\n        gain_dB_min, triplet_min = variant_min or (gain_dB, triplet)\r\n        gain_dB_max, triplet_max = variant_max or (gain_dB, triplet)\r\n        stages_min.append(stage_record(*triplet_min, gain_dB_min))\r\n        stages_max.append(stage_record(*triplet_max, gain_dB_max))\r\n        return len(names) - 1\r\n\r\n    block_ids = [add_stage(b[\'name\'], b[\'gain_dB\'], (b[\'gain_lin\'], b[\'nf_lin\'], b[\'p1db_lin\']))\r\n                 for b in block_stages]\r\n    lna_ids = [add_stage(l[\'name\'], l.get(\'gain_dB\', 0.0),\r\n                         (l[\'gain_lin\'], l[\'nf_lin\'], l[\'p1db_lin\']))\r\n               for l in lnas]\r\n\r\n    att_ids = []\r\n    for att in attenuators:\r\n        # options d\u00E9j\u00E0 converties en lin\u00E9aire dans main (att[\'_options\']) : aucun calcul ici\r\n        att_ids.append([\r\n            add_stage(att[\'name\'], opt[\'gain_dB\'],\r\n                      (opt[\'gain_lin\'], opt[\'nf_lin\'], opt[\'p1db_lin\']),\r\n                      (att[\'_min_gain_dB\'], att[\'_min_triplet\']),\r\n                      (att[\'_max_gain_dB\'], att[\'_max_triplet\']))\r\n            for opt in att[\'_options\']\r\n        ])\r\n\r\n    first_id = {}\r\n    canon = [first_id.setdefault((name, s_min, s_max), i)\r\n             for i, (name, s_min, s_max) in enumerate(zip(names, stages_min, stages_max))]\r\n\r\n    return {\r\n        \'name\': names,\r\n        \'canon\': canon,\r\n        \'stages\': np.array(stages, dtype=CHAIN_DTYPE),\r\n        \'stages_min\': np.array(stages_min, dtype=CHAIN_DTYPE),\r\n        \'stages_max\': np.array(stages_max, dtype=CHAIN_DTYPE),\r\n        \'block_ids\': block_ids,\r\n        \'lna_ids\': lna_ids,\r\n        \'att_ids\': att_ids\r\n    }\r\n\r\n# -------------------------\r\n# G\u00E9n\u00E9ration de toutes les architectures\r\n# -------------------------\r\ndef unique_by_canon(combos, canon):\r\n    \"\"\"\r\n    Garde la premi\u00E8re occurrence de chaque combinaison d\'ids, \u00E0 \u00E9quivalence canonique pr\u00E8s\r\n    (voir table[\'canon\']). L\'ordre de premi\u00E8re apparition est conserv\u00E9.\r\n    \"\"\"\r\n    unique = {}\r\n    for combo in combos:\r\n        unique.setdefault(tuple(canon[i] for i in combo), combo)\r\n    return list(unique.values())\r\n\r\ndef nf_pruning_is_safe(table):\r\n    \"\"\"\r\n    L\'\u00E9lagage sur le NF (voir generate_all_chains) suppose qu\'ins\u00E9rer un att\u00E9nuateur ne peut\r\n    pas diminuer le NF de la cha\u00EEne : vrai si tous les NF lin\u00E9aires sont >= 1 et si aucun\r\n    att\u00E9nuateur n\'a de gain (gain_lin <= 1 dans sa variante max).\r\n    \"\"\"\r\n    att_ids = [i for ids in table[\'att_ids\'] for i in ids]\r\n    stages_max = table[\'stages_max\']\r\n    return bool(np.all(stages_max[\'nf_lin\'] >= 1.0)\r\n                and np.all(stages_max[\'gain_lin\'][att_ids] <= 1.0))\r\n\r\ndef insertion_slots(n_base, positions):\r\n    \"\"\"\r\n    Calcule, en une seule passe de fusion, la place finale des \u00E9l\u00E9ments quand on ins\u00E8re\r\n    len(positions) \u00E9l\u00E9ments dans une liste de n_base \u00E9l\u00E9ments (positions croissantes,\r\n    l\'\u00E9l\u00E9ment k \u00E9tant ins\u00E9r\u00E9 avant l\'\u00E9l\u00E9ment base[positions[k]], comme list.insert).\r\n    Retourne (base_slots, inserted_slots) : tableaux d\'indices dans la liste finale.\r\n    \"\"\"\r\n    base_slots = np.empty(n_base, dtype=np.intp)\r\n    inserted_slots = np.empty(len(positions), dtype=np.intp)\r\n    k = 0\r\n    slot = 0\r\n    for j in range(n_base):\r\n        if k < len(positions) and positions[k] == j:\r\n            inserted_slots[k] = slot\r\n            k += 1\r\n            slot += 1\r\n        base_slots[j] = slot\r\n        slot += 1\r\n    return base_slots, inserted_slots\r\n\r\ndef generate_all_chains(table, movable_lna_ids, nf_prune_dB=None):\r\n    \"\"\"\r\n    Ins\u00E8re les LNAs mobiles dans les positions possibles entre les blocs fixes,\r\n    puis ins\u00E8re les att\u00E9nuateurs (avec toutes les combinaisons de r\u00E9glages possibles).\r\n    Travaille uniquement sur des ids d\'\u00E9tages (voir build_stage_table).\r\n\r\n    \u00C9limination des doublons \/ \u00E9lagage :\r\n      - les placements de LNAs et combinaisons de r\u00E9glages \u00E9quivalents (m\u00EAme cl\u00E9 canonique,\r\n        ex : permutations de LNAs identiques, r\u00E9glages d\'un att\u00E9nuateur qui ne changent pas\r\n        ses variantes min\/max) ne sont g\u00E9n\u00E9r\u00E9s qu\'une fois ;\r\n      - si nf_prune_dB est fourni, un placement de LNAs dont le NF (variante max, avant\r\n        insertion des att\u00E9nuateurs) d\u00E9passe d\u00E9j\u00E0 nf_prune_dB est abandonn\u00E9 : ins\u00E9rer des\r\n        att\u00E9nuateurs ne peut qu\'augmenter le NF (voir nf_pruning_is_safe).\r\n    Le tableau r\u00E9sultat est allou\u00E9 une seule fois (majorant du nombre d\'architectures) puis\r\n    rempli par affectations de colonnes (voir insertion_slots), sans list.insert ni copie\r\n    de ligne ; il est tronqu\u00E9 au nombre de lignes effectivement produites.\r\n    Retourne un tableau d\'ids (A, N) : une ligne par architecture test\u00E9e.\r\n    \"\"\"\r\n    block_ids = table[\'block_ids\']\r\n    att_ids = table[\'att_ids\']\r\n    canon = np.asarray(table[\'canon\'], dtype=np.int32)\r\n    n_lna = len(movable_lna_ids)\r\n    n_att = len(att_ids)\r\n\r\n    insert_positions = range(1, len(block_ids))  # positions entre blocs\r\n    layout_len = len(block_ids) + n_lna\r\n    chain_len = layout_len + n_att\r\n\r\n    # combinaisons de r\u00E9glages des att\u00E9nuateurs (sans doublons canoniques) : (G, n_att)\r\n    # (nombre de lignes explicite : sans att\u00E9nuateur, product() donne une seule combinaison vide)\r\n    combos = unique_by_canon(itertools.product(*att_ids), canon)\r\n    att_gain_combos = np.array(combos, dtype=np.int32).reshape(len(combos), n_att)\r\n    n_gain_combos = len(att_gain_combos)\r\n\r\n    # placements des att\u00E9nuateurs dans une cha\u00EEne de layout_len \u00E9tages : ne d\u00E9pendent pas\r\n    # du placement des LNAs, calcul\u00E9s une seule fois\r\n    att_slots = [insertion_slots(layout_len, att_pos_combo)\r\n                 for att_pos_combo in itertools.combinations(range(1, layout_len), n_att)]\r\n\r\n    # majorant : tous les placements de LNAs x placements d\'att\u00E9nuateurs x r\u00E9glages\r\n    max_rows = (math.comb(len(insert_positions), n_lna) * math.perm(n_lna)\r\n                * len(att_slots) * n_gain_combos)\r\n    idx = np.empty((max_rows, chain_len), dtype=np.int32)\r\n    n_rows = 0\r\n\r\n    layout = np.empty(layout_len, dtype=np.int32)\r\n    seen_layouts = set()\r\n\r\n    # it\u00E8re sur choix de positions pour les LNAs mobiles\r\n    for lna_positions in itertools.combinations(insert_positions, n_lna):\r\n        block_slots, lna_slots = insertion_slots(len(block_ids), lna_positions)\r\n        for lna_perm in itertools.permutations(movable_lna_ids):\r\n            # les LNAs suivent l\'ordre des positions\r\n            layout[block_slots] = block_ids\r\n            layout[lna_slots] = lna_perm\r\n\r\n            # placement d\u00E9j\u00E0 vu (permutation de LNAs identiques) -> ignor\u00E9\r\n            layout_key = canon[layout].tobytes()\r\n            if layout_key in seen_layouts:\r\n                continue\r\n            seen_layouts.add(layout_key)\r\n\r\n            # \u00E9lagage : NF d\u00E9j\u00E0 trop \u00E9lev\u00E9 avant m\u00EAme d\'ins\u00E9rer les att\u00E9nuateurs\r\n            if nf_prune_dB is not None:\r\n                if calc_nf(table[\'stages_max\'][layout]) > nf_prune_dB:\r\n                    continue\r\n\r\n            # un bloc de n_gain_combos lignes par placement des att\u00E9nuateurs\r\n            for layout_slots, att_cols in att_slots:\r\n                rows = idx[n_rows:n_rows + n_gain_combos]\r\n                rows[:, layout_slots] = layout\r\n                rows[:, att_cols] = att_gain_combos\r\n                n_rows += n_gain_combos\r\n\r\n    return idx[:n_rows]\r\n\r\n# -------------------------\r\n# Calcul min\/max (att\u00E9nuateurs)\r\n# -------------------------\r\ndef compute_metrics_gain_min_max(idx, table):\r\n    \"\"\"\r\n    Pour un lot d\'architectures idx (A, N) de m\u00EAme longueur, construit deux variantes :\r\n      - chain_min : att\u00E9nuateurs \u00E0 leur valeur minimale (min gain_dB)\r\n      - chain_max : att\u00E9nuateurs \u00E0 leur valeur maximale (max gain_dB)\r\n    (simple indexation des tableaux pr\u00E9calcul\u00E9s table[\'stages_min\'] \/ table[\'stages_max\'])\r\n    Puis calcule en une passe vectoris\u00E9e (tableaux (A, N)) pour chaque variante :\r\n      - gain total (dB)\r\n      - NF total (dB)\r\n      - OP1dB sortie (dBm)\r\n    Enfin calcule IP1dB d\'entr\u00E9e :\r\n      IP1dB = OP1dB_sortie - Gain_total  (valeurs min\/max correspondantes)\r\n    Retour: gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max\r\n            (chacun un tableau (A,), une valeur par cha\u00EEne)\r\n    \"\"\"\r\n    chains_min = table[\'stages_min\'][idx]   # (A, N) de CHAIN_DTYPE\r\n    chains_max = table[\'stages_max\'][idx]\r\n\r\n    nf_max_dB, p1db_max, gain_max_dB = compute_metrics_batch(\r\n        chains_max[\'gain_lin\'], chains_max[\'nf_lin\'], chains_max[\'p1db_lin\'], chains_max[\'gain_dB\'])\r\n    nf_min_dB, p1db_min, gain_min_dB = compute_metrics_batch(\r\n        chains_min[\'gain_lin\'], chains_min[\'nf_lin\'], chains_min[\'p1db_lin\'], chains_min[\'gain_dB\'])\r\n\r\n    # IP1dB (entr\u00E9e) : OP1dB_sortie - gain_total (valeurs coh\u00E9rentes min\/max)\r\n    ip1_min = p1db_min - gain_min_dB\r\n    ip1_max = p1db_max - gain_max_dB\r\n\r\n    return gain_min_dB, gain_max_dB, nf_min_dB, nf_max_dB, p1db_min, p1db_max, ip1_min, ip1_max\r\n\r\n# -------------------------\r\n# Scoring\r\n# -------------------------\r\ndef score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target):\r\n    \"\"\"\r\n    Score = somme des erreurs quadratiques pond\u00E9r\u00E9es par les cibles :\r\n      - erreur sur gain min et max par rapport \u00E0 target_gain\r\n      - p\u00E9nalit\u00E9 si NF_max (cas pessimiste) d\u00E9passe nf_max_target\r\n      - p\u00E9nalit\u00E9 si OP1dB_min (cas pessimiste) est < p1db_min_target\r\n    NOTE : les IP1dB ne sont pas utilis\u00E9s dans le score actuel.\r\n    Vectoris\u00E9 : chaque m\u00E9trique est un tableau (A,) (une valeur par architecture),\r\n    le retour est le tableau (A,) des scores.\r\n    \"\"\"\r\n    gain_min, gain_max, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = metrics\r\n    err_gain_min = (gain_min - target_gain) ** 2\r\n    err_gain_max = (gain_max - target_gain) ** 2\r\n    err_nf = np.maximum(0.0, nf_max - nf_max_target) ** 2\r\n    err_p1db = np.maximum(0.0, p1db_min_target - p1db_min) ** 2\r\n    return err_gain_min + err_gain_max + err_nf + err_p1db\r\n\r\n# -------------------------\r\n# Recherche par sous-ensemble de LNAs (parall\u00E9lisable)\r\n# -------------------------\r\ndef score_subset(lna_subset, table, targets, nf_prune_dB=None):\r\n    \"\"\"\r\n    G\u00E9n\u00E8re et score toutes les architectures d\'un sous-ensemble de LNAs mobiles.\r\n    Fonction de niveau module (picklable) : chaque sous-ensemble est ind\u00E9pendant et la table\r\n    n\'est que lue, les sous-ensembles peuvent donc \u00EAtre r\u00E9partis entre processus.\r\n      - targets : (target_gain, nf_max_target, p1db_min_target)\r\n    Retourne (chains, metrics, scores) :\r\n      - chains  : liste (A,) des cha\u00EEnes (listes de noms d\'\u00E9tages)\r\n      - metrics : tableau (8, A), dans l\'ordre de compute_metrics_gain_min_max\r\n      - scores  : tableau (A,)\r\n    \"\"\"\r\n    target_gain, nf_max_target, p1db_min_target = targets\r\n    idx = generate_all_chains(table, lna_subset, nf_prune_dB)\r\n    if len(idx) == 0:\r\n        return [], np.empty((8, 0)), np.empty(0)\r\n    metrics = np.stack(compute_metrics_gain_min_max(idx, table))\r\n    scores = score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target)\r\n    names = table[\'name\']\r\n    chains = [[names[i] for i in row] for row in idx.tolist()]\r\n    return chains, metrics, scores\r\n\r\n# -------------------------\r\n# Pr\u00E9traitement de la configuration\r\n# -------------------------\r\ndef prepare_config(config):\r\n    \"\"\"\r\n    Pr\u00E9traitement du YAML charg\u00E9, ind\u00E9pendant des architectures test\u00E9es :\r\n    classification des composants, conversions en lin\u00E9aire, tables des att\u00E9nuateurs,\r\n    blocs fixes aplatis et table des \u00E9tages (build_stage_table).\r\n    Retourne {\'config\': config, \'table\': table} (picklable, voir load_prepared_config).\r\n    \"\"\"\r\n    components = config[\'components\']\r\n\r\n    # s\u00E9paration composants en listes : fixed (blocs immuables), lnas (mobiles), attenuators\r\n    fixed = []\r\n    lnas = []\r\n    attenuators = []\r\n\r\n    for comp in components:\r\n        comp = comp.copy()\r\n\r\n        # p1db peut \u00EAtre dans p1db_dBm ou op1db_dBm selon ton YAML -> unifier\r\n        # absent -> p1db_lin = +inf (non contraignant, masqu\u00E9 dans le calcul d\'OP1dB)\r\n        p1db_val = comp.get(\'p1db_dBm\', comp.get(\'op1db_dBm\', None))\r\n        comp[\'p1db_lin\'] = db_to_lin(p1db_val) if p1db_val is not None else math.inf\r\n\r\n        # traitement des att\u00E9nuateurs (options ou valeur fixe)\r\n        if comp[\'type\'] in [\'attenuator\', \'atten\']:\r\n            gain_ref = comp[\'gain_dB_options\'][0] if \'gain_dB_options\' in comp else comp[\'gain_dB\']\r\n            comp[\'gain_lin\'] = db_to_lin(gain_ref)\r\n            comp[\'nf_lin\'] = db_to_lin(abs(gain_ref))\r\n        else:\r\n            # si filtre\/switch : convertit insertion_loss_dB -> gain_dB n\u00E9gatif et nf\r\n            if comp.get(\'type\') in [\'filter\', \'switch\'] and \'insertion_loss_dB\' in comp:\r\n                loss = comp[\'insertion_loss_dB\']\r\n                comp[\'gain_dB\'] = -abs(loss)\r\n                comp[\'nf_dB\'] = loss\r\n            comp[\'gain_lin\'] = db_to_lin(comp.get(\'gain_dB\', 0.0))\r\n            comp[\'nf_lin\'] = db_to_lin(comp.get(\'nf_dB\', 30.0))\r\n\r\n        # classification\r\n        if comp[\'type\'] == \'lna\' and not comp.get(\'fixed\', False):\r\n            lnas.append(comp)\r\n        elif comp[\'type\'] in [\'attenuator\', \'atten\']:\r\n            if comp.get(\'fixed\', False):\r\n                fixed.append(comp)\r\n            else:\r\n                attenuators.append(comp)\r\n        else:\r\n            fixed.append(comp)\r\n\r\n    # table des r\u00E9glages de chaque att\u00E9nuateur mobile, convertie une seule fois en lin\u00E9aire\r\n    # (index\u00E9e par num\u00E9ro d\'option), et variantes min\/max : invariantes d\'une architecture\r\n    # \u00E0 l\'autre, donc calcul\u00E9es une seule fois (gain_lin, nf_lin, p1db_lin)\r\n    for att in attenuators:\r\n        options = att[\'gain_dB_options\'] if \'gain_dB_options\' in att else [att[\'gain_dB\']]\r\n        options_dB = np.asarray(options, dtype=np.float64)\r\n        gains_lin = db_to_lin_array(options_dB)            # une conversion pour toutes les options\r\n        nfs_lin = db_to_lin_array(np.abs(options_dB))\r\n        att[\'_options\'] = [\r\n            {\'gain_dB\': g, \'gain_lin\': float(g_lin), \'nf_lin\': float(nf_lin), \'p1db_lin\': att[\'p1db_lin\']}\r\n            for g, g_lin, nf_lin in zip(options, gains_lin, nfs_lin)\r\n        ]\r\n        opt_min = min(att[\'_options\'], key=lambda opt: opt[\'gain_dB\'])\r\n        opt_max = max(att[\'_options\'], key=lambda opt: opt[\'gain_dB\'])\r\n        att[\'_min_gain_dB\'] = opt_min[\'gain_dB\']\r\n        att[\'_max_gain_dB\'] = opt_max[\'gain_dB\']\r\n        att[\'_min_triplet\'] = (opt_min[\'gain_lin\'], opt_min[\'nf_lin\'], opt_min[\'p1db_lin\'])\r\n        att[\'_max_triplet\'] = (opt_max[\'gain_lin\'], opt_max[\'nf_lin\'], opt_max[\'p1db_lin\'])\r\n\r\n    # grouper les composants fixes en blocs respectant locked_with_next\r\n    blocks = group_locked_stages(fixed)\r\n    block_stages = [flatten_block_stages(b) for b in blocks]\r\n\r\n    # table globale des \u00E9tages candidats (blocs, LNAs, r\u00E9glages d\'att\u00E9nuateurs)\r\n    table = build_stage_table(block_stages, lnas, attenuators)\r\n\r\n    return {\'config\': config, \'table\': table}\r\n\r\n# -------------------------\r\n# Main\r\n# -------------------------\r\n# bloc de results.txt pour une architecture : cha\u00EEne, puis les 8 m\u00E9triques dans l\'ordre de\r\n# compute_metrics_gain_min_max (gain, NF, OP1dB, IP1dB en paires min\/max), puis le score\r\nRESULT_FMT = (\r\n    \"Cha\u00EEne: %s\\n\"\r\n    \"  -> Gain min = %.2f dB | Gain max = %.2f dB\\n\"\r\n    \"     NF min   = %.2f dB    | NF max   = %.2f dB\\n\"\r\n    \"     OP1dB sort. min = %.2f dBm | OP1dB sort. max = %.2f dBm\\n\"\r\n    \"     IP1dB entr. min = %.2f dBm | IP1dB entr. max = %.2f dBm\\n\"\r\n    \"     Score    = %.4f\\n\\n\"\r\n)\r\n\r\ndef main():\r\n    # charge le YAML (attendu: \'components.yaml\' \u00E0 c\u00F4t\u00E9 du script) et son pr\u00E9traitement\r\n    prepared = load_prepared_config(\'components.yaml\')\r\n    config = prepared[\'config\']\r\n    table = prepared[\'table\']\r\n    target_gain = config[\'gain_total_target_dB\']\r\n    nf_max_target = config[\'nf_max_dB\']\r\n    p1db_min_target = config[\'p1db_min_dBm\']\r\n\r\n    # \u00E9lagage optionnel (nf_prune_margin_dB dans le YAML) : abandonne les placements de LNAs\r\n    # dont le NF d\u00E9passe d\u00E9j\u00E0 nf_max_dB + marge\r\n    nf_prune_dB = None\r\n    prune_margin = config.get(\'nf_prune_margin_dB\')\r\n    if prune_margin is not None:\r\n        if nf_pruning_is_safe(table):\r\n            nf_prune_dB = nf_max_target + prune_margin\r\n        else:\r\n            print(\"\u26A0\uFE0F nf_prune_margin_dB ignor\u00E9 : un att\u00E9nuateur a un gain positif ou un NF < 0 dB.\")\r\n\r\n    # g\u00E9n\u00E9rer toutes les architectures en ins\u00E9rant sous-ensembles de LNAs mobiles,\r\n    # puis scorer chaque lot (cha\u00EEnes de m\u00EAme longueur) en une passe vectoris\u00E9e.\r\n    # n_jobs (YAML, optionnel) : nombre de processus, -1 = tous les c\u0153urs, 1 (d\u00E9faut) = s\u00E9quentiel\r\n    targets = (target_gain, nf_max_target, p1db_min_target)\r\n    # sous-ensembles de LNAs \u00E9quivalents (ex : deux copies identiques d\'un m\u00EAme LNA) :\r\n    # m\u00EAmes cha\u00EEnes g\u00E9n\u00E9r\u00E9es, un seul est gard\u00E9 (cl\u00E9 canonique tri\u00E9e, ordre de premi\u00E8re apparition)\r\n    canon = table[\'canon\']\r\n    unique_subsets = {}\r\n    for lna_subset in non_empty_subsets(table[\'lna_ids\']):\r\n        unique_subsets.setdefault(tuple(sorted(canon[i] for i in lna_subset)), lna_subset)\r\n    subsets = list(unique_subsets.values())\r\n    n_jobs = config.get(\'n_jobs\', 1)\r\n    if n_jobs == -1:\r\n        n_jobs = os.cpu_count() or 1\r\n\r\n    if n_jobs > 1:\r\n        with ProcessPoolExecutor(max_workers=n_jobs) as executor:\r\n            # map conserve l\'ordre des sous-ensembles -> r\u00E9sultats identiques au mode s\u00E9quentiel\r\n            per_subset = list(executor.map(score_subset, subsets, itertools.repeat(table),\r\n                                           itertools.repeat(targets), itertools.repeat(nf_prune_dB)))\r\n    else:\r\n        per_subset = [score_subset(lna_subset, table, targets, nf_prune_dB) for lna_subset in subsets]\r\n\r\n    # concat\u00E9nation des lots : une entr\u00E9e par architecture, dans l\'ordre de g\u00E9n\u00E9ration\r\n    chains = [chain for subset_chains, _, _ in per_subset for chain in subset_chains]\r\n    if not chains:\r\n        print(\"\u274C Aucune architecture g\u00E9n\u00E9r\u00E9e.\")\r\n        return\r\n    metrics = np.concatenate([subset_metrics for _, subset_metrics, _ in per_subset], axis=1)\r\n    scores = np.concatenate([subset_scores for _, _, subset_scores in per_subset])\r\n\r\n    # tri (stable : \u00E0 score \u00E9gal, l\'ordre de g\u00E9n\u00E9ration est conserv\u00E9) et sauvegarde\r\n    order = np.argsort(scores, kind=\'stable\')\r\n    script_dir = os.path.dirname(os.path.abspath(__file__))\r\n    results_path = os.path.join(script_dir, \"results.txt\")\r\n    # rapport construit en une seule cha\u00EEne (un seul write, gros tampon) plut\u00F4t que\r\n    # plusieurs f.write par architecture\r\n    rows = metrics.T[order].tolist()\r\n    scores_sorted = scores[order].tolist()\r\n    report = \"\".join([RESULT_FMT % (chains[k], *row, score)\r\n                      for k, row, score in zip(order.tolist(), rows, scores_sorted)])\r\n    with open(results_path, \"w\", encoding=\"utf-8\", buffering=1 << 20) as f:\r\n        f.write(\"=== \uD83E\uDDEA Toutes les architectures test\u00E9es : {} ===\\n\\n\".format(len(chains)))\r\n        f.write(report)\r\n\r\n    # afficher meilleure architecture\r\n    best = order[0]\r\n    gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = metrics[:, best]\r\n\r\n    print(\"\\n=== \u2705 Meilleure architecture trouv\u00E9e ===\")\r\n    print(f\"Cha\u00EEne: {chains[best]}\\n\")\r\n    print(f\"Gain min (att\u00E9nuateurs \u00E0 min) : {gain_min_dB:.2f} dB\")\r\n    print(f\"Gain max (att\u00E9nuateurs \u00E0 max) : {gain_max_dB:.2f} dB\\n\")\r\n    print(f\"NF min (gain min)              : {nf_min:.2f} dB\")\r\n    print(f\"NF max (gain max)              : {nf_max:.2f} dB\\n\")\r\n    print(f\"OP1dB sortie (min)             : {p1db_min:.2f} dBm\")\r\n    print(f\"OP1dB sortie (max)             : {p1db_max:.2f} dBm\\n\")\r\n    print(f\"IP1dB entr\u00E9e (min)             : {ip1_min:.2f} dBm\")\r\n    print(f\"IP1dB entr\u00E9e (max)             : {ip1_max:.2f} dBm\\n\")\r\n    print(f\"Score                          : {scores[best]:.4f}\\n\")\r\n\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
+  "code_yaml": "# Fichier d\'entr\u00E9e pour le script : param\u00E8tres cibles et liste de composants\r\n# Units:\r\n#  - gains \/ pertes : dB\r\n#  - NF : dB\r\n#  - P1dB \/ OP1dB : dBm\r\n\r\n# Objectifs \/ contraintes globales que le script tente d\'atteindre\r\ngain_total_target_dB: 30     # cible de gain total (dB) recherch\u00E9e par le scoring\r\nnf_max_dB: 10               # NF max tol\u00E9r\u00E9 (dB) pour l\'architecture \"pessimiste\"\r\np1db_min_dBm: 0             # OP1dB minimal demand\u00E9 (dBm) \u2014 phase pessimiste\r\nlna_count: 4                # info utile (nombre total LNAs envisag\u00E9s) \u2014 non obligatoire\r\n# nf_prune_margin_dB: 10     # (optionnel) abandonne les placements de LNAs dont le NF d\u00E9passe\r\n                            # d\u00E9j\u00E0 nf_max_dB + marge avant insertion des att\u00E9nuateurs\r\n# n_jobs: -1                 # (optionnel) nombre de processus pour la recherche (-1 = tous les c\u0153urs)\r\n\r\ncomponents:\r\n  # Composants \"fixes\" (seront group\u00E9s en blocs si locked_with_next=True)\r\n  - name: \"preselector\"\r\n    type: \"filter\"\r\n    gain_dB: -5              # ici on utilise gain_dB n\u00E9gatif ; si tu pr\u00E9f\u00E8res insertion_loss_dB: 5\r\n    nf_dB: 5                 # NF pour les passifs (dans notre convention NF = perte d\'insertion)\r\n    p1db_dBm: 25             # OP1dB du composant en dBm\r\n    fixed: true              # composant fixe (non d\u00E9plac\u00E9 par l\'algorithme)\r\n\r\n  - name: \"ImageFilter\"\r\n    type: \"filter\"\r\n    gain_dB: -8.49\r\n    nf_dB: 8.49\r\n    p1db_dBm: 17.35\r\n    fixed: true\r\n\r\n  - name: \"ATT-3dB fixe\"\r\n    type: attenuator\r\n    gain_dB: -3.0\r\n    nf_dB: 3.0\r\n    p1db_dBm: 20\r\n    fixed: true\r\n    locked_with_next: true   # verrouille ce composant avec le suivant dans le m\u00EAme bloc\r\n                             # (utile pour regrouper ATT + Mixer + OL_Filter en un bloc)\r\n\r\n  - name: \"Mixer\"\r\n    type: \"mixer\"\r\n    gain_dB: -6.83\r\n    nf_dB: 7.5\r\n    p1db_dBm: 14\r\n    fixed: true\r\n    locked_with_next: true\r\n\r\n  - name: \"OL_Filter\"\r\n    type: \"filter\"\r\n    gain_dB: -0.63\r\n    nf_dB: 0.63\r\n    p1db_dBm: 20\r\n    fixed: true\r\n\r\n  - name: \"Switch\"\r\n    type: attenuator\r\n    gain_dB: -2.0\r\n    nf_dB: 2.0\r\n    p1db_dBm: 25\r\n    fixed: true\r\n    locked_with_next: true   # verrouille Switch avec le passe_bande suivant\r\n\r\n  - name: \"passe_bande\"\r\n    type: \"filter\"\r\n    gain_dB: -0.7\r\n    nf_dB: 0.7\r\n    p1db_dBm: 25\r\n    fixed: true\r\n\r\n  # LNAs mobiles \u2014 l\'algorithme testera diff\u00E9rentes positions pour ces \u00E9l\u00E9ments\r\n  - name: \"LNA1\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3.5\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n\r\n  - name: \"LNA2\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n\r\n  - name: \"LNA3\"\r\n    type: \"lna\"\r\n    gain_dB: 27\r\n    nf_dB: 1\r\n    p1db_dBm: 12.4\r\n    fixed: false\r\n\r\n  # Att\u00E9nuateur variable \u2014 on fournit les options disponibles (le script testera les 2 positions)\r\n  - name: \"ATT\"\r\n    type: \"attenuator\"\r\n    gain_dB_options: [-3, -30]   # options d\'att\u00E9nuation que l\'on peut s\u00E9lectionner\r\n    nf_dB: 30                    # NF renseign\u00E9 (ici j\'ai mis 30 dB pour forcer la p\u00E9nalit\u00E9 si utilis\u00E9)\r\n    p1db_dBm: 22\r\n    fixed: false                 # att\u00E9nuateur mobile: script pourra l\'ins\u00E9rer entre blocs\r\n\r\n  - name: \"LNA4\"\r\n    type: \"lna\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3\r\n    p1db_dBm: 23.94\r\n    fixed: false\r\n",
   "code_path": "files/code/Architecture_finder/Architecture_finder.py",
   "yaml_path": "files/code/Architecture_finder/components.yaml"
 },
@@ -28,8 +28,8 @@ window.DOWNLOADS = [
   "version": "code",
   "size_bytes": 15612,
   "description": "Calcul des produits de mélange d'un mixer.",
-  "code_py":"# -*- coding: utf-8 -*-\r\n\"\"\"\r\nScript d\'analyse rapide d\'une cha\u00EEne RF d\u00E9crite en YAML.\r\n- calcule NF total (Loi de Friis)\r\n- calcule OP1dB de sortie (combinaison en lin\u00E9aire)\r\n- affiche un r\u00E9sum\u00E9 color\u00E9 en console\r\n\r\nConventions attendues pour le YAML (exemple) :\r\narchitecture:\r\n  - name: \"LNA1\"\r\n    type: \"ampli\"\r\n    gain_dB: 15                 # gain nominal (dB)\r\n    gain_dB_max: 17             # (optionnel) gain max si different\r\n    nf_dB: 2.0                  # (optionnel) figure de bruit (dB)\r\n    op1db_dBm: 5                # (optionnel) OP1dB en dBm\r\n  - name: \"Filt1\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 2.5      # pour les filtres on fournit la perte (positive)\r\n    # ...\r\nAttention :\r\n- Les unit\u00E9s : gains et pertes en dB, NF en dB, OP1dB en dBm.\r\n- Le code convertit en lin\u00E9aire pour les calculs (rapports lin\u00E9aires, puissances en mW).\r\n- Valeurs manquantes ont des comportements par d\u00E9faut (voir build_chain).\r\n\"\"\"\r\n\r\nimport yaml\r\nimport math\r\nimport os\r\nfrom colorama import init, Fore, Back, Style\r\n\r\n# Active colorama (r\u00E9initialisation automatique des styles apr\u00E8s chaque print)\r\ninit(autoreset=True)\r\n\r\n# Couleurs pour affichage par type d\'\u00E9tage (simple mapping visuel)\r\n# - \'ampli\'  : rouge\r\n# - \'filter\' : cyan\r\n# - \'atten\'  : jaune\r\n# - \'switch\' : vert\r\n# - \'mixer\'  : magenta\r\nTYPE_COLORS = {\r\n    \'ampli\':   Fore.RED + Style.BRIGHT,\r\n    \'filter\':  Fore.CYAN + Style.BRIGHT,\r\n    \'atten\':   Fore.YELLOW + Style.BRIGHT,\r\n    \'switch\':  Fore.GREEN + Style.BRIGHT,\r\n    \'mixer\':   Fore.MAGENTA + Style.BRIGHT,\r\n}\r\n\r\n# ---------- Fonctions utilitaires (conversion dB <-> lin\u00E9aire) ----------\r\n\r\ndef db_to_lin(db):\r\n    \"\"\"\r\n    Convertit une valeur en dB vers une valeur lin\u00E9aire (facteur ou mW selon le contexte).\r\n    - entr\u00E9e : valeur en dB (ou dBm si contexte puissance)\r\n    - sortie : 10^(db\/10)\r\n\r\n    Exemple :\r\n      10 dB  -> 10\r\n      -3 dB  -> 0.5\r\n      0 dBm  -> 1 mW  (utilis\u00E9 pour convertir dBm -> mW)\r\n    Attention : appeler cette fonction sur des valeurs tr\u00E8s grandes (ex : 1000) produit des floats tr\u00E8s grands.\r\n    \"\"\"\r\n    return 10 ** (db \/ 10)\r\n\r\n\r\ndef lin_to_db(lin):\r\n    \"\"\"\r\n    Convertit une valeur lin\u00E9aire vers dB.\r\n    - si lin est un ratio (ex : gain lin\u00E9aire) la sortie est en dB.\r\n    - si lin est en mW, la sortie est en dBm (0 dBm => 1 mW).\r\n    Formule : 10 * log10(lin)\r\n    \"\"\"\r\n    return 10 * math.log10(lin)\r\n\r\n# ---------- Calcul de la figure de bruit totale (Friis) ----------\r\n\r\ndef calc_nf(chain):\r\n    \"\"\"\r\n    Calcule la NF totale (en dB) d\'une cha\u00EEne donn\u00E9e.\r\n    Entr\u00E9e : chain = liste d\'\u00E9tages, chaque \u00E9l\u00E9ment doit contenir :\r\n      - \'nf_lin\'   : NF en lin\u00E9aire (pas en dB)\r\n      - \'gain_lin\' : gain (lin\u00E9aire, ratio de puissance)\r\n    Algorithme : formule de Friis :\r\n      NF_tot_lin = NF1 + (NF2 - 1)\/G1 + (NF3 - 1)\/(G1*G2) + ...\r\n    Retour : NF totale en dB (utilise lin_to_db).\r\n    Remarque : la 1\u00E8re NF doit \u00EAtre en lin\u00E9aire et non nulle.\r\n    \"\"\"\r\n    # NF lin\u00E9aire du premier \u00E9tage\r\n    nf_tot = chain[0][\'nf_lin\']\r\n    # produit cumulatif des gains (lin\u00E9aire) des \u00E9tages d\u00E9j\u00E0 rencontr\u00E9s\r\n    g_prod = chain[0][\'gain_lin\']\r\n    # boucle sur les \u00E9tages suivants\r\n    for stage in chain[1:]:\r\n        nf_tot += (stage[\'nf_lin\'] - 1) \/ g_prod\r\n        g_prod *= stage[\'gain_lin\']\r\n    return lin_to_db(nf_tot)\r\n\r\n# ---------- Calcul de l\'OP1dB total en sortie ----------\r\n\r\ndef calc_p1db(chain):\r\n    \"\"\"\r\n    Calcule l\'OP1dB de sortie d\'une cha\u00EEne (en dBm).\r\n    M\u00E9thode :\r\n      - p1db_lin : OP1dB de chaque \u00E9tage en mW (lin\u00E9aire)\r\n      - gain_after[i] : produit des gains lin\u00E9aires des \u00E9tages plac\u00E9s APR\u00C8S l\'\u00E9tage i\r\n      - contribution d\'un \u00E9tage i au P1dB total (en mW) est P1dB_i * gain_after[i]\r\n      - on somme les inverses : 1 \/ P_total = sum_i 1\/(P1dB_i * gain_after[i])\r\n      - P_total (mW) = 1 \/ somme_inverse\r\n      - retour en dBm via lin_to_db (car lin_to_db( mW ) -> dBm)\r\n    Hypoth\u00E8ses \/ limites :\r\n      - si un p1db_lin est nul ou manquant, cela l\u00E8vera une ZeroDivisionError.\r\n      - s\'assurer que gains et p1db sont en lin\u00E9aire avant l\'appel.\r\n    \"\"\"\r\n    N = len(chain)\r\n    gain_after = [1.0] * N  # gain total plac\u00E9 apr\u00E8s chaque \u00E9tage (lin\u00E9aire)\r\n    prod = 1.0\r\n    # construire gain_after en sens inverse : gain_after[i] = produit(gain_k pour k>i)\r\n    for idx in range(N-1, -1, -1):\r\n        gain_after[idx] = prod\r\n        prod *= chain[idx][\'gain_lin\']\r\n\r\n    # somme des inverses pond\u00E9r\u00E9es\r\n    inv_sum = sum(\r\n        1 \/ (stage[\'p1db_lin\'] * gain_after[i])\r\n        for i, stage in enumerate(chain)\r\n    )\r\n    # r\u00E9sultat en mW -> lin_to_db retourne dBm\r\n    return lin_to_db(1 \/ inv_sum)\r\n\r\n# ---------- Construction de la cha\u00EEne RF depuis le YAML ----------\r\n\r\ndef build_chain(arch, use_gain_max=False):\r\n    \"\"\"\r\n    Transforme la description YAML (valeurs en dB\/dBm) en une liste d\'\u00E9tages avec valeurs lin\u00E9aires.\r\n    Param\u00E8tres :\r\n      - arch : liste d\'\u00E9l\u00E9ments YAML d\u00E9crivant chaque composant\r\n      - use_gain_max : si True, pr\u00E9f\u00E8re \'gain_dB_max\' si pr\u00E9sent, sinon \'gain_dB\'\r\n\r\n    Comportements particuliers :\r\n      - Pour les filtres et switches, on consid\u00E8re que la NF (en dB) = perte d\'insertion (insertion_loss_dB).\r\n        => gain_dB = - insertion_loss_dB  (car perte)\r\n      - Si nf_dB absent pour un amplificateur, on prend nf_dB = |gain_dB| (approximation conservative)\r\n      - Si op1db_dBm absent, valeur par d\u00E9faut distante (ici 1000 dBm) -> attention overflow possible si converti en mW\r\n        (la valeur 1000 sert d\'indicateur \"virtuel\" d\'absence de contrainte ; c\'est une pratique risqu\u00E9e en calculs r\u00E9els)\r\n    Retour :\r\n      liste de dicts : { \'name\', \'type\', \'gain_lin\', \'nf_lin\', \'p1db_lin\' }\r\n      - gain_lin : facteur (unitless)\r\n      - nf_lin   : ratio lin\u00E9aire (>1)\r\n      - p1db_lin : puissance en mW (lin\u00E9aire)\r\n    \"\"\"\r\n    chain = []\r\n    for c in arch:\r\n        # si composant passif de filtrage => perte fournie\r\n        if c[\'type\'] in [\'filter\', \'switch\']:\r\n            loss = c[\'insertion_loss_dB\']  # valeur positive (dB)\r\n            gain_dB = -loss                 # gain = -perte\r\n            nf_dB = loss                    # NF d\'un passif = perte d\'insertion\r\n        else:\r\n            # choisir gain nominal ou gain max selon le mode\r\n            gain_dB = c.get(\'gain_dB_max\', c[\'gain_dB\']) if use_gain_max else c[\'gain_dB\']\r\n            # NF fourni ou estimation conservatrice (abs(gain_dB))\r\n            nf_dB = c.get(\'nf_dB\', abs(gain_dB))\r\n\r\n        # OP1dB : si pr\u00E9sent, valeur en dBm ; sinon 1000 (valeur par d\u00E9faut)\r\n        # NOTE : 1000 dBm -> db_to_lin(1000) fera 10**(100) -> tr\u00E8s grand float\r\n        p1dB = c.get(\'op1db_dBm\', 1000)\r\n\r\n        chain.append({\r\n            \'name\': c[\'name\'],\r\n            \'type\': c[\'type\'],\r\n            \'gain_lin\': db_to_lin(gain_dB),\r\n            \'nf_lin\': db_to_lin(nf_dB),\r\n            \'p1db_lin\': db_to_lin(p1dB)\r\n        })\r\n    return chain\r\n\r\n# ---------- Fonctions d\'affichage console (color\u00E9es) ----------\r\n\r\ndef print_header(title):\r\n    \"\"\"\r\n    Print d\'un en-t\u00EAte simple (fond noir + texte blanc).\r\n    \"\"\"\r\n    print(Back.BLACK + Fore.WHITE + f\"  {title}  \" + Style.RESET_ALL)\r\n\r\n\r\ndef print_section(title, value, unit, color=Fore.WHITE):\r\n    \"\"\"\r\n    Affiche une ligne de synth\u00E8se format\u00E9e.\r\n    Exemple :\r\n      \u25A0\u25A0 Gain total   : 10.00 dB\r\n    - title : texte court\r\n    - value : valeur num\u00E9rique\r\n    - unit  : unit\u00E9 en texte (ex: \"dB\", \"dBm\")\r\n    - color : couleur (optionnel)\r\n    \"\"\"\r\n    bar = \'\u25A0\' * 3\r\n    print(f\"{color}{bar} {title:<15}: {value:>6.2f} {unit}{Style.RESET_ALL}\")\r\n\r\n\r\ndef print_spacers():\r\n    \"\"\"\r\n    Ligne de s\u00E9paration visuelle.\r\n    \"\"\"\r\n    print(\"_\" * 60 + \"\\n\")\r\n\r\n# ---------- Main \/ point d\'entr\u00E9e ----------\r\n\r\ndef main():\r\n    \"\"\"\r\n    Flux principal :\r\n    - charge YAML param.yaml situ\u00E9 dans le m\u00EAme dossier que ce script\r\n    - construit deux cha\u00EEnes (mode min \/ mode max si gain_dB_max fourni)\r\n    - calcule : NF total (min\/max), OP1dB sortie (min\/max), gains totaux (min\/max), IP1dB entr\u00E9e\r\n    - affiche le tout\r\n    \"\"\"\r\n    # chemin vers param.yaml dans le m\u00EAme dossier que ce script\r\n    base = os.path.dirname(os.path.abspath(__file__))\r\n    path = os.path.join(base, \"param.yaml\")\r\n    yaml_filename = os.path.basename(path)\r\n    print(f\"Fichier YAML ex\u00E9cut\u00E9 : {Fore.CYAN}{yaml_filename}{Style.RESET_ALL}\")\r\n\r\n    # chargement YAML\r\n    with open(path, \'r\') as f:\r\n        data = yaml.safe_load(f)\r\n    arch = data[\'architecture\']\r\n\r\n    # construire cha\u00EEnes min \/ max\r\n    ch_min = build_chain(arch, use_gain_max=False)\r\n    ch_max = build_chain(arch, use_gain_max=True)\r\n\r\n    # calculs principaux\r\n    nf_min, nf_max = calc_nf(ch_min), calc_nf(ch_max)\r\n    p1_min, p1_max = calc_p1db(ch_min), calc_p1db(ch_max)\r\n\r\n    # gains totaux (dB) : produit des gains lin\u00E9aires pass\u00E9 en dB\r\n    g_min = lin_to_db(math.prod(s[\'gain_lin\'] for s in ch_min))\r\n    g_max = lin_to_db(math.prod(s[\'gain_lin\'] for s in ch_max))\r\n\r\n    # IP1dB entr\u00E9e = OP1dB_sortie - Gain_total\r\n    ip1_min, ip1_max = p1_min - g_min, p1_max - g_max\r\n\r\n    # affichage cha\u00EEne (avec couleurs par type)\r\n    line = \" \u2192 \".join(f\"{TYPE_COLORS.get(s[\'type\'], \'\')}{s[\'name\']}{Style.RESET_ALL}\" for s in ch_min)\r\n\r\n    print_spacers()\r\n    print(f\"{Back.BLACK+Fore.WHITE}{\'\u25A0\'*3} {\'Cha\u00EEne RF\':<8}:{Style.RESET_ALL} {line}\\n\")\r\n    print_spacers()\r\n\r\n    # r\u00E9sultats\r\n    print(f\"{Back.BLACK+Fore.WHITE} R\u00E9sultats (min & max):{Style.RESET_ALL}\\n\")\r\n    # Gains\r\n    print_section(\"Gain total (min)   \", g_min, \"dB\")\r\n    print_section(\"Gain total (max)  \", g_max, \"dB\")\r\n    print()\r\n    # NF\r\n    print_section(\"NF total (min)     \", nf_min, \"dB\")\r\n    print_section(\"NF total (max)     \", nf_max, \"dB\")\r\n    print()\r\n    # OP1dB sortie\r\n    print_section(\"OP1dB sortie (min) \", p1_min, \"dBm\")\r\n    print_section(\"OP1dB sortie (max) \", p1_max, \"dBm\")\r\n    print()\r\n    # IP1dB entr\u00E9e\r\n    print_section(\"IP1dB entr\u00E9e (min) \", ip1_min, \"dBm\")\r\n    print_section(\"IP1dB entr\u00E9e (max) \", ip1_max, \"dBm\")\r\n    print_spacers()\r\n\r\n# Ex\u00E9cution quand lanc\u00E9 directement\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
-  "code_yaml":"# Fichier YAML d\'architecture pour le script d\'analyse (param.yaml)\r\n# Format attendu : racine \"architecture\" = liste d\'\u00E9tages dans l\'ordre du parcours du signal.\r\n# Chaque entr\u00E9e repr\u00E9sente un composant\/\u00E9tage. Les champs utilis\u00E9s par le script :\r\n#   - name:           nom (cha\u00EEne)\r\n#   - type:           \'ampli\' | \'filter\' | \'atten\' | \'switch\' | \'mixer\'\r\n#   - gain_dB:        gain en dB (pour les amplis) OR gain n\u00E9gatif pour att\u00E9nuateur\r\n#   - gain_dB_max:    (optionnel) gain max si disponible (permet mode \"max\")\r\n#   - insertion_loss_dB: (pour filter\/switch) perte positive en dB\r\n#   - nf_dB:          figure de bruit en dB (pour amplis\/mixers) \u2014 si absent, on estime\r\n#   - op1db_dBm:      OP1dB en dBm (output 1 dB compression point)\r\n#\r\n# IMPORTANTS :\r\n# - Toutes les puissances\/gains\/pertes sont en dB ou dBm (unit\u00E9s strictes).\r\n# - Pour les filtres\/switch, insertion_loss_dB doit \u00EAtre positive (ex : 1.2 dB).\r\n# - Pour les att\u00E9nuateurs : gain_dB doit \u00EAtre n\u00E9gatif (ex : -30).\r\n# - Si une cl\u00E9 manquante existe, le script applique des valeurs par d\u00E9faut (v\u00E9rifier build_chain).\r\n# - Eviter d\'utiliser des valeurs extr\u00EAmes (ex : op1db_dBm = 1000), le script en fera un nombre lin\u00E9aire \u00E9norme.\r\n\r\narchitecture:\r\n\r\n  # ---------------------------\r\n  # Filtre passe-haut centr\u00E9 sur FI (exemple)\r\n  # - type: filter => script lit insertion_loss_dB (positif)\r\n  # - NF du passif = insertion_loss_dB (convention physique)\r\n  # - op1db_dBm renseign\u00E9 pour tra\u00E7abilit\u00E9 (valeur d\'usage)\r\n  # ---------------------------\r\n  - name: \"HPF_4GHz\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.61      # perte d\'insertion (dB). Doit \u00EAtre positive.\r\n    op1db_dBm: 20               # OP1dB du bloc (dBm) \u2014 utile pour calculs de cha\u00EEne\r\n\r\n  # ---------------------------\r\n  # Switch RF ; trait\u00E9 comme un passif (insertion_loss_dB)\r\n  # - type: switch => insertion_loss_dB positive\r\n  # - op1db_dBm : tenue en puissance \/ saturation (dBm)\r\n  # ---------------------------\r\n  - name: \"Switch\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 0.85\r\n    op1db_dBm: 25\r\n\r\n  # Pr\u00E9-filtre passe-haut (pr\u00E9-s\u00E9lection)\r\n  - name: \"Pre-HPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1.179\r\n    op1db_dBm: 20\r\n\r\n  # Pr\u00E9-filtre passe-bas (pr\u00E9-s\u00E9lection)\r\n  - name: \"Pre-LPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.819\r\n    op1db_dBm: 20\r\n\r\n  # autre switch (ex : routage vers banque de filtres)\r\n  - name: \"Switch\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 0.85\r\n    op1db_dBm: 25\r\n\r\n  # ---------------------------\r\n  # Amplificateur faible bruit (LNA1)\r\n  # - type: ampli => fournir gain_dB et nf_dB\r\n  # - op1db_dBm : OP1dB de sortie (dBm)\r\n  # ---------------------------\r\n  - name: \"LNA1\"\r\n    type: \"ampli\"\r\n    gain_dB: 15.3                # gain nominal en dB\r\n    nf_dB: 3.5                   # figure de bruit en dB\r\n    op1db_dBm: 23.94             # OP1dB sortie (dBm)\r\n\r\n  # ---------------------------\r\n  # Att\u00E9nuateur variable simul\u00E9 par entr\u00E9e param\u00E9tr\u00E9e\r\n  # - type: atten => gain_dB n\u00E9gatif\r\n  # - gain_dB_max : utile si l\'att\u00E9nuateur peut \u00EAtre r\u00E9duit (ex : -5 dB en position minimale)\r\n  # ---------------------------\r\n  - name: \"ATT_30dB\"\r\n    type: \"atten\"\r\n    gain_dB: -30                 # position nominale (dB) -> valeur n\u00E9gative\r\n    gain_dB_max: -5              # meilleur cas (moins d\'att\u00E9nuation)\r\n    op1db_dBm: 20\r\n\r\n  # Deuxi\u00E8me LNA (apr\u00E8s att\u00E9nuateur)\r\n  - name: \"LNA2\"\r\n    type: \"ampli\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3.5\r\n    op1db_dBm: 23.94\r\n\r\n  # ---------------------------\r\n  # Filtre image (pr\u00E9-s\u00E9lection) : valeurs typiques de perte fournies\r\n  # - insertion_loss_dB : perte dans la bande passante (dB)\r\n  # - op1db_dBm : tenue en puissance\r\n  # ---------------------------\r\n  - name: \"ImageFilter\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 8.7\r\n    op1db_dBm: 17.35\r\n\r\n  # Att\u00E9nuateur fixe 3 dB devant le mixer\r\n  - name: \"ATT-3dB\"\r\n    type: \"atten\"\r\n    gain_dB: -3\r\n    gain_dB_max: -3\r\n    op1db_dBm: 20\r\n\r\n  # ---------------------------\r\n  # Mixer : conversion loss (gain_dB n\u00E9gatif), NF approximatif\r\n  # - gain_dB : conversion loss (dB)\r\n  # - nf_dB : estimation de la contribution du mixer (dB)\r\n  # - op1db_dBm : OP1dB d\'entr\u00E9e ou de sortie selon la doc (ici consid\u00E9r\u00E9 comme sortie)\r\n  # ---------------------------\r\n  - name: \"Mixer\"\r\n    type: \"mixer\"\r\n    gain_dB: -6.83               # perte de conversion (dB) \u2014 valeur n\u00E9gative attendue\r\n    nf_dB: 7.5                   # figure de bruit indicative pour le mixeur (dB)\r\n    op1db_dBm: 14\r\n\r\n  # Filtre OL (passif)\r\n  - name: \"OL_Filter\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.67\r\n    op1db_dBm: 20\r\n\r\n  # LNA apr\u00E8s FI (gain \u00E9lev\u00E9 pour compenser pertes)\r\n  - name: \"LNA3\"\r\n    type: \"ampli\"\r\n    gain_dB: 22.5\r\n    nf_dB: 2.5\r\n    op1db_dBm: 22\r\n\r\n  # Autre att\u00E9nuateur (positionnement \/ contr\u00F4le)\r\n  - name: \"ATT_30dB\"\r\n    type: \"atten\"\r\n    gain_dB: -30\r\n    gain_dB_max: -12\r\n    op1db_dBm: 20\r\n\r\n  # Equalizer \/ switch (passif)\r\n  - name: \"Equalizer\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 2\r\n    op1db_dBm: 25\r\n\r\n  # LNA final\r\n  - name: \"LNA4\"\r\n    type: \"ampli\"\r\n    gain_dB: 20.5\r\n    nf_dB: 2.5\r\n    op1db_dBm: 31.7\r\n\r\n  # Briques du filtre FI (500 MHz BW) - passe-haut et passe-bas pour former le BPF\r\n  - name: \"500MHz-HPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1\r\n    op1db_dBm: 23\r\n\r\n  - name: \"500MHz-LPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1\r\n    op1db_dBm: 23\r\n\r\n# ---------------------------\r\n# Notes g\u00E9n\u00E9rales et conseils pratiques (ne pas oublier) :\r\n# - V\u00E9rifier que les champs obligatoires existent pour chaque type.\r\n#   * filter\/switch : insertion_loss_dB obligatoire.\r\n#   * ampli\/mixer : gain_dB obligatoire ; nf_dB fortement recommand\u00E9.\r\n#   * atten  : gain_dB n\u00E9gatif obligatoire.\r\n# - Un OP1dB manquant dans le YAML conduit le script \u00E0 utiliser une valeur par d\u00E9faut (voir code).\r\n#   C\'est dangereux : mieux vaut renseigner syst\u00E9matiquement op1db_dBm.\r\n# - Pour les filtres passifs, NF = insertion_loss_dB (en dB) est la convention utilis\u00E9e ici.\r\n# - Eviter d\'utiliser le m\u00EAme \"name\" plusieurs fois si l\'on veut les distinguer (bien que ce soit accept\u00E9).\r\n# - Les valeurs fournies ici sont des exemples\/mesures : adapter selon les datasheets des composants r\u00E9els.\r\n# - Si le script doit mod\u00E9liser des \u00E9l\u00E9ments variables (ex : att\u00E9nuateur r\u00E9glable, filtre accordable),\r\n#   utiliser gain_dB_max\/gain_dB comme fourchette et lancer le script en mode use_gain_max=True pour l\'\u00E9tudier.\r\n#\r\n# Suggestions d\'am\u00E9lioration :\r\n# - ajouter une cl\u00E9 \"comment\" ou \"ref\" pour lier l\'entr\u00E9e YAML \u00E0 la r\u00E9f\u00E9rence du composant (r\u00E9f\u00E9rence fournisseur).\r\n# - ajouter \"freq_range: [f_min_MHz, f_max_MHz]\" pour caract\u00E9riser la bande d\'op\u00E9ration d\'un composant.\r\n# - valider le YAML \u00E0 l\'ouverture et refuser les valeurs absurdes (ex : op1db_dBm > 50 dBm ou insertion_loss < 0).\r\n",
+  "code_py":"# -*- coding: utf-8 -*-\r\n\"\"\"\r\nAnalyse des fr\u00E9quences RF \u2014 script final Juillet 2025 (version robuste)\r\nBut :\r\n- calculer les plages RF susceptibles de g\u00E9n\u00E9rer des produits de m\u00E9lange (m,n)\r\n- calculer et afficher la plage de fr\u00E9quence image (supradyne\/infradyne)\r\n- trier\/filtrer les spurious et g\u00E9n\u00E9rer un rapport texte\r\nModifications apport\u00E9es :\r\n- recherche du fichier YAML dans le m\u00EAme dossier que le script (__file__)\r\n- \u00E9criture du fichier TXT de sortie dans le m\u00EAme dossier que le script\r\n- messages d\'erreur clairs si YAML absent ou mal form\u00E9\r\nRemarques :\r\n- Toutes les fr\u00E9quences sont en MHz.\r\n- La convention d\'indexation pour la table de puissances est expliqu\u00E9e dans get_puissance().\r\n\"\"\"\r\n\r\nfrom pathlib import Path\r\nimport pickle\r\nimport sys\r\nimport yaml\r\nimport numpy as np\r\nfrom typing import List, Optional, Tuple\r\n\r\ntry:\r\n    # chargeur YAML adoss\u00E9 \u00E0 libyaml (bien plus rapide), si PyYAML a \u00E9t\u00E9 compil\u00E9 avec\r\n    from yaml import CSafeLoader as SafeLoader\r\nexcept ImportError:\r\n    from yaml import SafeLoader\r\n\r\n# ---------------------------\r\n# Fonctions utilitaires\r\n# ---------------------------\r\n\r\ndef charger_parametres_yaml(fichier_yaml: str) -> dict:\r\n    \"\"\"Charge et renvoie le contenu YAML sous forme de dict Python.\r\n    L\u00E8ve une exception si le fichier est introuvable ou invalide.\r\n    Le dict est mis en cache (pickle) dans \'<fichier>.yaml.pkl\' \u00E0 c\u00F4t\u00E9 du YAML : tant que\r\n    le YAML n\'a pas \u00E9t\u00E9 modifi\u00E9 (m\u00EAme mtime), il est relu depuis ce cache sans parsing YAML.\r\n    Un cache illisible est ignor\u00E9 ; un cache impossible \u00E0 \u00E9crire n\'emp\u00EAche pas le calcul.\"\"\"\r\n    p = Path(fichier_yaml)\r\n    if not p.exists():\r\n        raise FileNotFoundError(f\"Fichier YAML introuvable : {p}\")\r\n    cache = p.with_suffix(\".yaml.pkl\")\r\n    yaml_mtime = p.stat().st_mtime\r\n\r\n    try:\r\n        with cache.open(\"rb\") as f:\r\n            cached = pickle.load(f)\r\n        if cached[\"yaml_mtime\"] == yaml_mtime:\r\n            return cached[\"data\"]\r\n    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):\r\n        pass\r\n\r\n    with p.open(\"r\", encoding=\"utf-8\") as f:\r\n        try:\r\n            data = yaml.load(f, Loader=SafeLoader)\r\n        except yaml.YAMLError as e:\r\n            raise RuntimeError(f\"Erreur lecture YAML : {e}\") from e\r\n    if not isinstance(data, dict):\r\n        raise ValueError(\"Le fichier YAML doit contenir un mapping (dictionnaire) en racine.\")\r\n\r\n    try:\r\n        with cache.open(\"wb\") as f:\r\n            pickle.dump({\"yaml_mtime\": yaml_mtime, \"data\": data}, f, protocol=pickle.HIGHEST_PROTOCOL)\r\n    except OSError:\r\n        pass\r\n    return data\r\n\r\n\r\ndef get_puissance(m: int, n: int, table: Optional[List[List]]) -> Optional[float]:\r\n    \"\"\"\r\n    R\u00E9cup\u00E8re la puissance (dBc) dans la table \'puissance_spurious\' pour (m,n).\r\n    Convention d\'indexation (code actuel) :\r\n      - ligne index = abs(m) - 1  -> ligne 0 correspond \u00E0 |m| == 1\r\n      - colonne index = abs(n)    -> colonne 0 correspond \u00E0 n == 0\r\n    Exemples :\r\n      m = -1, n = 2  -> table[0][2]\r\n      m = 2,  n = 0  -> table[1][0]\r\n    Retourne None si valeur absente \/ invalide \/ hors borne.\r\n    \"\"\"\r\n    if table is None:\r\n        return None\r\n    im = abs(m) - 1\r\n    in_ = abs(n)\r\n    # v\u00E9rification bornes\r\n    if im < 0 or im >= len(table):\r\n        return None\r\n    # certaines lignes pourraient avoir longueur in\u00E9gale -> safe check\r\n    if in_ < 0 or in_ >= len(table[im]):\r\n        return None\r\n    val = table[im][in_]\r\n    # valeurs \'ref\' ou \'na\' consid\u00E9r\u00E9es comme non fournies\r\n    if isinstance(val, str) and val.lower() in {\"ref\", \"na\"}:\r\n        return None\r\n    try:\r\n        return float(val)\r\n    except (ValueError, TypeError):\r\n        return None\r\n\r\n\r\ndef construire_lut_puissances(table: Optional[List[List]]) -> Optional[np.ndarray]:\r\n    \"\"\"\r\n    Convertit une fois la table \'puissance_spurious\' (liste de listes) en tableau float64\r\n    de m\u00EAme convention d\'indexation que get_puissance (ligne abs(m)-1, colonne abs(n)).\r\n    Les valeurs non fournies (\'ref\', \'na\', invalides, lignes plus courtes) valent NaN.\r\n    Retourne None si pas de table.\r\n    \"\"\"\r\n    if table is None:\r\n        return None\r\n    n_col = max((len(ligne) for ligne in table), default=0)\r\n    lut = np.full((len(table), n_col), np.nan)\r\n    for im, ligne in enumerate(table):\r\n        for in_ in range(len(ligne)):\r\n            p = get_puissance(im + 1, in_, table)\r\n            if p is not None:\r\n                lut[im, in_] = p\r\n    return lut\r\n\r\n\r\n# ---------------------------\r\n# Repr\u00E9sentation des r\u00E9sultats\r\n# ---------------------------\r\n\r\n# type de produit de m\u00E9lange, cod\u00E9 sur un octet (champ \'type\' de RESULTATS_DTYPE)\r\nTYPE_UTILE, TYPE_IMAGE, TYPE_SPURIOUS, TYPE_FUITE = 0, 1, 2, 3\r\n\r\n# une ligne par couple (m,n) retenu ; RF en float64 pour conserver exactement les\r\n# valeurs arrondies au centi\u00E8me (float32 d\u00E9calerait l\'affichage de certaines bornes)\r\nRESULTATS_DTYPE = np.dtype([\r\n    (\"m\", \"i2\"),\r\n    (\"n\", \"i2\"),\r\n    (\"type\", \"u1\"),\r\n    (\"RF_min\", \"f8\"),\r\n    (\"RF_max\", \"f8\"),\r\n])\r\n\r\n\r\n# ---------------------------\r\n# Calculs principaux\r\n# ---------------------------\r\n\r\ndef calculer_plage_image(params: dict) -> Tuple[float, float]:\r\n    \"\"\"\r\n    Calcule la plage de fr\u00E9quence image (en MHz) bas\u00E9e sur l\'OL fixe et la bande FI.\r\n    \'from\' accepte \'supradyne\' (OL + FI) ou \'infradyne\' (OL - FI).\r\n    \"\"\"\r\n    OL = params[\"OL_fixe_MHz\"]\r\n    FI_min = params[\"FI_min_MHz\"]\r\n    FI_max = params[\"FI_max_MHz\"]\r\n    mode = params.get(\"from\", \"supradyne\").lower().strip()\r\n    if mode == \"supradyne\":\r\n        return OL + FI_min, OL + FI_max\r\n    elif mode == \"infradyne\":\r\n        return OL - FI_max, OL - FI_min\r\n    else:\r\n        raise ValueError(\"Mode de conversion invalide (attendu \'supradyne\' ou \'infradyne\')\")\r\n\r\n\r\ndef plages_mn(m_max: int, n_max: int, OL: float, FI_min: float, FI_max: float,\r\n              RF_min: float, RF_max: float) -> np.ndarray:\r\n    \"\"\"\r\n    Noyau num\u00E9rique de calculer_plages : plages RF (non arrondies) de tous les couples\r\n    (m,n) dont le produit de m\u00E9lange tombe dans la bande FI.\r\n    Calcul d\'un coup sur la grille (m,n) (tableaux numpy, m en lignes \/ n en colonnes).\r\n    Retourne un tableau float64 (K, 4) de colonnes m, n, RF_min, RF_max, dans l\'ordre\r\n    m croissant puis n croissant.\r\n    \"\"\"\r\n    m = np.arange(-m_max, m_max + 1)[:, None]   # (M, 1)\r\n    n = np.arange(-n_max, n_max + 1)[None, :]   # (1, N)\r\n    n_OL = n * OL\r\n\r\n    # divisions par m == 0 sans avertissement : ces cases sont remplac\u00E9es plus bas\r\n    with np.errstate(divide=\'ignore\', invalid=\'ignore\'):\r\n        # CAS g\u00E9n\u00E9ral : r\u00E9soudre m*RF + n*OL \u2208 [FI_min, FI_max]\r\n        rf1 = (FI_min - n_OL) \/ m\r\n        rf2 = (FI_max - n_OL) \/ m\r\n        lo = np.minimum(rf1, rf2)\r\n        hi = np.maximum(rf1, rf2)\r\n\r\n        # CAS n == 0 => FI = m * RF  => RF = FI \/ |m|\r\n        lo = np.where(n == 0, FI_min \/ np.abs(m), lo)\r\n        hi = np.where(n == 0, FI_max \/ np.abs(m), hi)\r\n\r\n    lo_c = np.maximum(lo, RF_min)\r\n    hi_c = np.minimum(hi, RF_max)\r\n    valid = lo_c <= hi_c\r\n\r\n    # CAS m == 0 => le produit ne d\u00E9pend que de n*OL (fuite possible) : toute la bande RF\r\n    FI_fuite = np.abs(n_OL)\r\n    fuite_dans_fi = (FI_min <= FI_fuite) & (FI_fuite <= FI_max)\r\n    lo_c = np.where(m == 0, RF_min, lo_c)\r\n    hi_c = np.where(m == 0, RF_max, hi_c)\r\n    valid = np.where(m == 0, fuite_dans_fi, valid)\r\n\r\n    # ignore le cas trivial (0,0)\r\n    valid &= ~((m == 0) & (n == 0))\r\n\r\n    # argwhere et le masque bool\u00E9en parcourent la grille dans le m\u00EAme ordre (m puis n)\r\n    ij = np.argwhere(valid)\r\n    plages = np.empty((len(ij), 4), dtype=np.float64)\r\n    plages[:, 0] = ij[:, 0] - m_max\r\n    plages[:, 1] = ij[:, 1] - n_max\r\n    plages[:, 2] = lo_c[valid]\r\n    plages[:, 3] = hi_c[valid]\r\n    return plages\r\n\r\n\r\ndef calculer_plages(params: dict) -> np.ndarray:\r\n    \"\"\"\r\n    Parcourt tous les couples (m,n) et renvoie un tableau structur\u00E9 (RESULTATS_DTYPE),\r\n    une ligne par couple retenu :\r\n      m, n, type (TYPE_UTILE | TYPE_IMAGE | TYPE_SPURIOUS | TYPE_FUITE), RF_min, RF_max\r\n    Les plages sont calcul\u00E9es par plages_mn ; \u00E9tiquetage et arrondi sont faits ensuite.\r\n    Les lignes suivent l\'ordre m croissant puis n croissant.\r\n    \"\"\"\r\n    m_max = int(params[\"m_max\"])\r\n    n_max = int(params[\"n_max\"])\r\n    OL = float(params[\"OL_fixe_MHz\"])\r\n    FI_min, FI_max = float(params[\"FI_min_MHz\"]), float(params[\"FI_max_MHz\"])\r\n    RF_min, RF_max = float(params[\"RF_min_MHz\"]), float(params[\"RF_max_MHz\"])\r\n    mode = params.get(\"from\", \"supradyne\").lower().strip()\r\n\r\n    plages = plages_mn(m_max, n_max, OL, FI_min, FI_max, RF_min, RF_max)\r\n    resultats = np.empty(len(plages), dtype=RESULTATS_DTYPE)\r\n    resultats[\"m\"] = plages[:, 0]\r\n    resultats[\"n\"] = plages[:, 1]\r\n\r\n    # \u00E9tiquetage par masques sur les colonnes m \/ n (spurious par d\u00E9faut)\r\n    m = resultats[\"m\"]\r\n    n = resultats[\"n\"]\r\n    labels = np.full(len(resultats), TYPE_SPURIOUS, dtype=np.int8)\r\n    # supradyne : (-1, 1) utile, (1, -1) image ; infradyne : l\'inverse\r\n    if mode == \"supradyne\":\r\n        labels[(m == -1) & (n == 1)] = TYPE_UTILE\r\n        labels[(m == 1) & (n == -1)] = TYPE_IMAGE\r\n    elif mode == \"infradyne\":\r\n        labels[(m == 1) & (n == -1)] = TYPE_UTILE\r\n        labels[(m == -1) & (n == 1)] = TYPE_IMAGE\r\n    labels[(m == 0) | (n == 0)] = TYPE_FUITE\r\n    resultats[\"type\"] = labels\r\n\r\n    # arrondi au centi\u00E8me (round Python, sur des floats Python) : np.round(x, 2) multiplie\r\n    # par 100 avant d\'arrondir et ne donne pas toujours le m\u00EAme r\u00E9sultat (ex : 2592.995)\r\n    resultats[\"RF_min\"] = [round(v, 2) for v in plages[:, 2].tolist()]\r\n    resultats[\"RF_max\"] = [round(v, 2) for v in plages[:, 3].tolist()]\r\n\r\n    return resultats\r\n\r\n\r\ndef generer_rapport_interference(params: dict) -> List[str]:\r\n    \"\"\"\r\n    V\u00E9rifie deux interf\u00E9rences simples :\r\n      - OL dans la bande FI\r\n      - chevauchement entre bande RF et bande FI\r\n    Retourne une liste de lignes pour insertion dans le fichier rapport.\r\n    \"\"\"\r\n    OL = params[\"OL_fixe_MHz\"]\r\n    RF_min, RF_max = params[\"RF_min_MHz\"], params[\"RF_max_MHz\"]\r\n    FI_min, FI_max = params[\"FI_min_MHz\"], params[\"FI_max_MHz\"]\r\n\r\n    ol_dans_fi = FI_min <= OL <= FI_max\r\n    rf_dans_fi = not (RF_max < FI_min or RF_min > FI_max)\r\n\r\n    lignes = []\r\n    lignes.append(\"=== V\u00E9rification des fuites directes ===\")\r\n    if ol_dans_fi:\r\n        lignes.append(\"\u274C L\'OL est DANS la bande FI \u2192 \u26A0\uFE0F PROBL\u00C8ME\")\r\n    else:\r\n        lignes.append(\"\u2705 L\'OL est HORS de la bande FI\")\r\n    if rf_dans_fi:\r\n        lignes.append(\"\u274C Une partie de la bande RF est DANS la bande FI \u2192 \u26A0\uFE0F PROBL\u00C8ME\")\r\n    else:\r\n        lignes.append(\"\u2705 La bande RF est HORS de la bande FI\")\r\n    lignes.append(\"\")\r\n    return lignes\r\n\r\n\r\n# ---------------------------\r\n# G\u00E9n\u00E9ration du rapport\r\n# ---------------------------\r\n\r\ndef sauvegarder_rapport(resultats: np.ndarray, fichier: str, params: dict, table_puiss=None, plage_image=None) -> None:\r\n    \"\"\"\r\n    G\u00E9n\u00E8re le rapport texte final \'fichier\' \u00E0 partir du tableau structur\u00E9 de calculer_plages.\r\n    Sections extraites par masque sur le champ \'type\'.\r\n    Tri (np.lexsort, stable, sur des colonnes de cl\u00E9s) :\r\n      - si table_puiss fournie : tri d\'abord par puissance si disponible (valeur num\u00E9rique plus petite = prioritaire),\r\n        sinon par complexit\u00E9 (|m|+|n|).\r\n      - sinon : tri par complexit\u00E9.\r\n    Format d\'\u00E9criture humain lisible.\r\n    \"\"\"\r\n    utiles = resultats[resultats[\"type\"] == TYPE_UTILE]\r\n    sp = resultats[resultats[\"type\"] == TYPE_SPURIOUS]\r\n\r\n    # |m|, |n| et complexit\u00E9 |m|+|n| calcul\u00E9s une seule fois par spurious (colonnes de cl\u00E9s de tri)\r\n    abs_m = np.abs(sp[\"m\"].astype(np.int32))\r\n    abs_n = np.abs(sp[\"n\"].astype(np.int32))\r\n    complexite = abs_m + abs_n\r\n\r\n    # puissance de chaque spurious, lue par indexation de la table convertie\r\n    # (NaN sans table, hors table ou si non fournie)\r\n    pwr = np.full(len(sp), np.nan)\r\n    if table_puiss is not None:\r\n        lut = construire_lut_puissances(table_puiss)\r\n        im = abs_m - 1\r\n        dans_table = (im >= 0) & (im < lut.shape[0]) & (abs_n < lut.shape[1])\r\n        pwr[dans_table] = lut[im[dans_table], abs_n[dans_table]]\r\n\r\n    # cl\u00E9s de tri : (puissance si table fournie,) complexit\u00E9 |m|+|n|, |m|, |n|, RF_min\r\n    # (np.lexsort trie sur la DERNI\u00C8RE cl\u00E9 d\'abord : liste donn\u00E9e de la moins \u00E0 la plus prioritaire)\r\n    cles = [sp[\"RF_min\"], abs_n, abs_m, complexite]\r\n    if table_puiss is not None:\r\n        # tri en combinant puissance (si dispo, sinon +inf) puis complexit\u00E9\r\n        cles.append(np.where(np.isnan(pwr), np.inf, pwr))\r\n    ordre = np.lexsort(cles)\r\n    sp = sp[ordre]\r\n    pwr_str = [\"\" if np.isnan(p) else \"%.1f\" % p for p in pwr[ordre].tolist()]\r\n\r\n    # \u00E9criture s\u00E9curis\u00E9e du fichier (cr\u00E9era\/\u00E9crasera)\r\n    p_out = Path(fichier)\r\n    try:\r\n        with p_out.open(\"w\", encoding=\"utf-8\") as f:\r\n            # Interf\u00E9rences directes OL\/FI et RF\/FI\r\n            interferences = generer_rapport_interference(params)\r\n            f.write(\"\".join([ligne + \"\\n\" for ligne in interferences]))\r\n\r\n            # Fr\u00E9quences utiles\r\n            f.write(\"=== Fr\u00E9quences utiles ===\\n\")\r\n            f.write(f\"Nombre total : {len(utiles)}\\n\")\r\n            f.write(\"m,   n,  RF_min (MHz),  RF_max (MHz)\\n\")\r\n            # une ligne format\u00E9e (%) par entr\u00E9e, un seul write par section\r\n            f.write(\"\".join([\"%3d, %3d, %12.1f, %12.1f\\n\" % (m, n, rf_min, rf_max)\r\n                             for m, n, _, rf_min, rf_max in utiles.tolist()]))\r\n            f.write(\"\\n\")\r\n\r\n            # Fr\u00E9quences images\r\n            f.write(\"=== Fr\u00E9quences images ===\\n\")\r\n            f.write(\"Plage de fr\u00E9quence image (MHz) : \\n\")\r\n            if plage_image:\r\n                f.write(f\"{plage_image[0]:8.2f}, {plage_image[1]:8.2f} \\n\\n\")\r\n            else:\r\n                f.write(\"N\/A, N\/A\\n\\n\")\r\n\r\n            # Spurious\r\n            f.write(\"=== Spurious complexes (tri\u00E9s) ===\\n\")\r\n            f.write(f\"Nombre total : {len(sp)}\\n\")\r\n            f.write(\"m,   n,  RF_min (MHz),  RF_max (MHz), Puissance (dBc)\\n\")\r\n            f.write(\"\".join([\"%3d, %3d, %12.1f, %12.1f,       %-15s\\n\"\r\n                             % (m, n, rf_min, rf_max, p_str)\r\n                             for (m, n, _, rf_min, rf_max), p_str in zip(sp.tolist(), pwr_str)]))\r\n            f.write(\"\\n\")\r\n    except OSError as e:\r\n        raise RuntimeError(f\"Impossible d\'\u00E9crire le fichier de sortie \'{p_out}\': {e}\") from e\r\n\r\n\r\n# ---------------------------\r\n# Entr\u00E9e du script\r\n# ---------------------------\r\n\r\nif __name__ == \"__main__\":\r\n    # D\u00E9termine le dossier du script (m\u00EAme si on ex\u00E9cute depuis un autre cwd).\r\n    # Si __file__ non d\u00E9fini (rare dans REPL), on prend le cwd actuel.\r\n    try:\r\n        script_path = Path(__file__).resolve()\r\n        dossier_script = script_path.parent\r\n    except NameError:\r\n        dossier_script = Path.cwd()\r\n\r\n    # chemins fixes dans le dossier du script\r\n    fichier_yaml = dossier_script \/ \"parametres_spurious.yaml\"\r\n    fichier_txt = dossier_script \/ \"Spurious_results.txt\"\r\n\r\n    # Chargement YAML avec gestion d\'erreur claire\r\n    try:\r\n        params = charger_parametres_yaml(str(fichier_yaml))\r\n    except FileNotFoundError:\r\n        print(f\"[ERREUR] Fichier de param\u00E8tres introuvable : {fichier_yaml}\")\r\n        print(\"Place le fichier \'parametres_spurious.yaml\' dans le m\u00EAme dossier que ce script.\")\r\n        sys.exit(2)\r\n    except Exception as e:\r\n        print(f\"[ERREUR] Impossible de charger le YAML : {e}\")\r\n        sys.exit(3)\r\n\r\n    # Calculs\r\n    try:\r\n        resultats = calculer_plages(params)\r\n        # calcule toujours la plage image (m\u00EAme si hors RF)\r\n        plage_img = calculer_plage_image(params)\r\n    except Exception as e:\r\n        print(f\"[ERREUR] Probl\u00E8me lors des calculs : {e}\")\r\n        sys.exit(4)\r\n\r\n    tab_puiss = params.get(\"puissance_spurious\")\r\n\r\n    # \u00E9criture du rapport (dans le m\u00EAme dossier que le script)\r\n    try:\r\n        sauvegarder_rapport(resultats, str(fichier_txt), params, tab_puiss, plage_img)\r\n        print(f\"[OK] Rapport g\u00E9n\u00E9r\u00E9 : {fichier_txt}\")\r\n    except Exception as e:\r\n        print(f\"[ERREUR] \u00C9criture du rapport \u00E9chou\u00E9e : {e}\")\r\n        sys.exit(5)\r\n",
+  "code_yaml":"# === Bande RF (MHz) ===\r\n# Plage de fr\u00E9quences RF que l\'on consid\u00E8re pour la recherche des spurious.\r\n# - RF_min_MHz : borne basse (MHz), float ou int\r\n# - RF_max_MHz : borne haute (MHz), float ou int\r\nRF_min_MHz: 5500      # exemple : 6 GHz\r\nRF_max_MHz: 18000     # exemple : 18 GHz\r\n\r\n# === Oscillateur Local (OL) ===\r\n# OL_fixe_MHz : fr\u00E9quence de l\'oscillateur local (en MHz).\r\n# Remarque : le script utilise OL_fixe_MHz comme valeur unique. Si tu veux balayer\r\n# plusieurs OL, il faudrait modifier le script pour it\u00E9rer sur une liste.\r\nOL_fixe_MHz: 10000    # 10 GHz\r\n\r\n# === Bande FI cible (MHz) ===\r\n# FI_min_MHz \/ FI_max_MHz : la bande FI recherch\u00E9e (en MHz). Toutes les plages\r\n# RF qui g\u00E9n\u00E8rent des produits de m\u00E9lange tombant dans [FI_min_MHz, FI_max_MHz]\r\n# seront conserv\u00E9es (apr\u00E8s intersection avec la bande RF).\r\nFI_min_MHz: 3750\r\nFI_max_MHz: 4250\r\n\r\n# === Coefficients de m\u00E9lange ===\r\n# m_max : valeur maximale (positive) pour |m|\r\n# n_max : valeur maximale (positive) pour |n|\r\n# Le script parcourt m dans [-m_max .. +m_max] et n dans [-n_max .. +n_max].\r\n# Les cas m == 0 et\/ou n == 0 sont trait\u00E9s comme \"fuite\".\r\nm_max: 3\r\nn_max: 5\r\n\r\n# === Type de conversion ===\r\n# \'supradyne\'  -> OL + FI = image (typique OL > RF)\r\n# \'infradyne\'  -> OL - FI = image (typique OL < RF)\r\n# Valeur insensible \u00E0 la casse. Toute autre valeur l\u00E8vera une exception.\r\nfrom: supradyne\r\n\r\n# === Table des puissances des spurious (optionnel) ===\r\n# Structure : liste de lignes (tableau 2D) ; chaque \u00E9l\u00E9ment est soit :\r\n#   - un nombre convertible en float (puissance en dBc)\r\n#   - une cha\u00EEne \'ref\' ou \'na\' (marqueur -> valeur non fournie)\r\n#\r\n# IMPORTANT : convention d\'indexation impl\u00E9ment\u00E9e dans get_puissance(m,n):\r\n#   - ligne index = abs(m) - 1          (donc la premi\u00E8re ligne correspond \u00E0 |m| == 1)\r\n#   - colonne index = abs(n)            (donc la premi\u00E8re colonne correspond \u00E0 n == 0)\r\n#\r\n# En cons\u00E9quence :\r\n#   - nombre de lignes requis >= m_max (puisque ligne index = abs(m)-1 -> m_max -> index m_max-1)\r\n#   - nombre de colonnes requis >= (n_max + 1) (puisque colonne 0 correspond \u00E0 n==0, et colonne n_max correspond \u00E0 |n|==n_max)\r\n#\r\n# Exemple pour m_max=2, n_max=5 :\r\n#   - lignes : au moins 2 (pour |m|=1 et |m|=2)\r\n#   - colonnes : au moins 6 (pour n = 0..5)\r\n#\r\n# Exemple de format (ici fourni tel que dans ton YAML d\'origine) :\r\npuissance_spurious:\r\n   - [-29, -ref, -23, -10, -21, -19]\r\n   - [-85, -61, -73, -65, -71, -69]\r\n   - [-84, -68, -88, -81, -87, -78]\r\n   - [-114, -109, -116, -115, -116, -115]\r\n   - [-119, -123, -128, -126, -127, -128]\r\n",
   "code_path": "files/code/Spurious_finder/Spurious_finder.py",
   "yaml_path": "files/code/Spurious_finder/parametres_spurious.yaml"
 },
@@ -41,8 +41,8 @@ window.DOWNLOADS = [
   "version": "code",
   "size_bytes": 15612,
   "description": "Calcul NF, gain, P1dB en cascade.",
-  "code_py":"# -*- coding: utf-8 -*-\r\n\"\"\"\r\nAnalyse des fr\u00E9quences RF \u2014 script final Juillet 2025 (version robuste)\r\nBut :\r\n- calculer les plages RF susceptibles de g\u00E9n\u00E9rer des produits de m\u00E9lange (m,n)\r\n- calculer et afficher la plage de fr\u00E9quence image (supradyne\/infradyne)\r\n- trier\/filtrer les spurious et g\u00E9n\u00E9rer un rapport texte\r\nModifications apport\u00E9es :\r\n- recherche du fichier YAML dans le m\u00EAme dossier que le script (__file__)\r\n- \u00E9criture du fichier TXT de sortie dans le m\u00EAme dossier que le script\r\n- messages d\'erreur clairs si YAML absent ou mal form\u00E9\r\nRemarques :\r\n- Toutes les fr\u00E9quences sont en MHz.\r\n- La convention d\'indexation pour la table de puissances est expliqu\u00E9e dans get_puissance().\r\n\"\"\"\r\n\r\nfrom pathlib import Path\r\nimport sys\r\nimport yaml\r\nfrom typing import List, Optional, Tuple\r\n\r\n# ---------------------------\r\n# Fonctions utilitaires\r\n# ---------------------------\r\n\r\ndef charger_parametres_yaml(fichier_yaml: str) -> dict:\r\n    \"\"\"Charge et renvoie le contenu YAML sous forme de dict Python.\r\n    L\u00E8ve une exception si le fichier est introuvable ou invalide.\"\"\"\r\n    p = Path(fichier_yaml)\r\n    if not p.exists():\r\n        raise FileNotFoundError(f\"Fichier YAML introuvable : {p}\")\r\n    with p.open(\"r\", encoding=\"utf-8\") as f:\r\n        try:\r\n            data = yaml.safe_load(f)\r\n        except yaml.YAMLError as e:\r\n            raise RuntimeError(f\"Erreur lecture YAML : {e}\") from e\r\n    if not isinstance(data, dict):\r\n        raise ValueError(\"Le fichier YAML doit contenir un mapping (dictionnaire) en racine.\")\r\n    return data\r\n\r\n\r\ndef get_puissance(m: int, n: int, table: Optional[List[List]]) -> Optional[float]:\r\n    \"\"\"\r\n    R\u00E9cup\u00E8re la puissance (dBc) dans la table \'puissance_spurious\' pour (m,n).\r\n    Convention d\'indexation (code actuel) :\r\n      - ligne index = abs(m) - 1  -> ligne 0 correspond \u00E0 |m| == 1\r\n      - colonne index = abs(n)    -> colonne 0 correspond \u00E0 n == 0\r\n    Exemples :\r\n      m = -1, n = 2  -> table[0][2]\r\n      m = 2,  n = 0  -> table[1][0]\r\n    Retourne None si valeur absente \/ invalide \/ hors borne.\r\n    \"\"\"\r\n    if table is None:\r\n        return None\r\n    im = abs(m) - 1\r\n    in_ = abs(n)\r\n    # v\u00E9rification bornes\r\n    if im < 0 or im >= len(table):\r\n        return None\r\n    # certaines lignes pourraient avoir longueur in\u00E9gale -> safe check\r\n    if in_ < 0 or in_ >= len(table[im]):\r\n        return None\r\n    val = table[im][in_]\r\n    # valeurs \'ref\' ou \'na\' consid\u00E9r\u00E9es comme non fournies\r\n    if isinstance(val, str) and val.lower() in {\"ref\", \"na\"}:\r\n        return None\r\n    try:\r\n        return float(val)\r\n    except (ValueError, TypeError):\r\n        return None\r\n\r\n\r\n# ---------------------------\r\n# Calculs principaux\r\n# ---------------------------\r\n\r\ndef calculer_plage_image(params: dict) -> Tuple[float, float]:\r\n    \"\"\"\r\n    Calcule la plage de fr\u00E9quence image (en MHz) bas\u00E9e sur l\'OL fixe et la bande FI.\r\n    \'from\' accepte \'supradyne\' (OL + FI) ou \'infradyne\' (OL - FI).\r\n    \"\"\"\r\n    OL = params[\"OL_fixe_MHz\"]\r\n    FI_min = params[\"FI_min_MHz\"]\r\n    FI_max = params[\"FI_max_MHz\"]\r\n    mode = params.get(\"from\", \"supradyne\").lower().strip()\r\n    if mode == \"supradyne\":\r\n        return OL + FI_min, OL + FI_max\r\n    elif mode == \"infradyne\":\r\n        return OL - FI_max, OL - FI_min\r\n    else:\r\n        raise ValueError(\"Mode de conversion invalide (attendu \'supradyne\' ou \'infradyne\')\")\r\n\r\n\r\ndef calculer_plages(params: dict) -> List[dict]:\r\n    \"\"\"\r\n    Parcourt tous les couples (m,n) et renvoie une liste d\'entr\u00E9es :\r\n      { \'m\': int, \'n\': int, \'type\': \'utile\'|\'image\'|\'spurious\'|\'fuite\', \'RF_min\': float, \'RF_max\': float }\r\n    Explications de traitement dans les commentaires du code.\r\n    \"\"\"\r\n    m_max = int(params[\"m_max\"])\r\n    n_max = int(params[\"n_max\"])\r\n    OL = float(params[\"OL_fixe_MHz\"])\r\n    FI_min, FI_max = float(params[\"FI_min_MHz\"]), float(params[\"FI_max_MHz\"])\r\n    RF_min, RF_max = float(params[\"RF_min_MHz\"]), float(params[\"RF_max_MHz\"])\r\n    mode = params.get(\"from\", \"supradyne\").lower().strip()\r\n\r\n    resultats: List[dict] = []\r\n\r\n    for m in range(-m_max, m_max + 1):\r\n        for n in range(-n_max, n_max + 1):\r\n            # ignore le cas trivial (0,0)\r\n            if m == 0 and n == 0:\r\n                continue\r\n\r\n            try:\r\n                # CAS m == 0 => le produit ne d\u00E9pend que de n*OL (fuite possible)\r\n                if m == 0:\r\n                    FI = abs(n * OL)\r\n                    if not (FI_min <= FI <= FI_max):\r\n                        continue\r\n                    lo_c, hi_c = RF_min, RF_max\r\n\r\n                # CAS n == 0 => FI = m * RF  => RF = FI \/ m\r\n                elif n == 0:\r\n                    lo = FI_min \/ abs(m)\r\n                    hi = FI_max \/ abs(m)\r\n                    lo_c = max(lo, RF_min)\r\n                    hi_c = min(hi, RF_max)\r\n                    if lo_c > hi_c:\r\n                        continue\r\n\r\n                # CAS g\u00E9n\u00E9ral : r\u00E9soudre m*RF + n*OL \u2208 [FI_min, FI_max]\r\n                else:\r\n                    rf1 = (FI_min - n * OL) \/ m\r\n                    rf2 = (FI_max - n * OL) \/ m\r\n                    lo, hi = sorted((rf1, rf2))\r\n                    lo_c = max(lo, RF_min)\r\n                    hi_c = min(hi, RF_max)\r\n                    if lo_c > hi_c:\r\n                        continue\r\n\r\n            except ZeroDivisionError:\r\n                # s\u00E9curit\u00E9 (normalement non atteint car m == 0 g\u00E9r\u00E9)\r\n                continue\r\n\r\n            # \u00E9tiquetage\r\n            if m == 0 or n == 0:\r\n                label = \"fuite\"\r\n            elif (mode == \"supradyne\" and (m, n) == (-1, 1)) \\\r\n              or (mode == \"infradyne\" and (m, n) == (1, -1)):\r\n                label = \"utile\"\r\n            elif (mode == \"supradyne\" and (m, n) == (1, -1)) \\\r\n              or (mode == \"infradyne\" and (m, n) == (-1, 1)):\r\n                label = \"image\"\r\n            else:\r\n                label = \"spurious\"\r\n\r\n            resultats.append({\r\n                \"m\":      m,\r\n                \"n\":      n,\r\n                \"type\":   label,\r\n                \"RF_min\": round(lo_c, 2),\r\n                \"RF_max\": round(hi_c, 2),\r\n            })\r\n\r\n    return resultats\r\n\r\n\r\ndef generer_rapport_interference(params: dict) -> List[str]:\r\n    \"\"\"\r\n    V\u00E9rifie deux interf\u00E9rences simples :\r\n      - OL dans la bande FI\r\n      - chevauchement entre bande RF et bande FI\r\n    Retourne une liste de lignes pour insertion dans le fichier rapport.\r\n    \"\"\"\r\n    OL = params[\"OL_fixe_MHz\"]\r\n    RF_min, RF_max = params[\"RF_min_MHz\"], params[\"RF_max_MHz\"]\r\n    FI_min, FI_max = params[\"FI_min_MHz\"], params[\"FI_max_MHz\"]\r\n\r\n    ol_dans_fi = FI_min <= OL <= FI_max\r\n    rf_dans_fi = not (RF_max < FI_min or RF_min > FI_max)\r\n\r\n    lignes = []\r\n    lignes.append(\"=== V\u00E9rification des fuites directes ===\")\r\n    if ol_dans_fi:\r\n        lignes.append(\"\u274C L\'OL est DANS la bande FI \u2192 \u26A0\uFE0F PROBL\u00C8ME\")\r\n    else:\r\n        lignes.append(\"\u2705 L\'OL est HORS de la bande FI\")\r\n    if rf_dans_fi:\r\n        lignes.append(\"\u274C Une partie de la bande RF est DANS la bande FI \u2192 \u26A0\uFE0F PROBL\u00C8ME\")\r\n    else:\r\n        lignes.append(\"\u2705 La bande RF est HORS de la bande FI\")\r\n    lignes.append(\"\")\r\n    return lignes\r\n\r\n\r\n# ---------------------------\r\n# G\u00E9n\u00E9ration du rapport\r\n# ---------------------------\r\n\r\ndef sauvegarder_rapport(resultats: List[dict], fichier: str, params: dict, table_puiss=None, plage_image=None) -> None:\r\n    \"\"\"\r\n    G\u00E9n\u00E8re le rapport texte final \'fichier\'.\r\n    Tri :\r\n      - si table_puiss fournie : tri d\'abord par puissance si disponible (valeur num\u00E9rique plus petite = prioritaire),\r\n        sinon par complexit\u00E9 (|m|+|n|).\r\n      - sinon : tri par complexit\u00E9.\r\n    Format d\'\u00E9criture humain lisible.\r\n    \"\"\"\r\n    sections = {\"utile\": [], \"image\": [], \"spurious\": [], \"fuite\": []}\r\n    for r in resultats:\r\n        sections[r[\"type\"]].append(r)\r\n\r\n    sp = sections[\"spurious\"]\r\n\r\n    if table_puiss is not None:\r\n        # tri en combinant puissance (si dispo) puis complexit\u00E9\r\n        def key_fn(x):\r\n            p = get_puissance(x[\"m\"], x[\"n\"], table_puiss)\r\n            p_key = p if p is not None else float(\'inf\')\r\n            return (p_key, abs(x[\"m\"]) + abs(x[\"n\"]), abs(x[\"m\"]), abs(x[\"n\"]), x[\"RF_min\"])\r\n        sp.sort(key=key_fn)\r\n    else:\r\n        sp.sort(key=lambda x: (abs(x[\"m\"]) + abs(x[\"n\"]), abs(x[\"m\"]), abs(x[\"n\"]), x[\"RF_min\"]))\r\n\r\n    # \u00E9criture s\u00E9curis\u00E9e du fichier (cr\u00E9era\/\u00E9crasera)\r\n    p_out = Path(fichier)\r\n    try:\r\n        with p_out.open(\"w\", encoding=\"utf-8\") as f:\r\n            # Interf\u00E9rences directes OL\/FI et RF\/FI\r\n            interferences = generer_rapport_interference(params)\r\n            for ligne in interferences:\r\n                f.write(ligne + \"\\n\")\r\n\r\n            # Fr\u00E9quences utiles\r\n            f.write(\"=== Fr\u00E9quences utiles ===\\n\")\r\n            f.write(f\"Nombre total : {len(sections[\'utile\'])}\\n\")\r\n            f.write(\"m,   n,  RF_min (MHz),  RF_max (MHz)\\n\")\r\n            for u in sections[\"utile\"]:\r\n                f.write(f\"{u[\'m\']:3d}, {u[\'n\']:3d}, {u[\'RF_min\']:12.1f}, {u[\'RF_max\']:12.1f}\\n\")\r\n            f.write(\"\\n\")\r\n\r\n            # Fr\u00E9quences images\r\n            f.write(\"=== Fr\u00E9quences images ===\\n\")\r\n            f.write(\"Plage de fr\u00E9quence image (MHz) : \\n\")\r\n            if plage_image:\r\n                f.write(f\"{plage_image[0]:8.2f}, {plage_image[1]:8.2f} \\n\\n\")\r\n            else:\r\n                f.write(\"N\/A, N\/A\\n\\n\")\r\n\r\n            # Spurious\r\n            f.write(\"=== Spurious complexes (tri\u00E9s) ===\\n\")\r\n            f.write(f\"Nombre total : {len(sp)}\\n\")\r\n            f.write(\"m,   n,  RF_min (MHz),  RF_max (MHz), Puissance (dBc)\\n\")\r\n            for s in sp:\r\n                pwr = get_puissance(s[\'m\'], s[\'n\'], table_puiss) if table_puiss is not None else None\r\n                pwr_str = f\"{pwr:.1f}\" if pwr is not None else \"\"\r\n                f.write(f\"{s[\'m\']:3d}, {s[\'n\']:3d}, {s[\'RF_min\']:12.1f}, {s[\'RF_max\']:12.1f},       {pwr_str:15}\\n\")\r\n            f.write(\"\\n\")\r\n    except OSError as e:\r\n        raise RuntimeError(f\"Impossible d\'\u00E9crire le fichier de sortie \'{p_out}\': {e}\") from e\r\n\r\n\r\n# ---------------------------\r\n# Entr\u00E9e du script\r\n# ---------------------------\r\n\r\nif __name__ == \"__main__\":\r\n    # D\u00E9termine le dossier du script (m\u00EAme si on ex\u00E9cute depuis un autre cwd).\r\n    # Si __file__ non d\u00E9fini (rare dans REPL), on prend le cwd actuel.\r\n    try:\r\n        script_path = Path(__file__).resolve()\r\n        dossier_script = script_path.parent\r\n    except NameError:\r\n        dossier_script = Path.cwd()\r\n\r\n    # chemins fixes dans le dossier du script\r\n    fichier_yaml = dossier_script \/ \"parametres_spurious.yaml\"\r\n    fichier_txt = dossier_script \/ \"Spurious_results.txt\"\r\n\r\n    # Chargement YAML avec gestion d\'erreur claire\r\n    try:\r\n        params = charger_parametres_yaml(str(fichier_yaml))\r\n    except FileNotFoundError:\r\n        print(f\"[ERREUR] Fichier de param\u00E8tres introuvable : {fichier_yaml}\")\r\n        print(\"Place le fichier \'parametres_spurious.yaml\' dans le m\u00EAme dossier que ce script.\")\r\n        sys.exit(2)\r\n    except Exception as e:\r\n        print(f\"[ERREUR] Impossible de charger le YAML : {e}\")\r\n        sys.exit(3)\r\n\r\n    # Calculs\r\n    try:\r\n        resultats = calculer_plages(params)\r\n        # calcule toujours la plage image (m\u00EAme si hors RF)\r\n        plage_img = calculer_plage_image(params)\r\n    except Exception as e:\r\n        print(f\"[ERREUR] Probl\u00E8me lors des calculs : {e}\")\r\n        sys.exit(4)\r\n\r\n    tab_puiss = params.get(\"puissance_spurious\")\r\n\r\n    # \u00E9criture du rapport (dans le m\u00EAme dossier que le script)\r\n    try:\r\n        sauvegarder_rapport(resultats, str(fichier_txt), params, tab_puiss, plage_img)\r\n        print(f\"[OK] Rapport g\u00E9n\u00E9r\u00E9 : {fichier_txt}\")\r\n    except Exception as e:\r\n        print(f\"[ERREUR] \u00C9criture du rapport \u00E9chou\u00E9e : {e}\")\r\n        sys.exit(5)\r\n",
-  "code_yaml":"# === Bande RF (MHz) ===\r\n# Plage de fr\u00E9quences RF que l\'on consid\u00E8re pour la recherche des spurious.\r\n# - RF_min_MHz : borne basse (MHz), float ou int\r\n# - RF_max_MHz : borne haute (MHz), float ou int\r\nRF_min_MHz: 5500      # exemple : 6 GHz\r\nRF_max_MHz: 18000     # exemple : 18 GHz\r\n\r\n# === Oscillateur Local (OL) ===\r\n# OL_fixe_MHz : fr\u00E9quence de l\'oscillateur local (en MHz).\r\n# Remarque : le script utilise OL_fixe_MHz comme valeur unique. Si tu veux balayer\r\n# plusieurs OL, il faudrait modifier le script pour it\u00E9rer sur une liste.\r\nOL_fixe_MHz: 10000    # 10 GHz\r\n\r\n# === Bande FI cible (MHz) ===\r\n# FI_min_MHz \/ FI_max_MHz : la bande FI recherch\u00E9e (en MHz). Toutes les plages\r\n# RF qui g\u00E9n\u00E8rent des produits de m\u00E9lange tombant dans [FI_min_MHz, FI_max_MHz]\r\n# seront conserv\u00E9es (apr\u00E8s intersection avec la bande RF).\r\nFI_min_MHz: 3750\r\nFI_max_MHz: 4250\r\n\r\n# === Coefficients de m\u00E9lange ===\r\n# m_max : valeur maximale (positive) pour |m|\r\n# n_max : valeur maximale (positive) pour |n|\r\n# Le script parcourt m dans [-m_max .. +m_max] et n dans [-n_max .. +n_max].\r\n# Les cas m == 0 et\/ou n == 0 sont trait\u00E9s comme \"fuite\".\r\nm_max: 3\r\nn_max: 5\r\n\r\n# === Type de conversion ===\r\n# \'supradyne\'  -> OL + FI = image (typique OL > RF)\r\n# \'infradyne\'  -> OL - FI = image (typique OL < RF)\r\n# Valeur insensible \u00E0 la casse. Toute autre valeur l\u00E8vera une exception.\r\nfrom: supradyne\r\n\r\n# === Table des puissances des spurious (optionnel) ===\r\n# Structure : liste de lignes (tableau 2D) ; chaque \u00E9l\u00E9ment est soit :\r\n#   - un nombre convertible en float (puissance en dBc)\r\n#   - une cha\u00EEne \'ref\' ou \'na\' (marqueur -> valeur non fournie)\r\n#\r\n# IMPORTANT : convention d\'indexation impl\u00E9ment\u00E9e dans get_puissance(m,n):\r\n#   - ligne index = abs(m) - 1          (donc la premi\u00E8re ligne correspond \u00E0 |m| == 1)\r\n#   - colonne index = abs(n)            (donc la premi\u00E8re colonne correspond \u00E0 n == 0)\r\n#\r\n# En cons\u00E9quence :\r\n#   - nombre de lignes requis >= m_max (puisque ligne index = abs(m)-1 -> m_max -> index m_max-1)\r\n#   - nombre de colonnes requis >= (n_max + 1) (puisque colonne 0 correspond \u00E0 n==0, et colonne n_max correspond \u00E0 |n|==n_max)\r\n#\r\n# Exemple pour m_max=2, n_max=5 :\r\n#   - lignes : au moins 2 (pour |m|=1 et |m|=2)\r\n#   - colonnes : au moins 6 (pour n = 0..5)\r\n#\r\n# Exemple de format (ici fourni tel que dans ton YAML d\'origine) :\r\npuissance_spurious:\r\n   - [-29, -ref, -23, -10, -21, -19]\r\n   - [-85, -61, -73, -65, -71, -69]\r\n   - [-84, -68, -88, -81, -87, -78]\r\n   - [-114, -109, -116, -115, -116, -115]\r\n   - [-119, -123, -128, -126, -127, -128]\r\n",
+  "code_py":"# -*- coding: utf-8 -*-\r\n\"\"\"\r\nScript d\'analyse rapide d\'une cha\u00EEne RF d\u00E9crite en YAML.\r\n- calcule NF total (Loi de Friis)\r\n- calcule OP1dB de sortie (combinaison en lin\u00E9aire)\r\n- affiche un r\u00E9sum\u00E9 color\u00E9 en console\r\n\r\nConventions attendues pour le YAML (exemple) :\r\narchitecture:\r\n  - name: \"LNA1\"\r\n    type: \"ampli\"\r\n    gain_dB: 15                 # gain nominal (dB)\r\n    gain_dB_max: 17             # (optionnel) gain max si different\r\n    nf_dB: 2.0                  # (optionnel) figure de bruit (dB)\r\n    op1db_dBm: 5                # (optionnel) OP1dB en dBm\r\n  - name: \"Filt1\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 2.5      # pour les filtres on fournit la perte (positive)\r\n    # ...\r\nAttention :\r\n- Les unit\u00E9s : gains et pertes en dB, NF en dB, OP1dB en dBm.\r\n- Le code convertit en lin\u00E9aire pour les calculs (rapports lin\u00E9aires, puissances en mW).\r\n- Valeurs manquantes ont des comportements par d\u00E9faut (voir build_chain).\r\n\"\"\"\r\n\r\nimport yaml\r\nimport math\r\nimport os\r\nimport numpy as np\r\nfrom colorama import init, Fore, Back, Style\r\n\r\ntry:\r\n    # chargeur YAML adoss\u00E9 \u00E0 libyaml (bien plus rapide), si PyYAML a \u00E9t\u00E9 compil\u00E9 avec\r\n    from yaml import CSafeLoader as SafeLoader\r\nexcept ImportError:\r\n    from yaml import SafeLoader\r\n\r\n# Active colorama (r\u00E9initialisation automatique des styles apr\u00E8s chaque print)\r\ninit(autoreset=True)\r\n\r\n# Couleurs pour affichage par type d\'\u00E9tage (simple mapping visuel)\r\n# - \'ampli\'  : rouge\r\n# - \'filter\' : cyan\r\n# - \'atten\'  : jaune\r\n# - \'switch\' : vert\r\n# - \'mixer\'  : magenta\r\nTYPE_COLORS = {\r\n    \'ampli\':   Fore.RED + Style.BRIGHT,\r\n    \'filter\':  Fore.CYAN + Style.BRIGHT,\r\n    \'atten\':   Fore.YELLOW + Style.BRIGHT,\r\n    \'switch\':  Fore.GREEN + Style.BRIGHT,\r\n    \'mixer\':   Fore.MAGENTA + Style.BRIGHT,\r\n}\r\n\r\n# ---------- Fonctions utilitaires (conversion dB <-> lin\u00E9aire) ----------\r\n\r\ndef db_to_lin(db):\r\n    \"\"\"\r\n    Convertit une valeur en dB vers une valeur lin\u00E9aire (facteur ou mW selon le contexte).\r\n    - entr\u00E9e : valeur en dB (ou dBm si contexte puissance)\r\n    - sortie : 10^(db\/10)\r\n\r\n    Exemple :\r\n      10 dB  -> 10\r\n      -3 dB  -> 0.5\r\n      0 dBm  -> 1 mW  (utilis\u00E9 pour convertir dBm -> mW)\r\n    Attention : appeler cette fonction sur des valeurs tr\u00E8s grandes (ex : 1000) produit des floats tr\u00E8s grands.\r\n    \"\"\"\r\n    return 10 ** (db \/ 10)\r\n\r\n\r\ndef lin_to_db(lin):\r\n    \"\"\"\r\n    Convertit une valeur lin\u00E9aire vers dB.\r\n    - si lin est un ratio (ex : gain lin\u00E9aire) la sortie est en dB.\r\n    - si lin est en mW, la sortie est en dBm (0 dBm => 1 mW).\r\n    Formule : 10 * log10(lin)\r\n    \"\"\"\r\n    return 10 * math.log10(lin)\r\n\r\n# ---------- Repr\u00E9sentation de la cha\u00EEne (tableau structur\u00E9 numpy) ----------\r\n\r\n# un \u00E9l\u00E9ment par \u00E9tage ; chaque champ (chain[\'gain_lin\'], ...) se lit comme un tableau\r\nCHAIN_DTYPE = np.dtype([\r\n    (\'gain_lin\', \'f8\'),\r\n    (\'nf_lin\', \'f8\'),\r\n    (\'p1db_lin\', \'f8\'),\r\n    (\'gain_dB\', \'f8\'),\r\n], align=True)\r\n\r\n# ---------- Calcul de la figure de bruit totale (Friis) ----------\r\n\r\ndef calc_nf(chain):\r\n    \"\"\"\r\n    Calcule la NF totale (en dB) d\'une cha\u00EEne donn\u00E9e.\r\n    Entr\u00E9e : chain = tableau de CHAIN_DTYPE, dont les champs :\r\n      - \'nf_lin\'   : NF en lin\u00E9aire (pas en dB)\r\n      - \'gain_lin\' : gain (lin\u00E9aire, ratio de puissance)\r\n    Algorithme : formule de Friis :\r\n      NF_tot_lin = NF1 + (NF2 - 1)\/G1 + (NF3 - 1)\/(G1*G2) + ...\r\n    Retour : NF totale en dB (utilise lin_to_db).\r\n    Remarque : la 1\u00E8re NF doit \u00EAtre en lin\u00E9aire et non nulle.\r\n    \"\"\"\r\n    # colonnes du tableau converties une fois en listes de floats Python (boucle courte)\r\n    gain_lin = chain[\'gain_lin\'].tolist()\r\n    nf_lin = chain[\'nf_lin\'].tolist()\r\n    # NF lin\u00E9aire du premier \u00E9tage\r\n    nf_tot = nf_lin[0]\r\n    # produit cumulatif des gains (lin\u00E9aire) des \u00E9tages d\u00E9j\u00E0 rencontr\u00E9s\r\n    g_prod = gain_lin[0]\r\n    # boucle sur les \u00E9tages suivants\r\n    for i in range(1, len(gain_lin)):\r\n        nf_tot += (nf_lin[i] - 1) \/ g_prod\r\n        g_prod *= gain_lin[i]\r\n    return lin_to_db(nf_tot)\r\n\r\n# ---------- Calcul de l\'OP1dB total en sortie ----------\r\n\r\ndef calc_p1db(chain):\r\n    \"\"\"\r\n    Calcule l\'OP1dB de sortie d\'une cha\u00EEne (en dBm).\r\n    M\u00E9thode :\r\n      - p1db_lin : OP1dB de chaque \u00E9tage en mW (lin\u00E9aire)\r\n      - gain_after[i] : produit des gains lin\u00E9aires des \u00E9tages plac\u00E9s APR\u00C8S l\'\u00E9tage i\r\n      - contribution d\'un \u00E9tage i au P1dB total (en mW) est P1dB_i * gain_after[i]\r\n      - on somme les inverses : 1 \/ P_total = sum_i 1\/(P1dB_i * gain_after[i])\r\n      - P_total (mW) = 1 \/ somme_inverse\r\n      - retour en dBm via lin_to_db (car lin_to_db( mW ) -> dBm)\r\n    Hypoth\u00E8ses \/ limites :\r\n      - un \u00E9tage sans OP1dB (p1db_lin = +inf) est non contraignant : il ne contribue pas \u00E0 la somme.\r\n      - si aucun \u00E9tage n\'a d\'OP1dB, le r\u00E9sultat est +inf.\r\n      - si un p1db_lin est nul, cela l\u00E8vera une erreur.\r\n      - s\'assurer que gains et p1db sont en lin\u00E9aire avant l\'appel.\r\n    \"\"\"\r\n    gain_lin = chain[\'gain_lin\'].tolist()\r\n    p1db_lin = chain[\'p1db_lin\'].tolist()\r\n    # une seule passe en sens inverse : g_after = produit(gain_k pour k>i), mis \u00E0 jour\r\n    # apr\u00E8s la contribution de l\'\u00E9tage i (pas de tableau gain_after interm\u00E9diaire)\r\n    g_after = 1.0\r\n    inv_sum = 0.0\r\n    for i in range(len(gain_lin) - 1, -1, -1):\r\n        if math.isfinite(p1db_lin[i]):\r\n            inv_sum += 1 \/ (p1db_lin[i] * g_after)\r\n        g_after *= gain_lin[i]\r\n    if inv_sum == 0:\r\n        return math.inf\r\n    # r\u00E9sultat en mW -> lin_to_db retourne dBm\r\n    return lin_to_db(1 \/ inv_sum)\r\n\r\n# ---------- Construction de la cha\u00EEne RF depuis le YAML ----------\r\n\r\ndef build_chain(arch, use_gain_max=False):\r\n    \"\"\"\r\n    Transforme la description YAML (valeurs en dB\/dBm) en une liste d\'\u00E9tages avec valeurs lin\u00E9aires.\r\n    Param\u00E8tres :\r\n      - arch : liste d\'\u00E9l\u00E9ments YAML d\u00E9crivant chaque composant\r\n      - use_gain_max : si True, pr\u00E9f\u00E8re \'gain_dB_max\' si pr\u00E9sent, sinon \'gain_dB\'\r\n\r\n    Comportements particuliers :\r\n      - Pour les filtres et switches, on consid\u00E8re que la NF (en dB) = perte d\'insertion (insertion_loss_dB).\r\n        => gain_dB = - insertion_loss_dB  (car perte)\r\n      - Si nf_dB absent pour un amplificateur, on prend nf_dB = |gain_dB| (approximation conservative)\r\n      - Si op1db_dBm absent, p1db_lin = +inf : l\'\u00E9tage est non contraignant et explicitement\r\n        exclu du calcul d\'OP1dB (pas de valeur sentinelle type 1000 dBm -> 1e100 mW)\r\n    Retour :\r\n      tableau numpy de CHAIN_DTYPE (un \u00E9l\u00E9ment par \u00E9tage, dans l\'ordre de arch) :\r\n      - gain_lin : facteur (unitless)\r\n      - nf_lin   : ratio lin\u00E9aire (>1)\r\n      - p1db_lin : puissance en mW (lin\u00E9aire), +inf si op1db_dBm absent\r\n      - gain_dB  : gain en dB (conserv\u00E9 pour sommer les gains sans aller-retour lin\u00E9aire)\r\n      (noms et types restent dans arch)\r\n    \"\"\"\r\n    chain = np.empty(len(arch), dtype=CHAIN_DTYPE)\r\n    for i, c in enumerate(arch):\r\n        # si composant passif de filtrage => perte fournie\r\n        if c[\'type\'] in [\'filter\', \'switch\']:\r\n            loss = c[\'insertion_loss_dB\']  # valeur positive (dB)\r\n            gain_dB = -loss                 # gain = -perte\r\n            nf_dB = loss                    # NF d\'un passif = perte d\'insertion\r\n        else:\r\n            # choisir gain nominal ou gain max selon le mode\r\n            gain_dB = c.get(\'gain_dB_max\', c[\'gain_dB\']) if use_gain_max else c[\'gain_dB\']\r\n            # NF fourni ou estimation conservatrice (abs(gain_dB))\r\n            nf_dB = c.get(\'nf_dB\', abs(gain_dB))\r\n\r\n        # OP1dB : si pr\u00E9sent, valeur en dBm ; sinon +inf (non contraignant, masqu\u00E9 dans calc_p1db)\r\n        p1dB = c.get(\'op1db_dBm\')\r\n\r\n        chain[i] = (\r\n            db_to_lin(gain_dB),\r\n            db_to_lin(nf_dB),\r\n            db_to_lin(p1dB) if p1dB is not None else math.inf,\r\n            gain_dB\r\n        )\r\n    return chain\r\n\r\n# ---------- Fonctions d\'affichage console (color\u00E9es) ----------\r\n\r\ndef print_header(title):\r\n    \"\"\"\r\n    Print d\'un en-t\u00EAte simple (fond noir + texte blanc).\r\n    \"\"\"\r\n    print(Back.BLACK + Fore.WHITE + f\"  {title}  \" + Style.RESET_ALL)\r\n\r\n\r\ndef print_section(title, value, unit, color=Fore.WHITE):\r\n    \"\"\"\r\n    Affiche une ligne de synth\u00E8se format\u00E9e.\r\n    Exemple :\r\n      \u25A0\u25A0 Gain total   : 10.00 dB\r\n    - title : texte court\r\n    - value : valeur num\u00E9rique\r\n    - unit  : unit\u00E9 en texte (ex: \"dB\", \"dBm\")\r\n    - color : couleur (optionnel)\r\n    \"\"\"\r\n    bar = \'\u25A0\' * 3\r\n    print(f\"{color}{bar} {title:<15}: {value:>6.2f} {unit}{Style.RESET_ALL}\")\r\n\r\n\r\ndef print_spacers():\r\n    \"\"\"\r\n    Ligne de s\u00E9paration visuelle.\r\n    \"\"\"\r\n    print(\"_\" * 60 + \"\\n\")\r\n\r\n# ---------- Main \/ point d\'entr\u00E9e ----------\r\n\r\ndef main():\r\n    \"\"\"\r\n    Flux principal :\r\n    - charge YAML param.yaml situ\u00E9 dans le m\u00EAme dossier que ce script\r\n    - construit deux cha\u00EEnes (mode min \/ mode max si gain_dB_max fourni)\r\n    - calcule : NF total (min\/max), OP1dB sortie (min\/max), gains totaux (min\/max), IP1dB entr\u00E9e\r\n    - affiche le tout\r\n    \"\"\"\r\n    # chemin vers param.yaml dans le m\u00EAme dossier que ce script\r\n    base = os.path.dirname(os.path.abspath(__file__))\r\n    path = os.path.join(base, \"param.yaml\")\r\n    yaml_filename = os.path.basename(path)\r\n    print(f\"Fichier YAML ex\u00E9cut\u00E9 : {Fore.CYAN}{yaml_filename}{Style.RESET_ALL}\")\r\n\r\n    # chargement YAML\r\n    with open(path, \'r\') as f:\r\n        data = yaml.load(f, Loader=SafeLoader)\r\n    arch = data[\'architecture\']\r\n\r\n    # construire cha\u00EEnes min \/ max\r\n    ch_min = build_chain(arch, use_gain_max=False)\r\n    ch_max = build_chain(arch, use_gain_max=True)\r\n\r\n    # calculs principaux\r\n    nf_min, nf_max = calc_nf(ch_min), calc_nf(ch_max)\r\n    p1_min, p1_max = calc_p1db(ch_min), calc_p1db(ch_max)\r\n\r\n    # gains totaux (dB) : somme directe des gains en dB (\u00E9quivalent au produit en lin\u00E9aire)\r\n    g_min = float(ch_min[\'gain_dB\'].sum())\r\n    g_max = float(ch_max[\'gain_dB\'].sum())\r\n\r\n    # IP1dB entr\u00E9e = OP1dB_sortie - Gain_total\r\n    ip1_min, ip1_max = p1_min - g_min, p1_max - g_max\r\n\r\n    # affichage cha\u00EEne (avec couleurs par type)\r\n    line = \" \u2192 \".join(f\"{TYPE_COLORS.get(c[\'type\'], \'\')}{c[\'name\']}{Style.RESET_ALL}\" for c in arch)\r\n\r\n    print_spacers()\r\n    print(f\"{Back.BLACK+Fore.WHITE}{\'\u25A0\'*3} {\'Cha\u00EEne RF\':<8}:{Style.RESET_ALL} {line}\\n\")\r\n    print_spacers()\r\n\r\n    # r\u00E9sultats\r\n    print(f\"{Back.BLACK+Fore.WHITE} R\u00E9sultats (min & max):{Style.RESET_ALL}\\n\")\r\n    # Gains\r\n    print_section(\"Gain total (min)   \", g_min, \"dB\")\r\n    print_section(\"Gain total (max)  \", g_max, \"dB\")\r\n    print()\r\n    # NF\r\n    print_section(\"NF total (min)     \", nf_min, \"dB\")\r\n    print_section(\"NF total (max)     \", nf_max, \"dB\")\r\n    print()\r\n    # OP1dB sortie\r\n    print_section(\"OP1dB sortie (min) \", p1_min, \"dBm\")\r\n    print_section(\"OP1dB sortie (max) \", p1_max, \"dBm\")\r\n    print()\r\n    # IP1dB entr\u00E9e\r\n    print_section(\"IP1dB entr\u00E9e (min) \", ip1_min, \"dBm\")\r\n    print_section(\"IP1dB entr\u00E9e (max) \", ip1_max, \"dBm\")\r\n    print_spacers()\r\n\r\n# Ex\u00E9cution quand lanc\u00E9 directement\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
+  "code_yaml":"# Fichier YAML d\'architecture pour le script d\'analyse (param.yaml)\r\n# Format attendu : racine \"architecture\" = liste d\'\u00E9tages dans l\'ordre du parcours du signal.\r\n# Chaque entr\u00E9e repr\u00E9sente un composant\/\u00E9tage. Les champs utilis\u00E9s par le script :\r\n#   - name:           nom (cha\u00EEne)\r\n#   - type:           \'ampli\' | \'filter\' | \'atten\' | \'switch\' | \'mixer\'\r\n#   - gain_dB:        gain en dB (pour les amplis) OR gain n\u00E9gatif pour att\u00E9nuateur\r\n#   - gain_dB_max:    (optionnel) gain max si disponible (permet mode \"max\")\r\n#   - insertion_loss_dB: (pour filter\/switch) perte positive en dB\r\n#   - nf_dB:          figure de bruit en dB (pour amplis\/mixers) \u2014 si absent, on estime\r\n#   - op1db_dBm:      OP1dB en dBm (output 1 dB compression point)\r\n#\r\n# IMPORTANTS :\r\n# - Toutes les puissances\/gains\/pertes sont en dB ou dBm (unit\u00E9s strictes).\r\n# - Pour les filtres\/switch, insertion_loss_dB doit \u00EAtre positive (ex : 1.2 dB).\r\n# - Pour les att\u00E9nuateurs : gain_dB doit \u00EAtre n\u00E9gatif (ex : -30).\r\n# - Si une cl\u00E9 manquante existe, le script applique des valeurs par d\u00E9faut (v\u00E9rifier build_chain).\r\n# - Eviter d\'utiliser des valeurs extr\u00EAmes (ex : op1db_dBm = 1000), le script en fera un nombre lin\u00E9aire \u00E9norme.\r\n\r\narchitecture:\r\n\r\n  # ---------------------------\r\n  # Filtre passe-haut centr\u00E9 sur FI (exemple)\r\n  # - type: filter => script lit insertion_loss_dB (positif)\r\n  # - NF du passif = insertion_loss_dB (convention physique)\r\n  # - op1db_dBm renseign\u00E9 pour tra\u00E7abilit\u00E9 (valeur d\'usage)\r\n  # ---------------------------\r\n  - name: \"HPF_4GHz\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.61      # perte d\'insertion (dB). Doit \u00EAtre positive.\r\n    op1db_dBm: 20               # OP1dB du bloc (dBm) \u2014 utile pour calculs de cha\u00EEne\r\n\r\n  # ---------------------------\r\n  # Switch RF ; trait\u00E9 comme un passif (insertion_loss_dB)\r\n  # - type: switch => insertion_loss_dB positive\r\n  # - op1db_dBm : tenue en puissance \/ saturation (dBm)\r\n  # ---------------------------\r\n  - name: \"Switch\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 0.85\r\n    op1db_dBm: 25\r\n\r\n  # Pr\u00E9-filtre passe-haut (pr\u00E9-s\u00E9lection)\r\n  - name: \"Pre-HPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1.179\r\n    op1db_dBm: 20\r\n\r\n  # Pr\u00E9-filtre passe-bas (pr\u00E9-s\u00E9lection)\r\n  - name: \"Pre-LPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.819\r\n    op1db_dBm: 20\r\n\r\n  # autre switch (ex : routage vers banque de filtres)\r\n  - name: \"Switch\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 0.85\r\n    op1db_dBm: 25\r\n\r\n  # ---------------------------\r\n  # Amplificateur faible bruit (LNA1)\r\n  # - type: ampli => fournir gain_dB et nf_dB\r\n  # - op1db_dBm : OP1dB de sortie (dBm)\r\n  # ---------------------------\r\n  - name: \"LNA1\"\r\n    type: \"ampli\"\r\n    gain_dB: 15.3                # gain nominal en dB\r\n    nf_dB: 3.5                   # figure de bruit en dB\r\n    op1db_dBm: 23.94             # OP1dB sortie (dBm)\r\n\r\n  # ---------------------------\r\n  # Att\u00E9nuateur variable simul\u00E9 par entr\u00E9e param\u00E9tr\u00E9e\r\n  # - type: atten => gain_dB n\u00E9gatif\r\n  # - gain_dB_max : utile si l\'att\u00E9nuateur peut \u00EAtre r\u00E9duit (ex : -5 dB en position minimale)\r\n  # ---------------------------\r\n  - name: \"ATT_30dB\"\r\n    type: \"atten\"\r\n    gain_dB: -30                 # position nominale (dB) -> valeur n\u00E9gative\r\n    gain_dB_max: -5              # meilleur cas (moins d\'att\u00E9nuation)\r\n    op1db_dBm: 20\r\n\r\n  # Deuxi\u00E8me LNA (apr\u00E8s att\u00E9nuateur)\r\n  - name: \"LNA2\"\r\n    type: \"ampli\"\r\n    gain_dB: 15.3\r\n    nf_dB: 3.5\r\n    op1db_dBm: 23.94\r\n\r\n  # ---------------------------\r\n  # Filtre image (pr\u00E9-s\u00E9lection) : valeurs typiques de perte fournies\r\n  # - insertion_loss_dB : perte dans la bande passante (dB)\r\n  # - op1db_dBm : tenue en puissance\r\n  # ---------------------------\r\n  - name: \"ImageFilter\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 8.7\r\n    op1db_dBm: 17.35\r\n\r\n  # Att\u00E9nuateur fixe 3 dB devant le mixer\r\n  - name: \"ATT-3dB\"\r\n    type: \"atten\"\r\n    gain_dB: -3\r\n    gain_dB_max: -3\r\n    op1db_dBm: 20\r\n\r\n  # ---------------------------\r\n  # Mixer : conversion loss (gain_dB n\u00E9gatif), NF approximatif\r\n  # - gain_dB : conversion loss (dB)\r\n  # - nf_dB : estimation de la contribution du mixer (dB)\r\n  # - op1db_dBm : OP1dB d\'entr\u00E9e ou de sortie selon la doc (ici consid\u00E9r\u00E9 comme sortie)\r\n  # ---------------------------\r\n  - name: \"Mixer\"\r\n    type: \"mixer\"\r\n    gain_dB: -6.83               # perte de conversion (dB) \u2014 valeur n\u00E9gative attendue\r\n    nf_dB: 7.5                   # figure de bruit indicative pour le mixeur (dB)\r\n    op1db_dBm: 14\r\n\r\n  # Filtre OL (passif)\r\n  - name: \"OL_Filter\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 0.67\r\n    op1db_dBm: 20\r\n\r\n  # LNA apr\u00E8s FI (gain \u00E9lev\u00E9 pour compenser pertes)\r\n  - name: \"LNA3\"\r\n    type: \"ampli\"\r\n    gain_dB: 22.5\r\n    nf_dB: 2.5\r\n    op1db_dBm: 22\r\n\r\n  # Autre att\u00E9nuateur (positionnement \/ contr\u00F4le)\r\n  - name: \"ATT_30dB\"\r\n    type: \"atten\"\r\n    gain_dB: -30\r\n    gain_dB_max: -12\r\n    op1db_dBm: 20\r\n\r\n  # Equalizer \/ switch (passif)\r\n  - name: \"Equalizer\"\r\n    type: \"switch\"\r\n    insertion_loss_dB: 2\r\n    op1db_dBm: 25\r\n\r\n  # LNA final\r\n  - name: \"LNA4\"\r\n    type: \"ampli\"\r\n    gain_dB: 20.5\r\n    nf_dB: 2.5\r\n    op1db_dBm: 31.7\r\n\r\n  # Briques du filtre FI (500 MHz BW) - passe-haut et passe-bas pour former le BPF\r\n  - name: \"500MHz-HPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1\r\n    op1db_dBm: 23\r\n\r\n  - name: \"500MHz-LPF\"\r\n    type: \"filter\"\r\n    insertion_loss_dB: 1\r\n    op1db_dBm: 23\r\n\r\n# ---------------------------\r\n# Notes g\u00E9n\u00E9rales et conseils pratiques (ne pas oublier) :\r\n# - V\u00E9rifier que les champs obligatoires existent pour chaque type.\r\n#   * filter\/switch : insertion_loss_dB obligatoire.\r\n#   * ampli\/mixer : gain_dB obligatoire ; nf_dB fortement recommand\u00E9.\r\n#   * atten  : gain_dB n\u00E9gatif obligatoire.\r\n# - Un OP1dB manquant dans le YAML rend l\'\u00E9tage non contraignant (OP1dB infini, exclu du calcul).\r\n#   Mieux vaut renseigner syst\u00E9matiquement op1db_dBm.\r\n# - Pour les filtres passifs, NF = insertion_loss_dB (en dB) est la convention utilis\u00E9e ici.\r\n# - Eviter d\'utiliser le m\u00EAme \"name\" plusieurs fois si l\'on veut les distinguer (bien que ce soit accept\u00E9).\r\n# - Les valeurs fournies ici sont des exemples\/mesures : adapter selon les datasheets des composants r\u00E9els.\r\n# - Si le script doit mod\u00E9liser des \u00E9l\u00E9ments variables (ex : att\u00E9nuateur r\u00E9glable, filtre accordable),\r\n#   utiliser gain_dB_max\/gain_dB comme fourchette et lancer le script en mode use_gain_max=True pour l\'\u00E9tudier.\r\n#\r\n# Suggestions d\'am\u00E9lioration :\r\n# - ajouter une cl\u00E9 \"comment\" ou \"ref\" pour lier l\'entr\u00E9e YAML \u00E0 la r\u00E9f\u00E9rence du composant (r\u00E9f\u00E9rence fournisseur).\r\n# - ajouter \"freq_range: [f_min_MHz, f_max_MHz]\" pour caract\u00E9riser la bande d\'op\u00E9ration d\'un composant.\r\n# - valider le YAML \u00E0 l\'ouverture et refuser les valeurs absurdes (ex : op1db_dBm > 50 dBm ou insertion_loss < 0).\r\n",
   "code_path": "files/code/Architecture_verif/Architecture_verif.py",
   "yaml_path": "files/code/Architecture_verif/param.yaml"
 },
@@ -65,7 +65,7 @@ window.DOWNLOADS = [
   "version": "code",
   "size_bytes": 3000,
   "description": "Calcul le SFDR en fonction de la fréquence, BP, Gain, NF et IP1dB.",
-  "code_py":"import yaml\r\nimport math\r\n\r\n# -----------------------------------------------------------\r\n# Calcule la puissance de bruit int\u00E9gr\u00E9e dans une bande donn\u00E9e\r\n# -----------------------------------------------------------\r\ndef noise_power_dBm(bw_hz: float, nf_db: float) -> float:\r\n    \"\"\"\r\n    Puissance de bruit thermique int\u00E9gr\u00E9e dans la bande,\r\n    exprim\u00E9e en dBm.\r\n    Formule : -174 dBm\/Hz + 10*log10(BW) + NF\r\n    \"\"\"\r\n    return -174 + 10 * math.log10(bw_hz) + nf_db\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Estimation de l\u2019IIP3 \u00E0 partir du point de compression 1 dB\r\n# -----------------------------------------------------------\r\ndef estimate_iip3_dbm(ip1db_dbm: float, delta_db: float = 10.0) -> float:\r\n    \"\"\"\r\n    Approximation empirique :\r\n    IIP3 \u2248 IP1dB + \u0394 (par d\u00E9faut \u0394 = 10 dB)\r\n    \"\"\"\r\n    return ip1db_dbm + delta_db\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Calcule le SFDR \u00E0 partir de IP1dB, NF et bande passante\r\n# -----------------------------------------------------------\r\ndef calculate_sfdr(ip1db_dbm: float, nf_db: float, bw_hz: float,\r\n                   delta_db: float = 10.0) -> float:\r\n    \"\"\"\r\n    SFDR (Spurious-Free Dynamic Range), exprim\u00E9 en dB.\r\n    Formule utilis\u00E9e :\r\n        SFDR = (2\/3) * (IIP3 - N)\r\n    o\u00F9 :\r\n        - IIP3 est estim\u00E9 \u00E0 partir de IP1dB\r\n        - N est la puissance de bruit dans la bande\r\n    \"\"\"\r\n    iip3 = estimate_iip3_dbm(ip1db_dbm, delta_db)\r\n    noise = noise_power_dBm(bw_hz, nf_db)\r\n    return (2.0 \/ 3.0) * (iip3 - noise)\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Fonction principale : lecture des param\u00E8tres et affichage\r\n# -----------------------------------------------------------\r\ndef main():\r\n    # Ouverture du fichier YAML contenant les param\u00E8tres\r\n    with open(\"params.yaml\", \"r\") as f:\r\n        data = yaml.safe_load(f)\r\n\r\n    # Bande passante extraite du fichier\r\n    bw = data[\"bandwidth_hz\"]\r\n    print(f\"Bande passante : {bw\/1e6:.1f} MHz\\n\")\r\n\r\n    # En-t\u00EAte du tableau affich\u00E9\r\n    print(f\"{\'Freq (GHz)\':>8} {\'SFDR min (dB)\':>14} {\'SFDR max (dB)\':>14}\")\r\n\r\n    # Parcours de chaque fr\u00E9quence d\u00E9finie dans le YAML\r\n    for f in data[\"frequencies\"]:\r\n        freq      = f[\"freq_ghz\"]\r\n        nf_min    = f[\"nf_gain_min\"]   # \u2190 ATTENTION : v\u00E9rifier que ce champ est bien une NF\r\n        nf_max    = f[\"nf_gain_max\"]\r\n        ip1_min   = f[\"ip1db_min\"]\r\n        ip1_max   = f[\"ip1db_max\"]\r\n\r\n        # Calcul SFDR avec les valeurs min et max\r\n        sfdr_min  = calculate_sfdr(ip1_min, nf_min, bw)\r\n        sfdr_max  = calculate_sfdr(ip1_max, nf_max, bw)\r\n\r\n        # Affichage format\u00E9\r\n        print(f\"{freq:8.2f} {sfdr_min:14.2f} {sfdr_max:14.2f}\")\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Point d\u2019entr\u00E9e du script\r\n# -----------------------------------------------------------\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
+  "code_py":"import yaml\r\nimport math\r\nimport numpy as np\r\n\r\ntry:\r\n    # chargeur YAML adoss\u00E9 \u00E0 libyaml (bien plus rapide), si PyYAML a \u00E9t\u00E9 compil\u00E9 avec\r\n    from yaml import CSafeLoader as SafeLoader\r\nexcept ImportError:\r\n    from yaml import SafeLoader\r\n\r\n# -----------------------------------------------------------\r\n# Calcule la puissance de bruit int\u00E9gr\u00E9e dans une bande donn\u00E9e\r\n# -----------------------------------------------------------\r\ndef noise_power_dBm(bw_hz: float, nf_db: float) -> float:\r\n    \"\"\"\r\n    Puissance de bruit thermique int\u00E9gr\u00E9e dans la bande,\r\n    exprim\u00E9e en dBm.\r\n    Formule : -174 dBm\/Hz + 10*log10(BW) + NF\r\n    \"\"\"\r\n    return -174 + 10 * math.log10(bw_hz) + nf_db\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Estimation de l\u2019IIP3 \u00E0 partir du point de compression 1 dB\r\n# -----------------------------------------------------------\r\ndef estimate_iip3_dbm(ip1db_dbm: float, delta_db: float = 10.0) -> float:\r\n    \"\"\"\r\n    Approximation empirique :\r\n    IIP3 \u2248 IP1dB + \u0394 (par d\u00E9faut \u0394 = 10 dB)\r\n    \"\"\"\r\n    return ip1db_dbm + delta_db\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Calcule le SFDR \u00E0 partir de IP1dB, NF et bande passante\r\n# -----------------------------------------------------------\r\ndef calculate_sfdr(ip1db_dbm: float, nf_db: float, bw_hz: float,\r\n                   delta_db: float = 10.0) -> float:\r\n    \"\"\"\r\n    SFDR (Spurious-Free Dynamic Range), exprim\u00E9 en dB.\r\n    ip1db_dbm et nf_db peuvent \u00EAtre des tableaux numpy (une valeur par fr\u00E9quence) :\r\n    le calcul est alors fait en une passe pour toutes les fr\u00E9quences.\r\n    Formule utilis\u00E9e :\r\n        SFDR = (2\/3) * (IIP3 - N)\r\n    o\u00F9 :\r\n        - IIP3 est estim\u00E9 \u00E0 partir de IP1dB\r\n        - N est la puissance de bruit dans la bande\r\n    \"\"\"\r\n    iip3 = estimate_iip3_dbm(ip1db_dbm, delta_db)\r\n    noise = noise_power_dBm(bw_hz, nf_db)\r\n    return (2.0 \/ 3.0) * (iip3 - noise)\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Fonction principale : lecture des param\u00E8tres et affichage\r\n# -----------------------------------------------------------\r\ndef main():\r\n    # Ouverture du fichier YAML contenant les param\u00E8tres\r\n    with open(\"params.yaml\", \"r\") as f:\r\n        data = yaml.load(f, Loader=SafeLoader)\r\n\r\n    # Bande passante extraite du fichier\r\n    bw = data[\"bandwidth_hz\"]\r\n    print(f\"Bande passante : {bw\/1e6:.1f} MHz\\n\")\r\n\r\n    # En-t\u00EAte du tableau affich\u00E9\r\n    print(f\"{\'Freq (GHz)\':>8} {\'SFDR min (dB)\':>14} {\'SFDR max (dB)\':>14}\")\r\n\r\n    # Colonnes des fr\u00E9quences d\u00E9finies dans le YAML (un tableau par champ)\r\n    freqs     = data[\"frequencies\"]\r\n    freq      = np.array([f[\"freq_ghz\"] for f in freqs], dtype=float)\r\n    nf_min    = np.array([f[\"nf_gain_min\"] for f in freqs], dtype=float)   # \u2190 ATTENTION : v\u00E9rifier que ce champ est bien une NF\r\n    nf_max    = np.array([f[\"nf_gain_max\"] for f in freqs], dtype=float)\r\n    ip1_min   = np.array([f[\"ip1db_min\"] for f in freqs], dtype=float)\r\n    ip1_max   = np.array([f[\"ip1db_max\"] for f in freqs], dtype=float)\r\n\r\n    # Calcul SFDR avec les valeurs min et max, pour toutes les fr\u00E9quences \u00E0 la fois\r\n    sfdr_min  = calculate_sfdr(ip1_min, nf_min, bw)\r\n    sfdr_max  = calculate_sfdr(ip1_max, nf_max, bw)\r\n\r\n    # Affichage format\u00E9\r\n    for f, s_min, s_max in zip(freq.tolist(), sfdr_min.tolist(), sfdr_max.tolist()):\r\n        print(f\"{f:8.2f} {s_min:14.2f} {s_max:14.2f}\")\r\n\r\n\r\n# -----------------------------------------------------------\r\n# Point d\u2019entr\u00E9e du script\r\n# -----------------------------------------------------------\r\nif __name__ == \"__main__\":\r\n    main()\r\n",
   "code_yaml": "# Bande passante de la cha\u00EEne consid\u00E9r\u00E9e (en Hz)\r\n# Ici : 500 MHz\r\nbandwidth_hz: 500000000  \r\n\r\n# Liste des fr\u00E9quences \u00E0 \u00E9valuer (en GHz)\r\nfrequencies:\r\n  - freq_ghz: 6          # Fr\u00E9quence centrale : 6 GHz\r\n\r\n    # Gain du r\u00E9cepteur (ou cha\u00EEne RF) en dB\r\n    # bornes min et max pour repr\u00E9senter la variation du composant\r\n    gain_min: 17.77      # Gain minimum mesur\u00E9\/attendu\r\n    gain_max: 25.95      # Gain maximum mesur\u00E9\/attendu\r\n\r\n    # Bruit \u00E9quivalent en entr\u00E9e (NF = Noise Figure), en dB\r\n    # Attention : dans ton script, c\u2019est \"nf_gain_min\/max\" qui est lu.\r\n    nf_gain_min: 11.12   # Valeur pessimiste de NF\r\n    nf_gain_max: 13.24   # Valeur optimiste de NF\r\n\r\n    # Point de compression \u00E0 1 dB (IP1dB), en dBm\r\n    # L\u00E0 encore bornes min et max car d\u00E9pend des conditions.\r\n    ip1db_min: -10.64    # IP1dB minimum (pire cas)\r\n    ip1db_max: -5.39     # IP1dB maximum (meilleur cas)\r\n", 
   "code_path": "files/code/SFDR_calculator/SFDR_calculator.py",
   "yaml_path": "files/code/SFDR_calculator/params.yaml"
@@ -127,7 +127,7 @@ window.DOWNLOADS = [
   "size_bytes": 2000,
   liens: "pages/s2p_to_dB.html",
   "description": "Convertion S2P real imag en dB",
-  "code_py":"import numpy as np\r\nimport os\r\n\r\ndef convert_s2p_to_two_dat_files(s2p_path):\r\n    \"\"\"\r\n    Convertit un fichier Touchstone (.s2p) contenant des param\u00E8tres S\r\n    en deux fichiers texte s\u00E9par\u00E9s (.dat) : un pour S11(dB), un pour S21(dB).\r\n\r\n    Entr\u00E9e :\r\n        s2p_path : chemin du fichier .s2p\r\n\r\n    Sorties :\r\n        - <nom>_S11.dat\r\n        - <nom>_S21.dat\r\n    \"\"\"\r\n\r\n    # Listes pour stocker les fr\u00E9quences et les valeurs S11 \/ S21 en dB\r\n    freqs = []\r\n    s11_db = []\r\n    s21_db = []\r\n\r\n    # Lecture ligne par ligne du fichier .s2p\r\n    with open(s2p_path, \'r\') as f:\r\n        for line in f:\r\n            line = line.strip()\r\n\r\n            # Ignore les commentaires (lignes commen\u00E7ant par \"#\")\r\n            # et les lignes vides\r\n            if line.startswith(\'#\') or not line:\r\n                continue\r\n\r\n            # D\u00E9coupe la ligne en colonnes\r\n            parts = line.split()\r\n            # Il faut au moins : freq, Re(S11), Im(S11), Re(S21), Im(S21)\r\n            if len(parts) < 5:\r\n                continue\r\n\r\n            # R\u00E9cup\u00E9ration de la fr\u00E9quence (en Hz)\r\n            freq = float(parts[0])\r\n\r\n            # Parties r\u00E9elles et imaginaires de S11 et S21\r\n            s11_real, s11_imag = float(parts[1]), float(parts[2])\r\n            s21_real, s21_imag = float(parts[3]), float(parts[4])\r\n\r\n            # Calcul du module (magnitude) complexe\r\n            s11_mag = np.abs(complex(s11_real, s11_imag))\r\n            s21_mag = np.abs(complex(s21_real, s21_imag))\r\n\r\n            # Conversion en dB (20*log10(|Sij|))\r\n            # Si module nul, on met une valeur arbitraire -100 dB\r\n            s11_db_val = 20 * np.log10(s11_mag) if s11_mag > 0 else -100\r\n            s21_db_val = 20 * np.log10(s21_mag) if s21_mag > 0 else -100\r\n\r\n            # Stockage des r\u00E9sultats\r\n            freqs.append(freq)\r\n            s11_db.append(s11_db_val)\r\n            s21_db.append(s21_db_val)\r\n\r\n    # Pr\u00E9pare les chemins des fichiers de sortie\r\n    base_name = os.path.splitext(s2p_path)[0]\r\n    s11_path = base_name + \"_S11.dat\"\r\n    s21_path = base_name + \"_S21.dat\"\r\n\r\n    # \u00C9criture du fichier contenant S11(f)\r\n    with open(s11_path, \'w\') as f_s11:\r\n        f_s11.write(\"# Frequency(Hz)\\tS11(dB)\\n\")\r\n        for f, s11 in zip(freqs, s11_db):\r\n            f_s11.write(f\"{f:.0f}\\t{s11:.2f}\\n\")\r\n\r\n    # \u00C9criture du fichier contenant S21(f)\r\n    with open(s21_path, \'w\') as f_s21:\r\n        f_s21.write(\"# Frequency(Hz)\\tS21(dB)\\n\")\r\n        for f, s21 in zip(freqs, s21_db):\r\n            f_s21.write(f\"{f:.0f}\\t{s21:.2f}\\n\")\r\n\r\n    # Message de succ\u00E8s\r\n    print(f\"\u2705 Fichiers cr\u00E9\u00E9s :\\n - {s11_path}\\n - {s21_path}\")\r\n\r\n\r\n# Exemple d\u2019utilisation\r\ns2p_file = \"C:\/Users\/a942666\/OneDrive - ATOS\/Bureau\/bank_18_24\/LFCV-2302+_Plus25DegC.s2p\"\r\nconvert_s2p_to_two_dat_files(s2p_file)\r\n",
+  "code_py":"import numpy as np\r\nimport os\r\nimport glob\r\nfrom concurrent.futures import ProcessPoolExecutor\r\n\r\n# Format d\'une ligne des fichiers .dat : fr\u00E9quence (Hz, enti\u00E8re) <tab> module (dB, 2 d\u00E9cimales)\r\nDAT_FMT = \"%.0f\\t%.2f\"\r\n\r\ndef lignes_de_donnees(f):\r\n    # Lignes ayant au moins 5 champs hors commentaire (freq, S11, S21) ; les autres sont ignor\u00E9es\r\n    for line in f:\r\n        if len(line.split(\'!\', 1)[0].split(\'#\', 1)[0].split()) >= 5:\r\n            yield line\r\n\r\ndef convert_s2p_to_two_dat_files(s2p_path):\r\n    # Lecture de tout le fichier en une fois : commentaires (\'#\' options, \'!\' Touchstone) ignor\u00E9s,\r\n    # colonnes freq, Re\/Im S11, Re\/Im S21 (les colonnes S12\/S22 \u00E9ventuelles ne sont pas lues)\r\n    with open(s2p_path, \'r\') as f:\r\n        data = np.loadtxt(lignes_de_donnees(f), comments=(\'#\', \'!\'), usecols=range(5), ndmin=2)\r\n\r\n    freqs = data[:, 0]\r\n    # magnitudes |Re + j.Im| directement par hypot (sans tableau complexe interm\u00E9diaire)\r\n    s11_mag = np.hypot(data[:, 1], data[:, 2])\r\n    s21_mag = np.hypot(data[:, 3], data[:, 4])\r\n\r\n    # -100 dB pour une magnitude nulle (\u00E9vite log10(0))\r\n    with np.errstate(divide=\'ignore\'):\r\n        s11_db = np.where(s11_mag > 0, 20 * np.log10(s11_mag), -100)\r\n        s21_db = np.where(s21_mag > 0, 20 * np.log10(s21_mag), -100)\r\n\r\n    # Pr\u00E9paration des noms de fichiers\r\n    base_name = os.path.splitext(s2p_path)[0]\r\n    s11_path = base_name + \"_S11.dat\"\r\n    s21_path = base_name + \"_S21.dat\"\r\n\r\n    # \u00C9criture des fichiers S11 et S21\r\n    np.savetxt(s11_path, np.column_stack((freqs, s11_db)), fmt=DAT_FMT,\r\n               header=\"Frequency(Hz)\\tS11(dB)\", comments=\"# \")\r\n    np.savetxt(s21_path, np.column_stack((freqs, s21_db)), fmt=DAT_FMT,\r\n               header=\"Frequency(Hz)\\tS21(dB)\", comments=\"# \")\r\n\r\n    print(f\"\u2705 Fichiers cr\u00E9\u00E9s :\\n - {s11_path}\\n - {s21_path}\")\r\n\r\ndef convert_batch(s2p_paths, max_workers=None):\r\n    # Conversion de plusieurs fichiers .s2p en parall\u00E8le (un processus par fichier, ind\u00E9pendants).\r\n    # max_workers=None : autant de processus que de c\u0153urs\r\n    with ProcessPoolExecutor(max_workers=max_workers) as executor:\r\n        # list() : attend la fin de toutes les conversions et remonte une \u00E9ventuelle erreur\r\n        list(executor.map(convert_s2p_to_two_dat_files, s2p_paths))\r\n\r\n# Utilisation (prot\u00E9g\u00E9e par __main__ : indispensable avec ProcessPoolExecutor sous Windows)\r\nif __name__ == \"__main__\":\r\n    # Un seul fichier :\r\n    #   convert_s2p_to_two_dat_files(\"C:\/Users\/a942666\/OneDrive - ATOS\/Bureau\/bank_18_24\/LFCV-2302+_Plus25DegC.s2p\")\r\n    # Tous les fichiers .s2p du dossier de la banque :\r\n    bank_dir = \"C:\/Users\/a942666\/OneDrive - ATOS\/Bureau\/bank_18_24\"\r\n    s2p_files = sorted(glob.glob(os.path.join(bank_dir, \"*.s2p\")))\r\n    convert_batch(s2p_files)\r\n",
 },
 
 {
@@ -138,7 +138,7 @@ window.DOWNLOADS = [
   "size_bytes": 2000,
   liens: "pages/s2p_to_dat.html",
   "description": "Convertion d'un S2P amplitude et phase des parametres S en ->freq S11dB S21dB",
-  "code_py":"import os  # Permet de manipuler fichiers et dossiers\r\n\r\n# === FONCTION PRINCIPALE ===\r\ndef convert_s2p(s2p_path: str, output_dir: str):\r\n    \"\"\"\r\n    Cette fonction prend un fichier .s2p et cr\u00E9e deux fichiers .dat :\r\n      - <nom_du_fichier>_S11.dat : fr\u00E9quence et S11\r\n      - <nom_du_fichier>_S21.dat : fr\u00E9quence et S21\r\n    \"\"\"\r\n    \r\n    # V\u00E9rifie que le fichier .s2p existe. Si pas trouv\u00E9, arr\u00EAte le programme\r\n    if not os.path.isfile(s2p_path):\r\n        raise FileNotFoundError(f\"Fichier introuvable : {s2p_path}\")\r\n\r\n    # Cr\u00E9e le dossier de sortie si il n\'existe pas encore\r\n    os.makedirs(output_dir, exist_ok=True)\r\n\r\n    # R\u00E9cup\u00E8re le nom du fichier sans son chemin ni son extension\r\n    base = os.path.splitext(os.path.basename(s2p_path))[0]\r\n\r\n    # Cr\u00E9e les chemins des fichiers de sortie\r\n    s11_out = os.path.join(output_dir, f\"{base}_S11.dat\")\r\n    s21_out = os.path.join(output_dir, f\"{base}_S21.dat\")\r\n\r\n    # Ouvre le fichier .s2p pour lecture et les fichiers de sortie pour \u00E9criture\r\n    with open(s2p_path, \"r\") as fin, \\\r\n         open(s11_out, \"w\") as f11, \\\r\n         open(s21_out, \"w\") as f21:\r\n\r\n        # \u00C9crit les titres des colonnes dans les fichiers .dat\r\n        f11.write(\"# freq(Hz)\\tS11\\n\")\r\n        f21.write(\"# freq(Hz)\\tS21\\n\")\r\n\r\n        # Parcourt chaque ligne du fichier .s2p\r\n        for line in fin:\r\n            line = line.strip()  # Supprime les espaces au d\u00E9but et \u00E0 la fin\r\n\r\n            # Ignore les lignes vides et les commentaires\r\n            if not line or line.startswith(\"#\") or line.startswith(\"!\"):\r\n                continue\r\n\r\n            # S\u00E9pare la ligne en morceaux\r\n            parts = line.split()\r\n\r\n            # Si la ligne n\'a pas assez de donn\u00E9es, on l\'ignore\r\n            if len(parts) < 4:\r\n                continue\r\n\r\n            # On prend la fr\u00E9quence, S11 et S21 (colonne 0,1,3)\r\n            freq, s11, s21 = parts[0], parts[1], parts[3]\r\n\r\n            # \u00C9crit les donn\u00E9es dans les fichiers de sortie\r\n            f11.write(f\"{freq}\\t{s11}\\n\")\r\n            f21.write(f\"{freq}\\t{s21}\\n\")\r\n\r\n    # Affiche un message pour dire que la conversion est termin\u00E9e\r\n    print(f\"\u2705 Fichier converti : {s2p_path}\")\r\n    print(f\"   \u2192 S11 : {s11_out}\")\r\n    print(f\"   \u2192 S21 : {s21_out}\")\r\n\r\n\r\n# === PARTIE EXECUTABLE SI ON LANCE LE SCRIPT ===\r\nif __name__ == \"__main__\":\r\n    # === MODIFIEZ CES CHEMINS POUR VOTRE CAS ===\r\n    input_file  = r\"C:\\Users\\a942666\\OneDrive - ATOS\\Bureau\\HPF_4GHz\\HPF4G.s2p\"  # Fichier .s2p \u00E0 convertir\r\n    output_dir  = r\"C:\\Users\\a942666\\OneDrive - ATOS\\Bureau\\S21_HPF.dat\"          # Dossier o\u00F9 mettre les .dat\r\n\r\n    # Appelle la fonction principale pour faire la conversion\r\n    convert_s2p(input_file, output_dir)\r\n",
+  "code_py":"import os  # Permet de manipuler fichiers et dossiers\r\n\r\n# Format d\'une ligne des fichiers .dat : fr\u00E9quence <tab> valeur (recopi\u00E9es telles quelles)\r\nLIGNE_DAT = \"%s\\t%s\\n\"\r\n\r\n# === FONCTION PRINCIPALE ===\r\ndef convert_s2p(s2p_path: str, output_dir: str):\r\n    \"\"\"\r\n    Cette fonction prend un fichier .s2p et cr\u00E9e deux fichiers .dat :\r\n      - <nom_du_fichier>_S11.dat : fr\u00E9quence et S11\r\n      - <nom_du_fichier>_S21.dat : fr\u00E9quence et S21\r\n    \"\"\"\r\n    \r\n    # V\u00E9rifie que le fichier .s2p existe. Si pas trouv\u00E9, arr\u00EAte le programme\r\n    if not os.path.isfile(s2p_path):\r\n        raise FileNotFoundError(f\"Fichier introuvable : {s2p_path}\")\r\n\r\n    # Cr\u00E9e le dossier de sortie si il n\'existe pas encore\r\n    os.makedirs(output_dir, exist_ok=True)\r\n\r\n    # R\u00E9cup\u00E8re le nom du fichier sans son chemin ni son extension\r\n    base = os.path.splitext(os.path.basename(s2p_path))[0]\r\n\r\n    # Cr\u00E9e les chemins des fichiers de sortie\r\n    s11_out = os.path.join(output_dir, f\"{base}_S11.dat\")\r\n    s21_out = os.path.join(output_dir, f\"{base}_S21.dat\")\r\n\r\n    # Listes des lignes \u00E0 \u00E9crire : tout est accumul\u00E9 en m\u00E9moire puis \u00E9crit\r\n    # en une seule fois par fichier (un seul write au lieu d\'un par ligne)\r\n    lignes_s11 = [\"# freq(Hz)\\tS11\\n\"]  # Titres des colonnes des fichiers .dat\r\n    lignes_s21 = [\"# freq(Hz)\\tS21\\n\"]\r\n\r\n    # Ouvre le fichier .s2p pour lecture\r\n    with open(s2p_path, \"r\") as fin:\r\n\r\n        # Parcourt chaque ligne du fichier .s2p\r\n        for line in fin:\r\n            line = line.strip()  # Supprime les espaces au d\u00E9but et \u00E0 la fin\r\n\r\n            # Ignore les lignes vides et les commentaires\r\n            if not line or line.startswith(\"#\") or line.startswith(\"!\"):\r\n                continue\r\n\r\n            # S\u00E9pare la ligne en morceaux\r\n            parts = line.split()\r\n\r\n            # Si la ligne n\'a pas assez de donn\u00E9es, on l\'ignore\r\n            if len(parts) < 4:\r\n                continue\r\n\r\n            # On prend la fr\u00E9quence, S11 et S21 (colonne 0,1,3)\r\n            freq, s11, s21 = parts[0], parts[1], parts[3]\r\n\r\n            # Ajoute les donn\u00E9es aux lignes des fichiers de sortie\r\n            lignes_s11.append(LIGNE_DAT % (freq, s11))\r\n            lignes_s21.append(LIGNE_DAT % (freq, s21))\r\n\r\n    # \u00C9crit chaque fichier de sortie en une fois (valeurs recopi\u00E9es telles quelles)\r\n    with open(s11_out, \"w\", buffering=1 << 20) as f11:\r\n        f11.write(\"\".join(lignes_s11))\r\n    with open(s21_out, \"w\", buffering=1 << 20) as f21:\r\n        f21.write(\"\".join(lignes_s21))\r\n\r\n    # Affiche un message pour dire que la conversion est termin\u00E9e\r\n    print(f\"\u2705 Fichier converti : {s2p_path}\")\r\n    print(f\"   \u2192 S11 : {s11_out}\")\r\n    print(f\"   \u2192 S21 : {s21_out}\")\r\n\r\n\r\n# === PARTIE EXECUTABLE SI ON LANCE LE SCRIPT ===\r\nif __name__ == \"__main__\":\r\n    # === MODIFIEZ CES CHEMINS POUR VOTRE CAS ===\r\n    input_file  = r\"C:\\Users\\a942666\\OneDrive - ATOS\\Bureau\\HPF_4GHz\\HPF4G.s2p\"  # Fichier .s2p \u00E0 convertir\r\n    output_dir  = r\"C:\\Users\\a942666\\OneDrive - ATOS\\Bureau\\S21_HPF.dat\"          # Dossier o\u00F9 mettre les .dat\r\n\r\n    # Appelle la fonction principale pour faire la conversion\r\n    convert_s2p(input_file, output_dir)\r\n",
 },
 
 {
@@ -149,7 +149,7 @@ window.DOWNLOADS = [
   liens: "pages/text_comparator.html",
   "size_bytes": 3000,
   "versionweb": "https://bymox.github.io/rapport_stage_mt4a/text_comparator.html",  "description": "Convertion d'un S2P amplitude et phase des parametres S en ->freq S11dB S21dB",
-  "code_py":"#!\/usr\/bin\/env python3\r\n# -*- coding: utf-8 -*-\r\n\"\"\"\r\ndiff_lignes.py \u2013 compare Fichier1.txt et Fichier2.txt ligne par ligne.\r\n\r\nAffiche au terminal :\r\nLigne 7 :\r\n    Fichier1.txt | <contenu ligne 7 fichier\u202F1>\r\n    Fichier2.txt | <contenu ligne 7 fichier\u202F2>\r\n\"\"\"\r\n\r\nimport os\r\nimport itertools\r\n\r\n# -------------------------------------------------------------------------\r\n# Chemins des fichiers (m\u00EAme dossier que ce script)\r\n# -------------------------------------------------------------------------\r\nscript_dir = os.path.dirname(os.path.abspath(__file__))\r\n\r\nfile1_path = os.path.join(script_dir, \"Fichier1.txt\")\r\nfile2_path = os.path.join(script_dir, \"Fichier2.txt\")\r\n\r\n# V\u00E9rifications basiques\r\nfor path in (file1_path, file2_path):\r\n    if not os.path.isfile(path):\r\n        raise FileNotFoundError(f\"Introuvable : {path}\")\r\n\r\n# -------------------------------------------------------------------------\r\n# Lecture des fichiers\r\n# -------------------------------------------------------------------------\r\nwith open(file1_path, encoding=\"utf-8\") as f1, open(file2_path, encoding=\"utf-8\") as f2:\r\n    lines1 = [line.rstrip(\"\\n\") for line in f1]\r\n    lines2 = [line.rstrip(\"\\n\") for line in f2]\r\n\r\n# -------------------------------------------------------------------------\r\n# Comparaison ligne par ligne\r\n# -------------------------------------------------------------------------\r\nmax_len = max(len(lines1), len(lines2))\r\ndifferences = 0\r\n\r\nfor idx in range(max_len):\r\n    # R\u00E9cup\u00E8re la ligne ou \'<-absente->\' si hors index\r\n    l1 = lines1[idx] if idx < len(lines1) else \"<-- ligne absente -->\"\r\n    l2 = lines2[idx] if idx < len(lines2) else \"<-- ligne absente -->\"\r\n\r\n    if l1 != l2:\r\n        differences += 1\r\n        print(f\"\\nLigne {idx + 1} :\")\r\n        print(f\"  Fichier1.txt | {l1}\")\r\n        print(f\"  Fichier2.txt | {l2}\")\r\n\r\nif differences == 0:\r\n    print(\"\u2705 Aucun \u00E9cart : les deux fichiers sont identiques.\")\r\nelse:\r\n    print(f\"\\nNombre total de lignes diff\u00E9rentes : {differences}\")"
+  "code_py":"#!\/usr\/bin\/env python3\r\n# -*- coding: utf-8 -*-\r\n\"\"\"\r\ndiff_lignes.py \u2013 compare Fichier1.txt et Fichier2.txt ligne par ligne.\r\n\r\nAffiche au terminal :\r\nLigne 7 :\r\n    Fichier1.txt | <contenu ligne 7 fichier\u202F1>\r\n    Fichier2.txt | <contenu ligne 7 fichier\u202F2>\r\n\"\"\"\r\n\r\nimport os\r\nimport sys\r\nimport hashlib\r\nimport itertools\r\n\r\n# -------------------------------------------------------------------------\r\n# Chemins des fichiers (m\u00EAme dossier que ce script)\r\n# -------------------------------------------------------------------------\r\nscript_dir = os.path.dirname(os.path.abspath(__file__))\r\n\r\nfile1_path = os.path.join(script_dir, \"Fichier1.txt\")\r\nfile2_path = os.path.join(script_dir, \"Fichier2.txt\")\r\n\r\n# V\u00E9rifications basiques\r\nfor path in (file1_path, file2_path):\r\n    if not os.path.isfile(path):\r\n        raise FileNotFoundError(f\"Introuvable : {path}\")\r\n\r\n# -------------------------------------------------------------------------\r\n# Raccourci : fichiers identiques octet pour octet (m\u00EAme taille et m\u00EAme hash)\r\n# -> pas de comparaison ligne par ligne\r\n# -------------------------------------------------------------------------\r\ndef hash_fichier(path):\r\n    \"\"\"Empreinte blake2b du fichier, lu en binaire par blocs de 1 Mo.\"\"\"\r\n    h = hashlib.blake2b(digest_size=16)\r\n    with open(path, \"rb\") as f:\r\n        for bloc in iter(lambda: f.read(1 << 20), b\"\"):\r\n            h.update(bloc)\r\n    return h.digest()\r\n\r\nif os.path.getsize(file1_path) == os.path.getsize(file2_path) \\\r\n        and hash_fichier(file1_path) == hash_fichier(file2_path):\r\n    print(\"\u2705 Aucun \u00E9cart : les deux fichiers sont identiques.\")\r\n    sys.exit(0)\r\n\r\n# -------------------------------------------------------------------------\r\n# Lecture et comparaison ligne par ligne (en flux : les fichiers ne sont pas\r\n# charg\u00E9s en m\u00E9moire, une seule passe sur chacun)\r\n# -------------------------------------------------------------------------\r\nLIGNE_ABSENTE = \"<-- ligne absente -->\"\r\ndifferences = 0\r\n\r\nwith open(file1_path, encoding=\"utf-8\", buffering=1 << 20) as f1, \\\r\n     open(file2_path, encoding=\"utf-8\", buffering=1 << 20) as f2:\r\n    for idx, (l1, l2) in enumerate(itertools.zip_longest(f1, f2), 1):\r\n        # R\u00E9cup\u00E8re la ligne ou \'<-absente->\' si le fichier est d\u00E9j\u00E0 termin\u00E9\r\n        l1 = l1.rstrip(\"\\n\") if l1 is not None else LIGNE_ABSENTE\r\n        l2 = l2.rstrip(\"\\n\") if l2 is not None else LIGNE_ABSENTE\r\n\r\n        if l1 != l2:\r\n            differences += 1\r\n            print(f\"\\nLigne {idx} :\")\r\n            print(f\"  Fichier1.txt | {l1}\")\r\n            print(f\"  Fichier2.txt | {l2}\")\r\n\r\nif differences == 0:\r\n    print(\"\u2705 Aucun \u00E9cart : les deux fichiers sont identiques.\")\r\nelse:\r\n    print(f\"\\nNombre total de lignes diff\u00E9rentes : {differences}\")\r\n"
 },
 //-----------------------------------------------------------------------------
 // {
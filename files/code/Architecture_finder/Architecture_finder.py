@@ -17,31 +17,65 @@ Conventions et unités :
      gain_dB = -insertion_loss_dB
      nf_dB   = insertion_loss_dB  (hypothèse : NF = pertes d'insertion)
  - Si un champ manque, valeurs par défaut raisonnables sont appliquées
-   (ex : p1db par défaut = +1000 dBm -> non contraignant).
+   (ex : p1db absent -> p1db_lin = +inf : étage non contraignant, ignoré dans le
+   calcul de l'OP1dB ; pas de valeur sentinelle type +1000 dBm).
 """
 
 import yaml
 import itertools
 import math
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+try:
+    # chargeur YAML adossé à libyaml (bien plus rapide), si PyYAML a été compilé avec
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # -------------------------
 # Utils de base (conversions)
 # -------------------------
 def non_empty_subsets(lst):
     """
-    Retourne toutes les sous-ensembles non vides de la liste `lst`.
+    Génère tous les sous-ensembles non vides de la liste `lst` (générateur : les 2^K - 1
+    sous-ensembles sont produits à la demande, sans liste intermédiaire).
     Utilisé pour tester toutes les combinaisons possibles de LNAs mobiles.
     """
-    return [list(subset) for r in range(1, len(lst)+1) for subset in itertools.combinations(lst, r)]
+    return (list(subset) for r in range(1, len(lst)+1) for subset in itertools.combinations(lst, r))
 
 def db_to_lin(db):
     """Convertit dB -> linéaire (puissance facteur)."""
     return 10 ** (db / 10)
 
-def lin_to_db(lin):
-    """Convertit linéaire -> dB. ATTENTION: lin doit être > 0."""
-    return 10 * math.log10(lin)
+# 10**(x/10) == exp(x * ln(10)/10) : np.exp est vectorisé (SIMD) sur tout un tableau
+LN10_OVER_10 = math.log(10) / 10
+
+def db_to_lin_array(db):
+    """Version vectorisée de db_to_lin sur un tableau numpy (ou une liste) de valeurs en dB."""
+    return np.exp(np.asarray(db, dtype=np.float64) * LN10_OVER_10)
+
+def lin_to_db_array(lin):
+    """Convertit linéaire -> dB sur un tableau numpy (valeurs > 0)."""
+    return 10.0 * np.log10(lin)
+
+# -------------------------
+# Représentation des chaînes : tableaux structurés numpy (SoA)
+# -------------------------
+# une chaîne = un tableau de CHAIN_DTYPE (un élément par étage) : chaque champ
+# (chain['gain_lin'], chain['nf_lin'], ...) se lit comme un tableau, sans accès dict par étage
+CHAIN_DTYPE = np.dtype([
+    ('gain_lin', 'f8'),
+    ('nf_lin', 'f8'),
+    ('p1db_lin', 'f8'),
+    ('gain_dB', 'f8'),
+], align=True)
+
+def stage_record(gain_lin, nf_lin, p1db_lin, gain_dB):
+    """Retourne un étage au format CHAIN_DTYPE (tuple, à assembler avec np.array)."""
+    return (gain_lin, nf_lin, p1db_lin, gain_dB)
 
 # -------------------------
 # Chargement YAML
@@ -54,25 +88,105 @@ def load_config(yaml_filename):
     script_dir = os.path.dirname(os.path.abspath(__file__))
     yaml_path = os.path.join(script_dir, yaml_filename)
     with open(yaml_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+# version du format mis en cache : à incrémenter si prepare_config change de sortie
+PREPARED_CACHE_VERSION = 2
+
+def load_prepared_config(yaml_filename):
+    """
+    Charge le YAML et son prétraitement (prepare_config) en passant par un cache pickle
+    (<yaml>.pkl à côté du YAML) : tant que le YAML n'a pas été modifié (même mtime) et que
+    le format n'a pas changé (PREPARED_CACHE_VERSION), on évite le parsing YAML et les
+    conversions dB -> linéaire. Le cache est recréé sinon ; s'il est illisible ou ne peut
+    pas être écrit, on se contente du calcul direct.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    yaml_path = os.path.join(script_dir, yaml_filename)
+    cache_path = yaml_path + '.pkl'
+    yaml_mtime = os.path.getmtime(yaml_path)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached['version'] == PREPARED_CACHE_VERSION and cached['yaml_mtime'] == yaml_mtime:
+            return cached['prepared']
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):
+        pass
+
+    prepared = prepare_config(load_config(yaml_filename))
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'version': PREPARED_CACHE_VERSION, 'yaml_mtime': yaml_mtime,
+                         'prepared': prepared}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return prepared
 
 # -------------------------
 # Calculs physiques
 # -------------------------
+# noyaux Python déroulés, générés une fois par longueur de chaîne N (clé : N)
+_unrolled_kernel_cache = {}
+
+def _unrolled_nf_source(n):
+    """
+    Source de calc_nf déroulé pour N = n étages :
+    NF_total_lin = NF1 + (NF2-1)/G1 + (NF3-1)/(G1*G2) + ..., retour en dB.
+    """
+    lines = ["def nf_%d(gain_lin, nf_lin):" % n,
+             "    nf_total_lin = nf_lin[0]",
+             "    gain_prod = gain_lin[0]"]
+    for i in range(1, n):
+        lines.append("    nf_total_lin += (nf_lin[%d] - 1.0) / gain_prod" % i)
+        lines.append("    gain_prod *= gain_lin[%d]" % i)
+    lines.append("    return 10.0 * math.log10(nf_total_lin)")
+    return "\n".join(lines)
+
+def _unrolled_p1db_source(n):
+    """
+    Source de calc_p1db déroulé pour N = n étages : une seule passe à l'envers,
+    g_after = produit des gains des étages placés après i ; les étages avec
+    p1db_lin <= 0 ou infini (absent) sont ignorés, +inf si aucun n'est contraignant.
+    """
+    lines = ["def p1db_%d(gain_lin, p1db_lin):" % n,
+             "    g_after = 1.0",
+             "    inv_sum = 0.0"]
+    for i in range(n - 1, -1, -1):
+        lines.append("    if p1db_lin[%d] > 0 and math.isfinite(p1db_lin[%d]):" % (i, i))
+        lines.append("        inv_sum += 1.0 / (p1db_lin[%d] * g_after)" % i)
+        lines.append("    g_after *= gain_lin[%d]" % i)
+    lines.append("    if inv_sum <= 0:")
+    lines.append("        return math.inf")
+    lines.append("    return 10.0 * math.log10(1.0 / inv_sum)")
+    return "\n".join(lines)
+
+def unrolled_kernels(n):
+    """
+    Retourne (nf_kernel, p1db_kernel) : noyaux sans boucle de calc_nf / calc_p1db
+    pour des chaînes de longueur n, générés par exec puis mis en cache (la boucle Python
+    et ses indices coûteraient plus que les calculs eux-mêmes) ; ils prennent des listes de floats.
+    """
+    kernels = _unrolled_kernel_cache.get(n)
+    if kernels is None:
+        namespace = {'math': math}
+        exec(_unrolled_nf_source(n), namespace)
+        exec(_unrolled_p1db_source(n), namespace)
+        kernels = (namespace['nf_%d' % n], namespace['p1db_%d' % n])
+        _unrolled_kernel_cache[n] = kernels
+    return kernels
+
 def calc_nf(chain):
     """
     Calcule le NF total de la chaîne via la formule de Friis (en linéaire),
     puis convertit en dB pour retour.
-    chain: liste d'étages avec 'gain_lin' et 'nf_lin' (valeurs linéaires).
+    chain: tableau numpy de CHAIN_DTYPE (champs 'gain_lin' et 'nf_lin' en linéaire).
     NF_total_lin = NF1 + (NF2-1)/G1 + (NF3-1)/(G1*G2) + ...
     Retour: NF total en dB.
+    (noyau déroulé pour la longueur de la chaîne, voir unrolled_kernels)
     """
-    nf_total_lin = chain[0]['nf_lin']
-    gain_prod = chain[0]['gain_lin']
-    for stage in chain[1:]:
-        nf_total_lin += (stage['nf_lin'] - 1) / gain_prod
-        gain_prod *= stage['gain_lin']
-    return lin_to_db(nf_total_lin)
+    nf_kernel = unrolled_kernels(len(chain))[0]
+    return nf_kernel(chain['gain_lin'].tolist(), chain['nf_lin'].tolist())
 
 def calc_p1db(chain):
     """
@@ -84,33 +198,48 @@ def calc_p1db(chain):
       - P1dB_total_lin = 1 / inv_sum
       - on retourne P1dB en dB (dBm, car p1db_lin provient d'une conversion depuis dBm)
     Remarques :
-      - Si un étage n'a pas de p1db défini ou valeur non positive, on l'ignore (contrib. nulle).
-      - Si inv_sum == 0 (cas pathologique), on retourne -inf pour signaler l'impossibilité.
+      - Si un étage n'a pas de p1db défini (p1db_lin infini) ou valeur non positive,
+        on l'ignore (contrib. nulle).
+      - Si aucun étage n'est contraignant (inv_sum == 0), on retourne +inf.
+      - Chaîne vide : on retourne -inf pour signaler l'impossibilité.
+    chain: tableau numpy de CHAIN_DTYPE.
+    (noyau déroulé pour la longueur de la chaîne, voir unrolled_kernels)
     """
-    if not chain:
+    if len(chain) == 0:
         return float('-inf')
 
-    N = len(chain)
-    gain_after = [1.0] * N
-    prod = 1.0
-    # calcule produit des gains après chaque étage (on parcourt à l'envers)
-    for idx in range(N-1, -1, -1):
-        gain_after[idx] = prod
-        prod *= chain[idx]['gain_lin']
-
-    inv_sum = 0.0
-    for i, stage in enumerate(chain):
-        p1_lin = stage.get('p1db_lin', None)
-        if not p1_lin or p1_lin <= 0:
-            # pas de P1dB renseigné => on l'ignore (comportement non contraignant)
-            continue
-        inv_sum += 1.0 / (p1_lin * gain_after[i])
-
-    if inv_sum <= 0:
-        return float('-inf')
+    p1db_kernel = unrolled_kernels(len(chain))[1]
+    return p1db_kernel(chain['gain_lin'].tolist(), chain['p1db_lin'].tolist())
+
+# -------------------------
+# Calculs physiques vectorisés (lot d'architectures)
+# -------------------------
+def compute_metrics_batch(gain, nf, p1db, gain_dB):
+    """
+    Calcule en une seule passe, pour un lot de A chaînes de même longueur N,
+    le NF total, l'OP1dB de sortie et le gain total.
+    gain, nf, p1db : tableaux numpy (A, N) en linéaire.
+    gain_dB        : tableau numpy (A, N) des mêmes gains en dB ; le gain total en dB est
+                     leur simple somme (pas d'aller-retour linéaire -> dB).
+    Le produit cumulé des gains cum_gain est calculé une seule fois et sert aux deux formules :
+      - Friis : NF_total = NF1 + sum_i (NF_i - 1) / cum_gain[i-1]
+      - OP1dB : gain_after[:, i] = cum_gain[:, -1] / cum_gain[:, i]
+                inv_sum = sum_i 1 / (p1db_i * gain_after_i), les étages sans P1dB
+                (p1db = +inf) étant masqués explicitement
+    Retour: (nf_dB, p1db_dBm, gain_dB), chacun un tableau (A,)
+            (p1db_dBm = +inf si aucun étage n'est contraignant).
+    """
+    cum_gain = np.cumprod(gain, axis=1)
+    total_gain = cum_gain[:, -1]
+
+    nf_total_lin = nf[:, 0] + ((nf[:, 1:] - 1) / cum_gain[:, :-1]).sum(axis=1)
+
+    gain_after = total_gain[:, None] / cum_gain
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_sum = np.where(np.isfinite(p1db), 1.0 / (p1db * gain_after), 0.0).sum(axis=1)
+        p1db_dBm = np.where(inv_sum > 0, lin_to_db_array(1.0 / inv_sum), np.inf)
 
-    p1_total_lin = 1.0 / inv_sum
-    return lin_to_db(p1_total_lin)
+    return lin_to_db_array(nf_total_lin), p1db_dBm, gain_dB.sum(axis=1)
 
 # -------------------------
 # Gestion des blocs verrouillés
@@ -148,11 +277,11 @@ def flatten_block_stages(block):
       - name, gain_dB (somme), gain_dB_max (somme), nf_dB (calc Friis sur sous-chaîne),
         p1db_dBm (OP1dB du bloc), gain_lin, nf_lin, p1db_lin, type='block'
     """
-    subchain = []
+    subchain = np.empty(len(block), dtype=CHAIN_DTYPE)
     total_gain_dB = 0.0
     total_gain_dB_max = 0.0
 
-    for comp in block:
+    for i, comp in enumerate(block):
         # Pour les passifs (filter, switch) : on cherche insertion_loss_dB (positive)
         # gain_comp_dB = - insertion_loss_dB ; nf_comp_dB = insertion_loss_dB
         if comp.get('type') in ['filter', 'switch'] and 'insertion_loss_dB' in comp:
@@ -163,18 +292,16 @@ def flatten_block_stages(block):
             gain_comp_dB = float(comp.get('gain_dB', 0.0))
             nf_comp_dB = float(comp.get('nf_dB', abs(gain_comp_dB)))
 
-        # p1db en dBm : accepte p1db_dBm ou op1db_dBm ; défaut = +1000 dBm (non contraignant)
-        p1db_val = comp.get('p1db_dBm', comp.get('op1db_dBm', 1000.0))
+        # p1db en dBm : accepte p1db_dBm ou op1db_dBm ; absent -> +inf (non contraignant)
+        p1db_val = comp.get('p1db_dBm', comp.get('op1db_dBm'))
 
-        # Construire l'entrée en linéaire attendue par calc_nf / calc_p1db
-        substage = {
-            'name': comp.get('name', ''),
-            'type': comp.get('type', ''),
-            'gain_lin': db_to_lin(gain_comp_dB),
-            'nf_lin': db_to_lin(nf_comp_dB),
-            'p1db_lin': db_to_lin(float(p1db_val))
-        }
-        subchain.append(substage)
+        # Construire l'étage en linéaire attendu par calc_nf / calc_p1db
+        subchain[i] = stage_record(
+            db_to_lin(gain_comp_dB),
+            db_to_lin(nf_comp_dB),
+            db_to_lin(float(p1db_val)) if p1db_val is not None else math.inf,
+            gain_comp_dB
+        )
 
         total_gain_dB += gain_comp_dB
         total_gain_dB_max += float(comp.get('gain_dB_max', gain_comp_dB))
@@ -195,138 +322,229 @@ def flatten_block_stages(block):
         'type': 'block'
     }
 
+# -------------------------
+# Table globale des étages candidats
+# -------------------------
+def build_stage_table(block_stages, lnas, attenuators):
+    """
+    Construit la table de tous les étages candidats, chacun repéré par un id entier :
+      - un id par bloc fixe (dans l'ordre des blocs)
+      - un id par LNA mobile
+      - un id par réglage de chaque atténuateur (une entrée par option de gain_dB_options)
+    Les architectures sont ensuite décrites par des lignes d'ids, et les étages
+    sont rassemblés en une seule indexation numpy (table['stages'][idx]).
+
+    Retourne un dict avec:
+      - name      : liste des noms (indexée par id)
+      - stages    : tableau (S,) de CHAIN_DTYPE (gain_lin, nf_lin, p1db_lin, gain_dB)
+      - stages_min / stages_max : tableaux (S,) frères de stages, avec chaque atténuateur
+                          réglé à son gain minimal / maximal (attributs '_min_triplet' /
+                          '_max_triplet' précalculés dans main ; identiques à stages pour
+                          les blocs et LNAs)
+      - canon     : liste (S,) id canonique de chaque étage = premier id de même nom et de
+                    mêmes variantes min/max (ex : les réglages d'un même atténuateur, deux
+                    LNAs identiques) ; deux chaînes de même clé canonique ont les mêmes métriques
+      - block_ids, lna_ids : listes d'ids
+      - att_ids   : pour chaque atténuateur, liste des ids de ses réglages
+    """
+    names = []
+    stages = []
+    stages_min = []
+    stages_max = []
+
+    def add_stage(name, gain_dB, triplet, variant_min=None, variant_max=None):
+        # variant_min / variant_max : (gain_dB, triplet) de l'atténuateur réglé au min / max
+        names.append(name)
+        stages.append(stage_record(*triplet, gain_dB))
+        gain_dB_min, triplet_min = variant_min or (gain_dB, triplet)
+        gain_dB_max, triplet_max = variant_max or (gain_dB, triplet)
+        stages_min.append(stage_record(*triplet_min, gain_dB_min))
+        stages_max.append(stage_record(*triplet_max, gain_dB_max))
+        return len(names) - 1
+
+    block_ids = [add_stage(b['name'], b['gain_dB'], (b['gain_lin'], b['nf_lin'], b['p1db_lin']))
+                 for b in block_stages]
+    lna_ids = [add_stage(l['name'], l.get('gain_dB', 0.0),
+                         (l['gain_lin'], l['nf_lin'], l['p1db_lin']))
+               for l in lnas]
+
+    att_ids = []
+    for att in attenuators:
+        # options déjà converties en linéaire dans main (att['_options']) : aucun calcul ici
+        att_ids.append([
+            add_stage(att['name'], opt['gain_dB'],
+                      (opt['gain_lin'], opt['nf_lin'], opt['p1db_lin']),
+                      (att['_min_gain_dB'], att['_min_triplet']),
+                      (att['_max_gain_dB'], att['_max_triplet']))
+            for opt in att['_options']
+        ])
+
+    first_id = {}
+    canon = [first_id.setdefault((name, s_min, s_max), i)
+             for i, (name, s_min, s_max) in enumerate(zip(names, stages_min, stages_max))]
+
+    return {
+        'name': names,
+        'canon': canon,
+        'stages': np.array(stages, dtype=CHAIN_DTYPE),
+        'stages_min': np.array(stages_min, dtype=CHAIN_DTYPE),
+        'stages_max': np.array(stages_max, dtype=CHAIN_DTYPE),
+        'block_ids': block_ids,
+        'lna_ids': lna_ids,
+        'att_ids': att_ids
+    }
+
 # -------------------------
 # Génération de toutes les architectures
 # -------------------------
-def generate_all_chains(blocks, movable_lnas, attenuators):
+def unique_by_canon(combos, canon):
+    """
+    Garde la première occurrence de chaque combinaison d'ids, à équivalence canonique près
+    (voir table['canon']). L'ordre de première apparition est conservé.
+    """
+    unique = {}
+    for combo in combos:
+        unique.setdefault(tuple(canon[i] for i in combo), combo)
+    return list(unique.values())
+
+def nf_pruning_is_safe(table):
+    """
+    L'élagage sur le NF (voir generate_all_chains) suppose qu'insérer un atténuateur ne peut
+    pas diminuer le NF de la chaîne : vrai si tous les NF linéaires sont >= 1 et si aucun
+    atténuateur n'a de gain (gain_lin <= 1 dans sa variante max).
+    """
+    att_ids = [i for ids in table['att_ids'] for i in ids]
+    stages_max = table['stages_max']
+    return bool(np.all(stages_max['nf_lin'] >= 1.0)
+                and np.all(stages_max['gain_lin'][att_ids] <= 1.0))
+
+def insertion_slots(n_base, positions):
+    """
+    Calcule, en une seule passe de fusion, la place finale des éléments quand on insère
+    len(positions) éléments dans une liste de n_base éléments (positions croissantes,
+    l'élément k étant inséré avant l'élément base[positions[k]], comme list.insert).
+    Retourne (base_slots, inserted_slots) : tableaux d'indices dans la liste finale.
+    """
+    base_slots = np.empty(n_base, dtype=np.intp)
+    inserted_slots = np.empty(len(positions), dtype=np.intp)
+    k = 0
+    slot = 0
+    for j in range(n_base):
+        if k < len(positions) and positions[k] == j:
+            inserted_slots[k] = slot
+            k += 1
+            slot += 1
+        base_slots[j] = slot
+        slot += 1
+    return base_slots, inserted_slots
+
+def generate_all_chains(table, movable_lna_ids, nf_prune_dB=None):
     """
     Insère les LNAs mobiles dans les positions possibles entre les blocs fixes,
     puis insère les atténuateurs (avec toutes les combinaisons de réglages possibles).
-    Retourne une liste d'architectures testées avec métriques de base.
+    Travaille uniquement sur des ids d'étages (voir build_stage_table).
+
+    Élimination des doublons / élagage :
+      - les placements de LNAs et combinaisons de réglages équivalents (même clé canonique,
+        ex : permutations de LNAs identiques, réglages d'un atténuateur qui ne changent pas
+        ses variantes min/max) ne sont générés qu'une fois ;
+      - si nf_prune_dB est fourni, un placement de LNAs dont le NF (variante max, avant
+        insertion des atténuateurs) dépasse déjà nf_prune_dB est abandonné : insérer des
+        atténuateurs ne peut qu'augmenter le NF (voir nf_pruning_is_safe).
+    Le tableau résultat est alloué une seule fois (majorant du nombre d'architectures) puis
+    rempli par affectations de colonnes (voir insertion_slots), sans list.insert ni copie
+    de ligne ; il est tronqué au nombre de lignes effectivement produites.
+    Retourne un tableau d'ids (A, N) : une ligne par architecture testée.
     """
-    insert_positions = list(range(1, len(blocks)))  # positions entre blocs
-    all_architectures = []
+    block_ids = table['block_ids']
+    att_ids = table['att_ids']
+    canon = np.asarray(table['canon'], dtype=np.int32)
+    n_lna = len(movable_lna_ids)
+    n_att = len(att_ids)
+
+    insert_positions = range(1, len(block_ids))  # positions entre blocs
+    layout_len = len(block_ids) + n_lna
+    chain_len = layout_len + n_att
+
+    # combinaisons de réglages des atténuateurs (sans doublons canoniques) : (G, n_att)
+    # (nombre de lignes explicite : sans atténuateur, product() donne une seule combinaison vide)
+    combos = unique_by_canon(itertools.product(*att_ids), canon)
+    att_gain_combos = np.array(combos, dtype=np.int32).reshape(len(combos), n_att)
+    n_gain_combos = len(att_gain_combos)
+
+    # placements des atténuateurs dans une chaîne de layout_len étages : ne dépendent pas
+    # du placement des LNAs, calculés une seule fois
+    att_slots = [insertion_slots(layout_len, att_pos_combo)
+                 for att_pos_combo in itertools.combinations(range(1, layout_len), n_att)]
+
+    # majorant : tous les placements de LNAs x placements d'atténuateurs x réglages
+    max_rows = (math.comb(len(insert_positions), n_lna) * math.perm(n_lna)
+                * len(att_slots) * n_gain_combos)
+    idx = np.empty((max_rows, chain_len), dtype=np.int32)
+    n_rows = 0
+
+    layout = np.empty(layout_len, dtype=np.int32)
+    seen_layouts = set()
 
     # itère sur choix de positions pour les LNAs mobiles
-    for lna_positions in itertools.combinations(insert_positions, len(movable_lnas)):
-        for lna_perm in itertools.permutations(movable_lnas):
-            temp_blocks = blocks.copy()
-            # insère les LNAs (on garde l'ordre des positions)
-            for pos, lna in sorted(zip(lna_positions, lna_perm), reverse=True):
-                temp_blocks.insert(pos, lna.copy())
-
-            # préparer toutes les configurations d'atténuateurs (options)
-            att_configs_per_att = []
-            for att in attenuators:
-                att_configs = []
-                if 'gain_dB_options' in att:
-                    for att_gain_dB in att['gain_dB_options']:
-                        att_copy = att.copy()
-                        att_copy['gain_dB'] = att_gain_dB
-                        att_copy['gain_lin'] = db_to_lin(att_gain_dB)
-                        att_copy['nf_lin'] = db_to_lin(abs(att_gain_dB))
-                        att_copy['p1db_lin'] = db_to_lin(att_copy.get('p1db_dBm', att_copy.get('op1db_dBm', 1000)))
-                        att_configs.append(att_copy)
-                else:
-                    att_copy = att.copy()
-                    att_copy['gain_lin'] = db_to_lin(att['gain_dB'])
-                    att_copy['nf_lin'] = db_to_lin(abs(att['gain_dB']))
-                    att_copy['p1db_lin'] = db_to_lin(att_copy.get('p1db_dBm', att_copy.get('op1db_dBm', 1000)))
-                    att_configs.append(att_copy)
-                att_configs_per_att.append(att_configs)
-
-            # positions possibles pour insérer les atténuateurs
-            att_positions = list(range(1, len(temp_blocks)))
-            for att_pos_combo in itertools.combinations(att_positions, len(attenuators)):
-                for att_gain_combo in itertools.product(*att_configs_per_att):
-                    full_chain = temp_blocks.copy()
-                    # insère les atténuateurs (en partant de la fin pour respecter positions)
-                    for pos, att in sorted(zip(att_pos_combo, att_gain_combo), reverse=True):
-                        full_chain.insert(pos, att)
-
-                    # garantir que les champs linéaires sont présents pour chaque stage
-                    for s in full_chain:
-                        if 'gain_lin' not in s:
-                            s['gain_lin'] = db_to_lin(s.get('gain_dB', 0.0))
-                        if 'nf_lin' not in s:
-                            s['nf_lin'] = db_to_lin(s.get('nf_dB', abs(s.get('gain_dB', 0.0))))
-                        if 'p1db_lin' not in s:
-                            p1db_val = s.get('p1db_dBm', s.get('op1db_dBm', 1000.0))
-                            s['p1db_lin'] = db_to_lin(p1db_val)
-
-                    gain_lin = math.prod(stage['gain_lin'] for stage in full_chain)
-                    gain_dB = lin_to_db(gain_lin)
-                    nf = calc_nf(full_chain)      # NF total en dB (Friis)
-                    p1db = calc_p1db(full_chain)  # OP1dB sortie en dBm
-
-                    all_architectures.append({
-                        'chain': [s['name'] for s in full_chain],
-                        'nf_dB': nf,
-                        'p1db_dBm': p1db,   # OP1dB (sortie)
-                        'gain_dB': gain_dB,
-                        'full_chain': full_chain
-                    })
-    return all_architectures
+    for lna_positions in itertools.combinations(insert_positions, n_lna):
+        block_slots, lna_slots = insertion_slots(len(block_ids), lna_positions)
+        for lna_perm in itertools.permutations(movable_lna_ids):
+            # les LNAs suivent l'ordre des positions
+            layout[block_slots] = block_ids
+            layout[lna_slots] = lna_perm
+
+            # placement déjà vu (permutation de LNAs identiques) -> ignoré
+            layout_key = canon[layout].tobytes()
+            if layout_key in seen_layouts:
+                continue
+            seen_layouts.add(layout_key)
+
+            # élagage : NF déjà trop élevé avant même d'insérer les atténuateurs
+            if nf_prune_dB is not None:
+                if calc_nf(table['stages_max'][layout]) > nf_prune_dB:
+                    continue
+
+            # un bloc de n_gain_combos lignes par placement des atténuateurs
+            for layout_slots, att_cols in att_slots:
+                rows = idx[n_rows:n_rows + n_gain_combos]
+                rows[:, layout_slots] = layout
+                rows[:, att_cols] = att_gain_combos
+                n_rows += n_gain_combos
+
+    return idx[:n_rows]
 
 # -------------------------
 # Calcul min/max (atténuateurs)
 # -------------------------
-def compute_metrics_gain_min_max(full_chain, attenuators):
+def compute_metrics_gain_min_max(idx, table):
     """
-    Construit deux variantes de la chaîne :
+    Pour un lot d'architectures idx (A, N) de même longueur, construit deux variantes :
       - chain_min : atténuateurs à leur valeur minimale (min gain_dB)
       - chain_max : atténuateurs à leur valeur maximale (max gain_dB)
-    Puis calcule pour chaque variante :
+    (simple indexation des tableaux précalculés table['stages_min'] / table['stages_max'])
+    Puis calcule en une passe vectorisée (tableaux (A, N)) pour chaque variante :
       - gain total (dB)
       - NF total (dB)
       - OP1dB sortie (dBm)
     Enfin calcule IP1dB d'entrée :
       IP1dB = OP1dB_sortie - Gain_total  (valeurs min/max correspondantes)
     Retour: gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max
+            (chacun un tableau (A,), une valeur par chaîne)
     """
-    chain_max = []
-    chain_min = []
+    chains_min = table['stages_min'][idx]   # (A, N) de CHAIN_DTYPE
+    chains_max = table['stages_max'][idx]
 
-    for stage in full_chain:
-        # traiter à la fois 'atten' et 'attenuator'
-        if stage['type'] in ['attenuator', 'atten']:
-            s = stage.copy()
-            if 'gain_dB_options' in s:
-                max_gain = max(s['gain_dB_options'])
-                min_gain = min(s['gain_dB_options'])
-            else:
-                max_gain = min_gain = s['gain_dB']
-            s_max = s.copy()
-            s_max['gain_dB'] = max_gain
-            s_max['gain_lin'] = db_to_lin(max_gain)
-            s_max['nf_lin'] = db_to_lin(abs(max_gain))
-
-            s_min = s.copy()
-            s_min['gain_dB'] = min_gain
-            s_min['gain_lin'] = db_to_lin(min_gain)
-            s_min['nf_lin'] = db_to_lin(abs(min_gain))
-
-            chain_max.append(s_max)
-            chain_min.append(s_min)
-        else:
-            chain_max.append(stage)
-            chain_min.append(stage)
-
-    gain_max_lin = math.prod(s['gain_lin'] for s in chain_max)
-    gain_max_dB = lin_to_db(gain_max_lin)
-    nf_max = calc_nf(chain_max)
-    p1db_max = calc_p1db(chain_max)
-
-    gain_min_lin = math.prod(s['gain_lin'] for s in chain_min)
-    gain_min_dB = lin_to_db(gain_min_lin)
-    nf_min = calc_nf(chain_min)
-    p1db_min = calc_p1db(chain_min)
+    nf_max_dB, p1db_max, gain_max_dB = compute_metrics_batch(
+        chains_max['gain_lin'], chains_max['nf_lin'], chains_max['p1db_lin'], chains_max['gain_dB'])
+    nf_min_dB, p1db_min, gain_min_dB = compute_metrics_batch(
+        chains_min['gain_lin'], chains_min['nf_lin'], chains_min['p1db_lin'], chains_min['gain_dB'])
 
     # IP1dB (entrée) : OP1dB_sortie - gain_total (valeurs cohérentes min/max)
     ip1_min = p1db_min - gain_min_dB
     ip1_max = p1db_max - gain_max_dB
 
-    return gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max
+    return gain_min_dB, gain_max_dB, nf_min_dB, nf_max_dB, p1db_min, p1db_max, ip1_min, ip1_max
 
 # -------------------------
 # Scoring
@@ -338,23 +556,50 @@ def score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_tar
       - pénalité si NF_max (cas pessimiste) dépasse nf_max_target
       - pénalité si OP1dB_min (cas pessimiste) est < p1db_min_target
     NOTE : les IP1dB ne sont pas utilisés dans le score actuel.
+    Vectorisé : chaque métrique est un tableau (A,) (une valeur par architecture),
+    le retour est le tableau (A,) des scores.
     """
     gain_min, gain_max, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = metrics
     err_gain_min = (gain_min - target_gain) ** 2
     err_gain_max = (gain_max - target_gain) ** 2
-    err_nf = max(0, nf_max - nf_max_target) ** 2
-    err_p1db = max(0, p1db_min_target - p1db_min) ** 2
+    err_nf = np.maximum(0.0, nf_max - nf_max_target) ** 2
+    err_p1db = np.maximum(0.0, p1db_min_target - p1db_min) ** 2
     return err_gain_min + err_gain_max + err_nf + err_p1db
 
 # -------------------------
-# Main
+# Recherche par sous-ensemble de LNAs (parallélisable)
 # -------------------------
-def main():
-    # charge le YAML (attendu: 'components.yaml' à côté du script)
-    config = load_config('components.yaml')
-    target_gain = config['gain_total_target_dB']
-    nf_max_target = config['nf_max_dB']
-    p1db_min_target = config['p1db_min_dBm']
+def score_subset(lna_subset, table, targets, nf_prune_dB=None):
+    """
+    Génère et score toutes les architectures d'un sous-ensemble de LNAs mobiles.
+    Fonction de niveau module (picklable) : chaque sous-ensemble est indépendant et la table
+    n'est que lue, les sous-ensembles peuvent donc être répartis entre processus.
+      - targets : (target_gain, nf_max_target, p1db_min_target)
+    Retourne (chains, metrics, scores) :
+      - chains  : liste (A,) des chaînes (listes de noms d'étages)
+      - metrics : tableau (8, A), dans l'ordre de compute_metrics_gain_min_max
+      - scores  : tableau (A,)
+    """
+    target_gain, nf_max_target, p1db_min_target = targets
+    idx = generate_all_chains(table, lna_subset, nf_prune_dB)
+    if len(idx) == 0:
+        return [], np.empty((8, 0)), np.empty(0)
+    metrics = np.stack(compute_metrics_gain_min_max(idx, table))
+    scores = score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target)
+    names = table['name']
+    chains = [[names[i] for i in row] for row in idx.tolist()]
+    return chains, metrics, scores
+
+# -------------------------
+# Prétraitement de la configuration
+# -------------------------
+def prepare_config(config):
+    """
+    Prétraitement du YAML chargé, indépendant des architectures testées :
+    classification des composants, conversions en linéaire, tables des atténuateurs,
+    blocs fixes aplatis et table des étages (build_stage_table).
+    Retourne {'config': config, 'table': table} (picklable, voir load_prepared_config).
+    """
     components = config['components']
 
     # séparation composants en listes : fixed (blocs immuables), lnas (mobiles), attenuators
@@ -366,10 +611,9 @@ def main():
         comp = comp.copy()
 
         # p1db peut être dans p1db_dBm ou op1db_dBm selon ton YAML -> unifier
+        # absent -> p1db_lin = +inf (non contraignant, masqué dans le calcul d'OP1dB)
         p1db_val = comp.get('p1db_dBm', comp.get('op1db_dBm', None))
-        if p1db_val is None:
-            p1db_val = 1000.0  # valeur non contraignante si absent
-        comp['p1db_lin'] = db_to_lin(p1db_val)
+        comp['p1db_lin'] = db_to_lin(p1db_val) if p1db_val is not None else math.inf
 
         # traitement des atténuateurs (options ou valeur fixe)
         if comp['type'] in ['attenuator', 'atten']:
@@ -396,52 +640,118 @@ def main():
         else:
             fixed.append(comp)
 
+    # table des réglages de chaque atténuateur mobile, convertie une seule fois en linéaire
+    # (indexée par numéro d'option), et variantes min/max : invariantes d'une architecture
+    # à l'autre, donc calculées une seule fois (gain_lin, nf_lin, p1db_lin)
+    for att in attenuators:
+        options = att['gain_dB_options'] if 'gain_dB_options' in att else [att['gain_dB']]
+        options_dB = np.asarray(options, dtype=np.float64)
+        gains_lin = db_to_lin_array(options_dB)            # une conversion pour toutes les options
+        nfs_lin = db_to_lin_array(np.abs(options_dB))
+        att['_options'] = [
+            {'gain_dB': g, 'gain_lin': float(g_lin), 'nf_lin': float(nf_lin), 'p1db_lin': att['p1db_lin']}
+            for g, g_lin, nf_lin in zip(options, gains_lin, nfs_lin)
+        ]
+        opt_min = min(att['_options'], key=lambda opt: opt['gain_dB'])
+        opt_max = max(att['_options'], key=lambda opt: opt['gain_dB'])
+        att['_min_gain_dB'] = opt_min['gain_dB']
+        att['_max_gain_dB'] = opt_max['gain_dB']
+        att['_min_triplet'] = (opt_min['gain_lin'], opt_min['nf_lin'], opt_min['p1db_lin'])
+        att['_max_triplet'] = (opt_max['gain_lin'], opt_max['nf_lin'], opt_max['p1db_lin'])
+
     # grouper les composants fixes en blocs respectant locked_with_next
     blocks = group_locked_stages(fixed)
     block_stages = [flatten_block_stages(b) for b in blocks]
 
-    # générer toutes les architectures en insérant sous-ensembles de LNAs mobiles
-    all_archs = []
-    for lna_subset in non_empty_subsets(lnas):
-        archs = generate_all_chains(block_stages, lna_subset, attenuators)
-        all_archs.extend(archs)
+    # table globale des étages candidats (blocs, LNAs, réglages d'atténuateurs)
+    table = build_stage_table(block_stages, lnas, attenuators)
+
+    return {'config': config, 'table': table}
+
+# -------------------------
+# Main
+# -------------------------
+# bloc de results.txt pour une architecture : chaîne, puis les 8 métriques dans l'ordre de
+# compute_metrics_gain_min_max (gain, NF, OP1dB, IP1dB en paires min/max), puis le score
+RESULT_FMT = (
+    "Chaîne: %s\n"
+    "  -> Gain min = %.2f dB | Gain max = %.2f dB\n"
+    "     NF min   = %.2f dB    | NF max   = %.2f dB\n"
+    "     OP1dB sort. min = %.2f dBm | OP1dB sort. max = %.2f dBm\n"
+    "     IP1dB entr. min = %.2f dBm | IP1dB entr. max = %.2f dBm\n"
+    "     Score    = %.4f\n\n"
+)
 
-    if not all_archs:
+def main():
+    # charge le YAML (attendu: 'components.yaml' à côté du script) et son prétraitement
+    prepared = load_prepared_config('components.yaml')
+    config = prepared['config']
+    table = prepared['table']
+    target_gain = config['gain_total_target_dB']
+    nf_max_target = config['nf_max_dB']
+    p1db_min_target = config['p1db_min_dBm']
+
+    # élagage optionnel (nf_prune_margin_dB dans le YAML) : abandonne les placements de LNAs
+    # dont le NF dépasse déjà nf_max_dB + marge
+    nf_prune_dB = None
+    prune_margin = config.get('nf_prune_margin_dB')
+    if prune_margin is not None:
+        if nf_pruning_is_safe(table):
+            nf_prune_dB = nf_max_target + prune_margin
+        else:
+            print("⚠️ nf_prune_margin_dB ignoré : un atténuateur a un gain positif ou un NF < 0 dB.")
+
+    # générer toutes les architectures en insérant sous-ensembles de LNAs mobiles,
+    # puis scorer chaque lot (chaînes de même longueur) en une passe vectorisée.
+    # n_jobs (YAML, optionnel) : nombre de processus, -1 = tous les cœurs, 1 (défaut) = séquentiel
+    targets = (target_gain, nf_max_target, p1db_min_target)
+    # sous-ensembles de LNAs équivalents (ex : deux copies identiques d'un même LNA) :
+    # mêmes chaînes générées, un seul est gardé (clé canonique triée, ordre de première apparition)
+    canon = table['canon']
+    unique_subsets = {}
+    for lna_subset in non_empty_subsets(table['lna_ids']):
+        unique_subsets.setdefault(tuple(sorted(canon[i] for i in lna_subset)), lna_subset)
+    subsets = list(unique_subsets.values())
+    n_jobs = config.get('n_jobs', 1)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            # map conserve l'ordre des sous-ensembles -> résultats identiques au mode séquentiel
+            per_subset = list(executor.map(score_subset, subsets, itertools.repeat(table),
+                                           itertools.repeat(targets), itertools.repeat(nf_prune_dB)))
+    else:
+        per_subset = [score_subset(lna_subset, table, targets, nf_prune_dB) for lna_subset in subsets]
+
+    # concaténation des lots : une entrée par architecture, dans l'ordre de génération
+    chains = [chain for subset_chains, _, _ in per_subset for chain in subset_chains]
+    if not chains:
         print("❌ Aucune architecture générée.")
         return
+    metrics = np.concatenate([subset_metrics for _, subset_metrics, _ in per_subset], axis=1)
+    scores = np.concatenate([subset_scores for _, _, subset_scores in per_subset])
 
-    # scorer chaque architecture et écrire résultats
-    scored_archs = []
-    for arch in all_archs:
-        metrics = compute_metrics_gain_min_max(arch['full_chain'], attenuators)
-        score = score_architecture_metrics(metrics, target_gain, nf_max_target, p1db_min_target)
-        scored_archs.append({
-            'chain': arch['chain'],
-            'metrics': metrics,
-            'score': score
-        })
-
-    # tri et sauvegarde
-    scored_archs_sorted = sorted(scored_archs, key=lambda a: a['score'])
+    # tri (stable : à score égal, l'ordre de génération est conservé) et sauvegarde
+    order = np.argsort(scores, kind='stable')
     script_dir = os.path.dirname(os.path.abspath(__file__))
     results_path = os.path.join(script_dir, "results.txt")
-    with open(results_path, "w", encoding="utf-8") as f:
-        f.write("=== 🧪 Toutes les architectures testées : {} ===\n\n".format(len(scored_archs_sorted)))
-        for arch in scored_archs_sorted:
-            gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = arch['metrics']
-            f.write(f"Chaîne: {arch['chain']}\n")
-            f.write(f"  -> Gain min = {gain_min_dB:.2f} dB | Gain max = {gain_max_dB:.2f} dB\n")
-            f.write(f"     NF min   = {nf_min:.2f} dB    | NF max   = {nf_max:.2f} dB\n")
-            f.write(f"     OP1dB sort. min = {p1db_min:.2f} dBm | OP1dB sort. max = {p1db_max:.2f} dBm\n")
-            f.write(f"     IP1dB entr. min = {ip1_min:.2f} dBm | IP1dB entr. max = {ip1_max:.2f} dBm\n")
-            f.write(f"     Score    = {arch['score']:.4f}\n\n")
+    # rapport construit en une seule chaîne (un seul write, gros tampon) plutôt que
+    # plusieurs f.write par architecture
+    rows = metrics.T[order].tolist()
+    scores_sorted = scores[order].tolist()
+    report = "".join([RESULT_FMT % (chains[k], *row, score)
+                      for k, row, score in zip(order.tolist(), rows, scores_sorted)])
+    with open(results_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("=== 🧪 Toutes les architectures testées : {} ===\n\n".format(len(chains)))
+        f.write(report)
 
     # afficher meilleure architecture
-    best_arch = scored_archs_sorted[0]
-    gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = best_arch['metrics']
+    best = order[0]
+    gain_min_dB, gain_max_dB, nf_min, nf_max, p1db_min, p1db_max, ip1_min, ip1_max = metrics[:, best]
 
     print("\n=== ✅ Meilleure architecture trouvée ===")
-    print(f"Chaîne: {best_arch['chain']}\n")
+    print(f"Chaîne: {chains[best]}\n")
     print(f"Gain min (atténuateurs à min) : {gain_min_dB:.2f} dB")
     print(f"Gain max (atténuateurs à max) : {gain_max_dB:.2f} dB\n")
     print(f"NF min (gain min)              : {nf_min:.2f} dB")
@@ -450,7 +760,7 @@ def main():
     print(f"OP1dB sortie (max)             : {p1db_max:.2f} dBm\n")
     print(f"IP1dB entrée (min)             : {ip1_min:.2f} dBm")
     print(f"IP1dB entrée (max)             : {ip1_max:.2f} dBm\n")
-    print(f"Score                          : {best_arch['score']:.4f}\n")
+    print(f"Score                          : {scores[best]:.4f}\n")
 
 if __name__ == "__main__":
     main()
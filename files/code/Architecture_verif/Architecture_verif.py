@@ -26,8 +26,15 @@ Attention :
 import yaml
 import math
 import os
+import numpy as np
 from colorama import init, Fore, Back, Style
 
+try:
+    # chargeur YAML adossé à libyaml (bien plus rapide), si PyYAML a été compilé avec
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Active colorama (réinitialisation automatique des styles après chaque print)
 init(autoreset=True)
 
@@ -71,12 +78,22 @@ def lin_to_db(lin):
     """
     return 10 * math.log10(lin)
 
+# ---------- Représentation de la chaîne (tableau structuré numpy) ----------
+
+# un élément par étage ; chaque champ (chain['gain_lin'], ...) se lit comme un tableau
+CHAIN_DTYPE = np.dtype([
+    ('gain_lin', 'f8'),
+    ('nf_lin', 'f8'),
+    ('p1db_lin', 'f8'),
+    ('gain_dB', 'f8'),
+], align=True)
+
 # ---------- Calcul de la figure de bruit totale (Friis) ----------
 
 def calc_nf(chain):
     """
     Calcule la NF totale (en dB) d'une chaîne donnée.
-    Entrée : chain = liste d'étages, chaque élément doit contenir :
+    Entrée : chain = tableau de CHAIN_DTYPE, dont les champs :
       - 'nf_lin'   : NF en linéaire (pas en dB)
       - 'gain_lin' : gain (linéaire, ratio de puissance)
     Algorithme : formule de Friis :
@@ -84,14 +101,17 @@ def calc_nf(chain):
     Retour : NF totale en dB (utilise lin_to_db).
     Remarque : la 1ère NF doit être en linéaire et non nulle.
     """
+    # colonnes du tableau converties une fois en listes de floats Python (boucle courte)
+    gain_lin = chain['gain_lin'].tolist()
+    nf_lin = chain['nf_lin'].tolist()
     # NF linéaire du premier étage
-    nf_tot = chain[0]['nf_lin']
+    nf_tot = nf_lin[0]
     # produit cumulatif des gains (linéaire) des étages déjà rencontrés
-    g_prod = chain[0]['gain_lin']
+    g_prod = gain_lin[0]
     # boucle sur les étages suivants
-    for stage in chain[1:]:
-        nf_tot += (stage['nf_lin'] - 1) / g_prod
-        g_prod *= stage['gain_lin']
+    for i in range(1, len(gain_lin)):
+        nf_tot += (nf_lin[i] - 1) / g_prod
+        g_prod *= gain_lin[i]
     return lin_to_db(nf_tot)
 
 # ---------- Calcul de l'OP1dB total en sortie ----------
@@ -107,22 +127,23 @@ def calc_p1db(chain):
       - P_total (mW) = 1 / somme_inverse
       - retour en dBm via lin_to_db (car lin_to_db( mW ) -> dBm)
     Hypothèses / limites :
-      - si un p1db_lin est nul ou manquant, cela lèvera une ZeroDivisionError.
+      - un étage sans OP1dB (p1db_lin = +inf) est non contraignant : il ne contribue pas à la somme.
+      - si aucun étage n'a d'OP1dB, le résultat est +inf.
+      - si un p1db_lin est nul, cela lèvera une erreur.
       - s'assurer que gains et p1db sont en linéaire avant l'appel.
     """
-    N = len(chain)
-    gain_after = [1.0] * N  # gain total placé après chaque étage (linéaire)
-    prod = 1.0
-    # construire gain_after en sens inverse : gain_after[i] = produit(gain_k pour k>i)
-    for idx in range(N-1, -1, -1):
-        gain_after[idx] = prod
-        prod *= chain[idx]['gain_lin']
-
-    # somme des inverses pondérées
-    inv_sum = sum(
-        1 / (stage['p1db_lin'] * gain_after[i])
-        for i, stage in enumerate(chain)
-    )
+    gain_lin = chain['gain_lin'].tolist()
+    p1db_lin = chain['p1db_lin'].tolist()
+    # une seule passe en sens inverse : g_after = produit(gain_k pour k>i), mis à jour
+    # après la contribution de l'étage i (pas de tableau gain_after intermédiaire)
+    g_after = 1.0
+    inv_sum = 0.0
+    for i in range(len(gain_lin) - 1, -1, -1):
+        if math.isfinite(p1db_lin[i]):
+            inv_sum += 1 / (p1db_lin[i] * g_after)
+        g_after *= gain_lin[i]
+    if inv_sum == 0:
+        return math.inf
     # résultat en mW -> lin_to_db retourne dBm
     return lin_to_db(1 / inv_sum)
 
@@ -139,16 +160,18 @@ def build_chain(arch, use_gain_max=False):
       - Pour les filtres et switches, on considère que la NF (en dB) = perte d'insertion (insertion_loss_dB).
         => gain_dB = - insertion_loss_dB  (car perte)
       - Si nf_dB absent pour un amplificateur, on prend nf_dB = |gain_dB| (approximation conservative)
-      - Si op1db_dBm absent, valeur par défaut distante (ici 1000 dBm) -> attention overflow possible si converti en mW
-        (la valeur 1000 sert d'indicateur "virtuel" d'absence de contrainte ; c'est une pratique risquée en calculs réels)
+      - Si op1db_dBm absent, p1db_lin = +inf : l'étage est non contraignant et explicitement
+        exclu du calcul d'OP1dB (pas de valeur sentinelle type 1000 dBm -> 1e100 mW)
     Retour :
-      liste de dicts : { 'name', 'type', 'gain_lin', 'nf_lin', 'p1db_lin' }
+      tableau numpy de CHAIN_DTYPE (un élément par étage, dans l'ordre de arch) :
       - gain_lin : facteur (unitless)
       - nf_lin   : ratio linéaire (>1)
-      - p1db_lin : puissance en mW (linéaire)
+      - p1db_lin : puissance en mW (linéaire), +inf si op1db_dBm absent
+      - gain_dB  : gain en dB (conservé pour sommer les gains sans aller-retour linéaire)
+      (noms et types restent dans arch)
     """
-    chain = []
-    for c in arch:
+    chain = np.empty(len(arch), dtype=CHAIN_DTYPE)
+    for i, c in enumerate(arch):
         # si composant passif de filtrage => perte fournie
         if c['type'] in ['filter', 'switch']:
             loss = c['insertion_loss_dB']  # valeur positive (dB)
@@ -160,17 +183,15 @@ def build_chain(arch, use_gain_max=False):
             # NF fourni ou estimation conservatrice (abs(gain_dB))
             nf_dB = c.get('nf_dB', abs(gain_dB))
 
-        # OP1dB : si présent, valeur en dBm ; sinon 1000 (valeur par défaut)
-        # NOTE : 1000 dBm -> db_to_lin(1000) fera 10**(100) -> très grand float
-        p1dB = c.get('op1db_dBm', 1000)
-
-        chain.append({
-            'name': c['name'],
-            'type': c['type'],
-            'gain_lin': db_to_lin(gain_dB),
-            'nf_lin': db_to_lin(nf_dB),
-            'p1db_lin': db_to_lin(p1dB)
-        })
+        # OP1dB : si présent, valeur en dBm ; sinon +inf (non contraignant, masqué dans calc_p1db)
+        p1dB = c.get('op1db_dBm')
+
+        chain[i] = (
+            db_to_lin(gain_dB),
+            db_to_lin(nf_dB),
+            db_to_lin(p1dB) if p1dB is not None else math.inf,
+            gain_dB
+        )
     return chain
 
 # ---------- Fonctions d'affichage console (colorées) ----------
@@ -220,7 +241,7 @@ def main():
 
     # chargement YAML
     with open(path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
     arch = data['architecture']
 
     # construire chaînes min / max
@@ -231,15 +252,15 @@ def main():
     nf_min, nf_max = calc_nf(ch_min), calc_nf(ch_max)
     p1_min, p1_max = calc_p1db(ch_min), calc_p1db(ch_max)
 
-    # gains totaux (dB) : produit des gains linéaires passé en dB
-    g_min = lin_to_db(math.prod(s['gain_lin'] for s in ch_min))
-    g_max = lin_to_db(math.prod(s['gain_lin'] for s in ch_max))
+    # gains totaux (dB) : somme directe des gains en dB (équivalent au produit en linéaire)
+    g_min = float(ch_min['gain_dB'].sum())
+    g_max = float(ch_max['gain_dB'].sum())
 
     # IP1dB entrée = OP1dB_sortie - Gain_total
     ip1_min, ip1_max = p1_min - g_min, p1_max - g_max
 
     # affichage chaîne (avec couleurs par type)
-    line = " → ".join(f"{TYPE_COLORS.get(s['type'], '')}{s['name']}{Style.RESET_ALL}" for s in ch_min)
+    line = " → ".join(f"{TYPE_COLORS.get(c['type'], '')}{c['name']}{Style.RESET_ALL}" for c in arch)
 
     print_spacers()
     print(f"{Back.BLACK+Fore.WHITE}{'■'*3} {'Chaîne RF':<8}:{Style.RESET_ALL} {line}\n")
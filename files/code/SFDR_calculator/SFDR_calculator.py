@@ -1,5 +1,12 @@
 import yaml
 import math
+import numpy as np
+
+try:
+    # chargeur YAML adossé à libyaml (bien plus rapide), si PyYAML a été compilé avec
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # -----------------------------------------------------------
 # Calcule la puissance de bruit intégrée dans une bande donnée
@@ -31,6 +38,8 @@ def calculate_sfdr(ip1db_dbm: float, nf_db: float, bw_hz: float,
                    delta_db: float = 10.0) -> float:
     """
     SFDR (Spurious-Free Dynamic Range), exprimé en dB.
+    ip1db_dbm et nf_db peuvent être des tableaux numpy (une valeur par fréquence) :
+    le calcul est alors fait en une passe pour toutes les fréquences.
     Formule utilisée :
         SFDR = (2/3) * (IIP3 - N)
     où :
@@ -48,7 +57,7 @@ def calculate_sfdr(ip1db_dbm: float, nf_db: float, bw_hz: float,
 def main():
     # Ouverture du fichier YAML contenant les paramètres
     with open("params.yaml", "r") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
 
     # Bande passante extraite du fichier
     bw = data["bandwidth_hz"]
@@ -57,20 +66,21 @@ def main():
     # En-tête du tableau affiché
     print(f"{'Freq (GHz)':>8} {'SFDR min (dB)':>14} {'SFDR max (dB)':>14}")
 
-    # Parcours de chaque fréquence définie dans le YAML
-    for f in data["frequencies"]:
-        freq      = f["freq_ghz"]
-        nf_min    = f["nf_gain_min"]   # ← ATTENTION : vérifier que ce champ est bien une NF
-        nf_max    = f["nf_gain_max"]
-        ip1_min   = f["ip1db_min"]
-        ip1_max   = f["ip1db_max"]
+    # Colonnes des fréquences définies dans le YAML (un tableau par champ)
+    freqs     = data["frequencies"]
+    freq      = np.array([f["freq_ghz"] for f in freqs], dtype=float)
+    nf_min    = np.array([f["nf_gain_min"] for f in freqs], dtype=float)   # ← ATTENTION : vérifier que ce champ est bien une NF
+    nf_max    = np.array([f["nf_gain_max"] for f in freqs], dtype=float)
+    ip1_min   = np.array([f["ip1db_min"] for f in freqs], dtype=float)
+    ip1_max   = np.array([f["ip1db_max"] for f in freqs], dtype=float)
 
-        # Calcul SFDR avec les valeurs min et max
-        sfdr_min  = calculate_sfdr(ip1_min, nf_min, bw)
-        sfdr_max  = calculate_sfdr(ip1_max, nf_max, bw)
+    # Calcul SFDR avec les valeurs min et max, pour toutes les fréquences à la fois
+    sfdr_min  = calculate_sfdr(ip1_min, nf_min, bw)
+    sfdr_max  = calculate_sfdr(ip1_max, nf_max, bw)
 
-        # Affichage formaté
-        print(f"{freq:8.2f} {sfdr_min:14.2f} {sfdr_max:14.2f}")
+    # Affichage formaté
+    for f, s_min, s_max in zip(freq.tolist(), sfdr_min.tolist(), sfdr_max.tolist()):
+        print(f"{f:8.2f} {s_min:14.2f} {s_max:14.2f}")
 
 
 # -----------------------------------------------------------
@@ -15,27 +15,55 @@ Remarques :
 """
 
 from pathlib import Path
+import pickle
 import sys
 import yaml
+import numpy as np
 from typing import List, Optional, Tuple
 
+try:
+    # chargeur YAML adossé à libyaml (bien plus rapide), si PyYAML a été compilé avec
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # ---------------------------
 # Fonctions utilitaires
 # ---------------------------
 
 def charger_parametres_yaml(fichier_yaml: str) -> dict:
     """Charge et renvoie le contenu YAML sous forme de dict Python.
-    Lève une exception si le fichier est introuvable ou invalide."""
+    Lève une exception si le fichier est introuvable ou invalide.
+    Le dict est mis en cache (pickle) dans '<fichier>.yaml.pkl' à côté du YAML : tant que
+    le YAML n'a pas été modifié (même mtime), il est relu depuis ce cache sans parsing YAML.
+    Un cache illisible est ignoré ; un cache impossible à écrire n'empêche pas le calcul."""
     p = Path(fichier_yaml)
     if not p.exists():
         raise FileNotFoundError(f"Fichier YAML introuvable : {p}")
+    cache = p.with_suffix(".yaml.pkl")
+    yaml_mtime = p.stat().st_mtime
+
+    try:
+        with cache.open("rb") as f:
+            cached = pickle.load(f)
+        if cached["yaml_mtime"] == yaml_mtime:
+            return cached["data"]
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError, AttributeError):
+        pass
+
     with p.open("r", encoding="utf-8") as f:
         try:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
         except yaml.YAMLError as e:
             raise RuntimeError(f"Erreur lecture YAML : {e}") from e
     if not isinstance(data, dict):
         raise ValueError("Le fichier YAML doit contenir un mapping (dictionnaire) en racine.")
+
+    try:
+        with cache.open("wb") as f:
+            pickle.dump({"yaml_mtime": yaml_mtime, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
     return data
 
 
@@ -70,6 +98,43 @@ def get_puissance(m: int, n: int, table: Optional[List[List]]) -> Optional[float
         return None
 
 
+def construire_lut_puissances(table: Optional[List[List]]) -> Optional[np.ndarray]:
+    """
+    Convertit une fois la table 'puissance_spurious' (liste de listes) en tableau float64
+    de même convention d'indexation que get_puissance (ligne abs(m)-1, colonne abs(n)).
+    Les valeurs non fournies ('ref', 'na', invalides, lignes plus courtes) valent NaN.
+    Retourne None si pas de table.
+    """
+    if table is None:
+        return None
+    n_col = max((len(ligne) for ligne in table), default=0)
+    lut = np.full((len(table), n_col), np.nan)
+    for im, ligne in enumerate(table):
+        for in_ in range(len(ligne)):
+            p = get_puissance(im + 1, in_, table)
+            if p is not None:
+                lut[im, in_] = p
+    return lut
+
+
+# ---------------------------
+# Représentation des résultats
+# ---------------------------
+
+# type de produit de mélange, codé sur un octet (champ 'type' de RESULTATS_DTYPE)
+TYPE_UTILE, TYPE_IMAGE, TYPE_SPURIOUS, TYPE_FUITE = 0, 1, 2, 3
+
+# une ligne par couple (m,n) retenu ; RF en float64 pour conserver exactement les
+# valeurs arrondies au centième (float32 décalerait l'affichage de certaines bornes)
+RESULTATS_DTYPE = np.dtype([
+    ("m", "i2"),
+    ("n", "i2"),
+    ("type", "u1"),
+    ("RF_min", "f8"),
+    ("RF_max", "f8"),
+])
+
+
 # ---------------------------
 # Calculs principaux
 # ---------------------------
@@ -91,11 +156,62 @@ def calculer_plage_image(params: dict) -> Tuple[float, float]:
         raise ValueError("Mode de conversion invalide (attendu 'supradyne' ou 'infradyne')")
 
 
-def calculer_plages(params: dict) -> List[dict]:
+def plages_mn(m_max: int, n_max: int, OL: float, FI_min: float, FI_max: float,
+              RF_min: float, RF_max: float) -> np.ndarray:
+    """
+    Noyau numérique de calculer_plages : plages RF (non arrondies) de tous les couples
+    (m,n) dont le produit de mélange tombe dans la bande FI.
+    Calcul d'un coup sur la grille (m,n) (tableaux numpy, m en lignes / n en colonnes).
+    Retourne un tableau float64 (K, 4) de colonnes m, n, RF_min, RF_max, dans l'ordre
+    m croissant puis n croissant.
+    """
+    m = np.arange(-m_max, m_max + 1)[:, None]   # (M, 1)
+    n = np.arange(-n_max, n_max + 1)[None, :]   # (1, N)
+    n_OL = n * OL
+
+    # divisions par m == 0 sans avertissement : ces cases sont remplacées plus bas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # CAS général : résoudre m*RF + n*OL ∈ [FI_min, FI_max]
+        rf1 = (FI_min - n_OL) / m
+        rf2 = (FI_max - n_OL) / m
+        lo = np.minimum(rf1, rf2)
+        hi = np.maximum(rf1, rf2)
+
+        # CAS n == 0 => FI = m * RF  => RF = FI / |m|
+        lo = np.where(n == 0, FI_min / np.abs(m), lo)
+        hi = np.where(n == 0, FI_max / np.abs(m), hi)
+
+    lo_c = np.maximum(lo, RF_min)
+    hi_c = np.minimum(hi, RF_max)
+    valid = lo_c <= hi_c
+
+    # CAS m == 0 => le produit ne dépend que de n*OL (fuite possible) : toute la bande RF
+    FI_fuite = np.abs(n_OL)
+    fuite_dans_fi = (FI_min <= FI_fuite) & (FI_fuite <= FI_max)
+    lo_c = np.where(m == 0, RF_min, lo_c)
+    hi_c = np.where(m == 0, RF_max, hi_c)
+    valid = np.where(m == 0, fuite_dans_fi, valid)
+
+    # ignore le cas trivial (0,0)
+    valid &= ~((m == 0) & (n == 0))
+
+    # argwhere et le masque booléen parcourent la grille dans le même ordre (m puis n)
+    ij = np.argwhere(valid)
+    plages = np.empty((len(ij), 4), dtype=np.float64)
+    plages[:, 0] = ij[:, 0] - m_max
+    plages[:, 1] = ij[:, 1] - n_max
+    plages[:, 2] = lo_c[valid]
+    plages[:, 3] = hi_c[valid]
+    return plages
+
+
+def calculer_plages(params: dict) -> np.ndarray:
     """
-    Parcourt tous les couples (m,n) et renvoie une liste d'entrées :
-      { 'm': int, 'n': int, 'type': 'utile'|'image'|'spurious'|'fuite', 'RF_min': float, 'RF_max': float }
-    Explications de traitement dans les commentaires du code.
+    Parcourt tous les couples (m,n) et renvoie un tableau structuré (RESULTATS_DTYPE),
+    une ligne par couple retenu :
+      m, n, type (TYPE_UTILE | TYPE_IMAGE | TYPE_SPURIOUS | TYPE_FUITE), RF_min, RF_max
+    Les plages sont calculées par plages_mn ; étiquetage et arrondi sont faits ensuite.
+    Les lignes suivent l'ordre m croissant puis n croissant.
     """
     m_max = int(params["m_max"])
     n_max = int(params["n_max"])
@@ -104,64 +220,29 @@ def calculer_plages(params: dict) -> List[dict]:
     RF_min, RF_max = float(params["RF_min_MHz"]), float(params["RF_max_MHz"])
     mode = params.get("from", "supradyne").lower().strip()
 
-    resultats: List[dict] = []
-
-    for m in range(-m_max, m_max + 1):
-        for n in range(-n_max, n_max + 1):
-            # ignore le cas trivial (0,0)
-            if m == 0 and n == 0:
-                continue
-
-            try:
-                # CAS m == 0 => le produit ne dépend que de n*OL (fuite possible)
-                if m == 0:
-                    FI = abs(n * OL)
-                    if not (FI_min <= FI <= FI_max):
-                        continue
-                    lo_c, hi_c = RF_min, RF_max
-
-                # CAS n == 0 => FI = m * RF  => RF = FI / m
-                elif n == 0:
-                    lo = FI_min / abs(m)
-                    hi = FI_max / abs(m)
-                    lo_c = max(lo, RF_min)
-                    hi_c = min(hi, RF_max)
-                    if lo_c > hi_c:
-                        continue
-
-                # CAS général : résoudre m*RF + n*OL ∈ [FI_min, FI_max]
-                else:
-                    rf1 = (FI_min - n * OL) / m
-                    rf2 = (FI_max - n * OL) / m
-                    lo, hi = sorted((rf1, rf2))
-                    lo_c = max(lo, RF_min)
-                    hi_c = min(hi, RF_max)
-                    if lo_c > hi_c:
-                        continue
-
-            except ZeroDivisionError:
-                # sécurité (normalement non atteint car m == 0 géré)
-                continue
-
-            # étiquetage
-            if m == 0 or n == 0:
-                label = "fuite"
-            elif (mode == "supradyne" and (m, n) == (-1, 1)) \
-              or (mode == "infradyne" and (m, n) == (1, -1)):
-                label = "utile"
-            elif (mode == "supradyne" and (m, n) == (1, -1)) \
-              or (mode == "infradyne" and (m, n) == (-1, 1)):
-                label = "image"
-            else:
-                label = "spurious"
+    plages = plages_mn(m_max, n_max, OL, FI_min, FI_max, RF_min, RF_max)
+    resultats = np.empty(len(plages), dtype=RESULTATS_DTYPE)
+    resultats["m"] = plages[:, 0]
+    resultats["n"] = plages[:, 1]
+
+    # étiquetage par masques sur les colonnes m / n (spurious par défaut)
+    m = resultats["m"]
+    n = resultats["n"]
+    labels = np.full(len(resultats), TYPE_SPURIOUS, dtype=np.int8)
+    # supradyne : (-1, 1) utile, (1, -1) image ; infradyne : l'inverse
+    if mode == "supradyne":
+        labels[(m == -1) & (n == 1)] = TYPE_UTILE
+        labels[(m == 1) & (n == -1)] = TYPE_IMAGE
+    elif mode == "infradyne":
+        labels[(m == 1) & (n == -1)] = TYPE_UTILE
+        labels[(m == -1) & (n == 1)] = TYPE_IMAGE
+    labels[(m == 0) | (n == 0)] = TYPE_FUITE
+    resultats["type"] = labels
 
-            resultats.append({
-                "m":      m,
-                "n":      n,
-                "type":   label,
-                "RF_min": round(lo_c, 2),
-                "RF_max": round(hi_c, 2),
-            })
+    # arrondi au centième (round Python, sur des floats Python) : np.round(x, 2) multiplie
+    # par 100 avant d'arrondir et ne donne pas toujours le même résultat (ex : 2592.995)
+    resultats["RF_min"] = [round(v, 2) for v in plages[:, 2].tolist()]
+    resultats["RF_max"] = [round(v, 2) for v in plages[:, 3].tolist()]
 
     return resultats
 
@@ -198,30 +279,42 @@ def generer_rapport_interference(params: dict) -> List[str]:
 # Génération du rapport
 # ---------------------------
 
-def sauvegarder_rapport(resultats: List[dict], fichier: str, params: dict, table_puiss=None, plage_image=None) -> None:
+def sauvegarder_rapport(resultats: np.ndarray, fichier: str, params: dict, table_puiss=None, plage_image=None) -> None:
     """
-    Génère le rapport texte final 'fichier'.
-    Tri :
+    Génère le rapport texte final 'fichier' à partir du tableau structuré de calculer_plages.
+    Sections extraites par masque sur le champ 'type'.
+    Tri (np.lexsort, stable, sur des colonnes de clés) :
       - si table_puiss fournie : tri d'abord par puissance si disponible (valeur numérique plus petite = prioritaire),
         sinon par complexité (|m|+|n|).
       - sinon : tri par complexité.
     Format d'écriture humain lisible.
     """
-    sections = {"utile": [], "image": [], "spurious": [], "fuite": []}
-    for r in resultats:
-        sections[r["type"]].append(r)
+    utiles = resultats[resultats["type"] == TYPE_UTILE]
+    sp = resultats[resultats["type"] == TYPE_SPURIOUS]
 
-    sp = sections["spurious"]
+    # |m|, |n| et complexité |m|+|n| calculés une seule fois par spurious (colonnes de clés de tri)
+    abs_m = np.abs(sp["m"].astype(np.int32))
+    abs_n = np.abs(sp["n"].astype(np.int32))
+    complexite = abs_m + abs_n
 
+    # puissance de chaque spurious, lue par indexation de la table convertie
+    # (NaN sans table, hors table ou si non fournie)
+    pwr = np.full(len(sp), np.nan)
     if table_puiss is not None:
-        # tri en combinant puissance (si dispo) puis complexité
-        def key_fn(x):
-            p = get_puissance(x["m"], x["n"], table_puiss)
-            p_key = p if p is not None else float('inf')
-            return (p_key, abs(x["m"]) + abs(x["n"]), abs(x["m"]), abs(x["n"]), x["RF_min"])
-        sp.sort(key=key_fn)
-    else:
-        sp.sort(key=lambda x: (abs(x["m"]) + abs(x["n"]), abs(x["m"]), abs(x["n"]), x["RF_min"]))
+        lut = construire_lut_puissances(table_puiss)
+        im = abs_m - 1
+        dans_table = (im >= 0) & (im < lut.shape[0]) & (abs_n < lut.shape[1])
+        pwr[dans_table] = lut[im[dans_table], abs_n[dans_table]]
+
+    # clés de tri : (puissance si table fournie,) complexité |m|+|n|, |m|, |n|, RF_min
+    # (np.lexsort trie sur la DERNIÈRE clé d'abord : liste donnée de la moins à la plus prioritaire)
+    cles = [sp["RF_min"], abs_n, abs_m, complexite]
+    if table_puiss is not None:
+        # tri en combinant puissance (si dispo, sinon +inf) puis complexité
+        cles.append(np.where(np.isnan(pwr), np.inf, pwr))
+    ordre = np.lexsort(cles)
+    sp = sp[ordre]
+    pwr_str = ["" if np.isnan(p) else "%.1f" % p for p in pwr[ordre].tolist()]
 
     # écriture sécurisée du fichier (créera/écrasera)
     p_out = Path(fichier)
@@ -229,15 +322,15 @@ def sauvegarder_rapport(resultats: List[dict], fichier: str, params: dict, table
         with p_out.open("w", encoding="utf-8") as f:
             # Interférences directes OL/FI et RF/FI
             interferences = generer_rapport_interference(params)
-            for ligne in interferences:
-                f.write(ligne + "\n")
+            f.write("".join([ligne + "\n" for ligne in interferences]))
 
             # Fréquences utiles
             f.write("=== Fréquences utiles ===\n")
-            f.write(f"Nombre total : {len(sections['utile'])}\n")
+            f.write(f"Nombre total : {len(utiles)}\n")
             f.write("m,   n,  RF_min (MHz),  RF_max (MHz)\n")
-            for u in sections["utile"]:
-                f.write(f"{u['m']:3d}, {u['n']:3d}, {u['RF_min']:12.1f}, {u['RF_max']:12.1f}\n")
+            # une ligne formatée (%) par entrée, un seul write par section
+            f.write("".join(["%3d, %3d, %12.1f, %12.1f\n" % (m, n, rf_min, rf_max)
+                             for m, n, _, rf_min, rf_max in utiles.tolist()]))
             f.write("\n")
 
             # Fréquences images
@@ -252,10 +345,9 @@ def sauvegarder_rapport(resultats: List[dict], fichier: str, params: dict, table
             f.write("=== Spurious complexes (triés) ===\n")
             f.write(f"Nombre total : {len(sp)}\n")
             f.write("m,   n,  RF_min (MHz),  RF_max (MHz), Puissance (dBc)\n")
-            for s in sp:
-                pwr = get_puissance(s['m'], s['n'], table_puiss) if table_puiss is not None else None
-                pwr_str = f"{pwr:.1f}" if pwr is not None else ""
-                f.write(f"{s['m']:3d}, {s['n']:3d}, {s['RF_min']:12.1f}, {s['RF_max']:12.1f},       {pwr_str:15}\n")
+            f.write("".join(["%3d, %3d, %12.1f, %12.1f,       %-15s\n"
+                             % (m, n, rf_min, rf_max, p_str)
+                             for (m, n, _, rf_min, rf_max), p_str in zip(sp.tolist(), pwr_str)]))
             f.write("\n")
     except OSError as e:
         raise RuntimeError(f"Impossible d'écrire le fichier de sortie '{p_out}': {e}") from e
@@ -1,54 +1,58 @@
 import numpy as np
 import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
 
-def convert_s2p_to_two_dat_files(s2p_path):
-    freqs = []
-    s11_db = []
-    s21_db = []
-
-    with open(s2p_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('#') or not line:
-                continue  # Ignore commentaires et lignes vides
-
-            parts = line.split()
-            if len(parts) < 5:
-                continue  # Faut au moins freq, S11, S21
+# Format d'une ligne des fichiers .dat : fréquence (Hz, entière) <tab> module (dB, 2 décimales)
+DAT_FMT = "%.0f\t%.2f"
 
-            freq = float(parts[0])
-            s11_real, s11_imag = float(parts[1]), float(parts[2])
-            s21_real, s21_imag = float(parts[3]), float(parts[4])
+def lignes_de_donnees(f):
+    # Lignes ayant au moins 5 champs hors commentaire (freq, S11, S21) ; les autres sont ignorées
+    for line in f:
+        if len(line.split('!', 1)[0].split('#', 1)[0].split()) >= 5:
+            yield line
 
-            s11_mag = np.abs(complex(s11_real, s11_imag))
-            s21_mag = np.abs(complex(s21_real, s21_imag))
+def convert_s2p_to_two_dat_files(s2p_path):
+    # Lecture de tout le fichier en une fois : commentaires ('#' options, '!' Touchstone) ignorés,
+    # colonnes freq, Re/Im S11, Re/Im S21 (les colonnes S12/S22 éventuelles ne sont pas lues)
+    with open(s2p_path, 'r') as f:
+        data = np.loadtxt(lignes_de_donnees(f), comments=('#', '!'), usecols=range(5), ndmin=2)
 
-            s11_db_val = 20 * np.log10(s11_mag) if s11_mag > 0 else -100
-            s21_db_val = 20 * np.log10(s21_mag) if s21_mag > 0 else -100
+    freqs = data[:, 0]
+    # magnitudes |Re + j.Im| directement par hypot (sans tableau complexe intermédiaire)
+    s11_mag = np.hypot(data[:, 1], data[:, 2])
+    s21_mag = np.hypot(data[:, 3], data[:, 4])
 
-            freqs.append(freq)
-            s11_db.append(s11_db_val)
-            s21_db.append(s21_db_val)
+    # -100 dB pour une magnitude nulle (évite log10(0))
+    with np.errstate(divide='ignore'):
+        s11_db = np.where(s11_mag > 0, 20 * np.log10(s11_mag), -100)
+        s21_db = np.where(s21_mag > 0, 20 * np.log10(s21_mag), -100)
 
     # Préparation des noms de fichiers
     base_name = os.path.splitext(s2p_path)[0]
     s11_path = base_name + "_S11.dat"
     s21_path = base_name + "_S21.dat"
 
-    # Écriture du fichier S11
-    with open(s11_path, 'w') as f_s11:
-        f_s11.write("# Frequency(Hz)\tS11(dB)\n")
-        for f, s11 in zip(freqs, s11_db):
-            f_s11.write(f"{f:.0f}\t{s11:.2f}\n")
-
-    # Écriture du fichier S21
-    with open(s21_path, 'w') as f_s21:
-        f_s21.write("# Frequency(Hz)\tS21(dB)\n")
-        for f, s21 in zip(freqs, s21_db):
-            f_s21.write(f"{f:.0f}\t{s21:.2f}\n")
+    # Écriture des fichiers S11 et S21
+    np.savetxt(s11_path, np.column_stack((freqs, s11_db)), fmt=DAT_FMT,
+               header="Frequency(Hz)\tS11(dB)", comments="# ")
+    np.savetxt(s21_path, np.column_stack((freqs, s21_db)), fmt=DAT_FMT,
+               header="Frequency(Hz)\tS21(dB)", comments="# ")
 
     print(f"✅ Fichiers créés :\n - {s11_path}\n - {s21_path}")
 
-# Utilisation
-s2p_file = "C:/Users/a942666/OneDrive - ATOS/Bureau/bank_18_24/LFCV-2302+_Plus25DegC.s2p"
-convert_s2p_to_two_dat_files(s2p_file)
+def convert_batch(s2p_paths, max_workers=None):
+    # Conversion de plusieurs fichiers .s2p en parallèle (un processus par fichier, indépendants).
+    # max_workers=None : autant de processus que de cœurs
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # list() : attend la fin de toutes les conversions et remonte une éventuelle erreur
+        list(executor.map(convert_s2p_to_two_dat_files, s2p_paths))
+
+# Utilisation (protégée par __main__ : indispensable avec ProcessPoolExecutor sous Windows)
+if __name__ == "__main__":
+    # Un seul fichier :
+    #   convert_s2p_to_two_dat_files("C:/Users/a942666/OneDrive - ATOS/Bureau/bank_18_24/LFCV-2302+_Plus25DegC.s2p")
+    # Tous les fichiers .s2p du dossier de la banque :
+    bank_dir = "C:/Users/a942666/OneDrive - ATOS/Bureau/bank_18_24"
+    s2p_files = sorted(glob.glob(os.path.join(bank_dir, "*.s2p")))
+    convert_batch(s2p_files)
@@ -1,5 +1,8 @@
 import os  # Permet de manipuler fichiers et dossiers
 
+# Format d'une ligne des fichiers .dat : fréquence <tab> valeur (recopiées telles quelles)
+LIGNE_DAT = "%s\t%s\n"
+
 # === FONCTION PRINCIPALE ===
 def convert_s2p(s2p_path: str, output_dir: str):
     """
@@ -22,14 +25,13 @@ def convert_s2p(s2p_path: str, output_dir: str):
     s11_out = os.path.join(output_dir, f"{base}_S11.dat")
     s21_out = os.path.join(output_dir, f"{base}_S21.dat")
 
-    # Ouvre le fichier .s2p pour lecture et les fichiers de sortie pour écriture
-    with open(s2p_path, "r") as fin, \
-         open(s11_out, "w") as f11, \
-         open(s21_out, "w") as f21:
+    # Listes des lignes à écrire : tout est accumulé en mémoire puis écrit
+    # en une seule fois par fichier (un seul write au lieu d'un par ligne)
+    lignes_s11 = ["# freq(Hz)\tS11\n"]  # Titres des colonnes des fichiers .dat
+    lignes_s21 = ["# freq(Hz)\tS21\n"]
 
-        # Écrit les titres des colonnes dans les fichiers .dat
-        f11.write("# freq(Hz)\tS11\n")
-        f21.write("# freq(Hz)\tS21\n")
+    # Ouvre le fichier .s2p pour lecture
+    with open(s2p_path, "r") as fin:
 
         # Parcourt chaque ligne du fichier .s2p
         for line in fin:
@@ -49,9 +51,15 @@ def convert_s2p(s2p_path: str, output_dir: str):
             # On prend la fréquence, S11 et S21 (colonne 0,1,3)
             freq, s11, s21 = parts[0], parts[1], parts[3]
 
-            # Écrit les données dans les fichiers de sortie
-            f11.write(f"{freq}\t{s11}\n")
-            f21.write(f"{freq}\t{s21}\n")
+            # Ajoute les données aux lignes des fichiers de sortie
+            lignes_s11.append(LIGNE_DAT % (freq, s11))
+            lignes_s21.append(LIGNE_DAT % (freq, s21))
+
+    # Écrit chaque fichier de sortie en une fois (valeurs recopiées telles quelles)
+    with open(s11_out, "w", buffering=1 << 20) as f11:
+        f11.write("".join(lignes_s11))
+    with open(s21_out, "w", buffering=1 << 20) as f21:
+        f21.write("".join(lignes_s21))
 
     # Affiche un message pour dire que la conversion est terminée
     print(f"✅ Fichier converti : {s2p_path}")
@@ -10,6 +10,8 @@ Ligne 7 :
 """
 
 import os
+import sys
+import hashlib
 import itertools
 
 # -------------------------------------------------------------------------
@@ -26,28 +28,41 @@ for path in (file1_path, file2_path):
         raise FileNotFoundError(f"Introuvable : {path}")
 
 # -------------------------------------------------------------------------
-# Lecture des fichiers
+# Raccourci : fichiers identiques octet pour octet (même taille et même hash)
+# -> pas de comparaison ligne par ligne
 # -------------------------------------------------------------------------
-with open(file1_path, encoding="utf-8") as f1, open(file2_path, encoding="utf-8") as f2:
-    lines1 = [line.rstrip("\n") for line in f1]
-    lines2 = [line.rstrip("\n") for line in f2]
+def hash_fichier(path):
+    """Empreinte blake2b du fichier, lu en binaire par blocs de 1 Mo."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloc)
+    return h.digest()
+
+if os.path.getsize(file1_path) == os.path.getsize(file2_path) \
+        and hash_fichier(file1_path) == hash_fichier(file2_path):
+    print("✅ Aucun écart : les deux fichiers sont identiques.")
+    sys.exit(0)
 
 # -------------------------------------------------------------------------
-# Comparaison ligne par ligne
+# Lecture et comparaison ligne par ligne (en flux : les fichiers ne sont pas
+# chargés en mémoire, une seule passe sur chacun)
 # -------------------------------------------------------------------------
-max_len = max(len(lines1), len(lines2))
+LIGNE_ABSENTE = "<-- ligne absente -->"
 differences = 0
 
-for idx in range(max_len):
-    # Récupère la ligne ou '<-absente->' si hors index
-    l1 = lines1[idx] if idx < len(lines1) else "<-- ligne absente -->"
-    l2 = lines2[idx] if idx < len(lines2) else "<-- ligne absente -->"
+with open(file1_path, encoding="utf-8", buffering=1 << 20) as f1, \
+     open(file2_path, encoding="utf-8", buffering=1 << 20) as f2:
+    for idx, (l1, l2) in enumerate(itertools.zip_longest(f1, f2), 1):
+        # Récupère la ligne ou '<-absente->' si le fichier est déjà terminé
+        l1 = l1.rstrip("\n") if l1 is not None else LIGNE_ABSENTE
+        l2 = l2.rstrip("\n") if l2 is not None else LIGNE_ABSENTE
 
-    if l1 != l2:
-        differences += 1
-        print(f"\nLigne {idx + 1} :")
-        print(f"  Fichier1.txt | {l1}")
-        print(f"  Fichier2.txt | {l2}")
+        if l1 != l2:
+            differences += 1
+            print(f"\nLigne {idx} :")
+            print(f"  Fichier1.txt | {l1}")
+            print(f"  Fichier2.txt | {l2}")
 
 if differences == 0:
     print("✅ Aucun écart : les deux fichiers sont identiques.")